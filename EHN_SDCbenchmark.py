@@ -0,0 +1,845 @@
+#!/usr/bin/python3
+
+
+# Created on Sat Oct 17 10:12:48 2026
+
+# @author: Lorenzo Corgnati
+# e-mail: lorenzo.corgnati@sp.ismar.cnr.it
+
+
+# This wrapper launches the benchmarks of the functions used by EHN_SDCdatasetBuilder for
+# building the historical total and radial datasets, in order to detect performance regressions.
+
+
+import os
+import time
+import sqlite3
+import resource
+import tempfile
+import threading
+import functools
+import tracemalloc
+import datetime
+import multiprocessing
+import email.utils
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+from concurrent.futures import ProcessPoolExecutor
+from dateutil.relativedelta import relativedelta
+import numpy as np
+import xarray as xr
+import netCDF4 as nc4
+import EHN_SDCdatasetBuilder as builder
+try:
+    # The OpenDAP client benchmarks serve the synthetic sources with the pydap server
+    from pydap.handlers.netcdf_handler import NetCDFHandler
+    from pydap.lib import walk
+    from pydap.model import BaseType
+except ImportError:
+    NetCDFHandler = None
+
+
+#####################################
+# REFERENCE IMPLEMENTATIONS
+#####################################
+
+def SDCremapvarLoop(remappedVar,remapDict):
+    # This function remaps values in the input variable according to the input remap dictionary
+    # with one full-array pass for each key of the dictionary (reference implementation).
+    # The remapped variable is returned.
+
+    # INPUTS:
+    #     remappedVar: data array variable to be remapped.
+    #     remapDict: dictionary for remapping, containing key-values pairs <valueToBeReplaced>:<valueToReplace>
+
+    # OUTPUTS:
+    #     remappedVar: remapped data array variable.
+
+
+    # Store the encoding dictionary
+    encDict = remappedVar.encoding
+
+    # Remap
+    for k,v in remapDict.items():
+        remappedVar = remappedVar.where(remappedVar!=k, v)
+
+    # Assign the encoding dictionary to the remapped variable
+    remappedVar.encoding = encDict
+
+    return remappedVar
+
+
+#####################################
+# SYNTHETIC DATA
+#####################################
+
+def SDCsyntheticRadialCube(cubeShape):
+    # This function builds a synthetic radial dataset with the input shape, containing velocity
+    # variables packed as scaled int16 and QC variables as int8, with a time-varying spatial coverage
+    # (missing values beyond the coverage range) as in real radial data.
+
+    # INPUTS:
+    #     cubeShape: shape of the radial cube (TIME, DEPTH, BEAR, RNGE).
+
+    # OUTPUTS:
+    #     radialDS: xarray Dataset containing the synthetic radial data.
+
+
+    rng = np.random.default_rng(0)
+    numTime, numDepth, numBear, numRange = cubeShape
+    dims = ('TIME', 'DEPTH', 'BEAR', 'RNGE')
+
+    # Build the coverage mask (coverage range varying with time and bearing)
+    maxRange = numRange * (0.5 + 0.3 * np.sin(np.arange(numTime) * 2 * np.pi / 24))[:, None] * (0.7 + 0.3 * np.cos(np.linspace(0, np.pi, numBear)))[None, :]
+    covered = (np.arange(numRange)[None, None, :] < maxRange[:, :, None])[:, None, :, :]
+
+    # Build the coordinates
+    radialDS = xr.Dataset(coords={'TIME': ('TIME', 27240 + np.arange(numTime) / 24, {'units': 'days since 1950-01-01T00:00:00Z', 'calendar': 'julian'}),
+                                  'DEPTH': ('DEPTH', np.zeros(numDepth), {'units': 'm'}),
+                                  'BEAR': ('BEAR', np.arange(numBear) * 360 / numBear, {'units': 'degrees_true'}),
+                                  'RNGE': ('RNGE', np.arange(numRange) * 1.5, {'units': 'km'})})
+
+    # Build the velocity variables (smooth fields plus noise)
+    velField = np.sin(np.arange(numTime) * 2 * np.pi / 12.42)[:, None, None, None] * np.cos(np.linspace(0, 3, numBear))[None, None, :, None]
+    for varName in ['RDVA', 'DRVA', 'EWCT', 'NSCT', 'ESPC', 'ETMP']:
+        values = np.where(covered, 0.5 * velField + 0.05 * rng.standard_normal(cubeShape), np.nan)
+        radialDS[varName] = xr.Variable(dims, values, {'units': 'm s-1'})
+        radialDS[varName].encoding = {'dtype': 'int16', 'scale_factor': 0.001, 'add_offset': 0.0, '_FillValue': np.int16(-32768)}
+
+    # Build the QC variables (mostly good values)
+    for varName in ['QCflag', 'OWTR_QC', 'MDFL_QC', 'VART_QC', 'CSPD_QC', 'AVRB_QC', 'RDCT_QC']:
+        values = np.where(covered, np.where(rng.random(cubeShape) < 0.95, 49, 52), 57).astype(np.int8)
+        radialDS[varName] = xr.Variable(dims, values)
+        radialDS[varName].encoding = {'_FillValue': np.int8(57)}
+
+    return radialDS
+
+
+def SDCsyntheticSourceDataset(dataType, sensor, cubeShape, timeStart):
+    # This function builds a synthetic radial or total dataset with the input shape in the format of
+    # the aggregated datasets served by the EU HFR NODE THREDDS catalog (European standard data model),
+    # i.e. with all the variables and attributes transformed by EHN_SDCdatasetBuilder.
+
+    # INPUTS:
+    #     dataType: type of data ('radial' or 'total').
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     cubeShape: shape of the data cube (TIME, DEPTH, BEAR/LATITUDE, RNGE/LONGITUDE).
+    #     timeStart: datetime of the first TIME record (hourly records).
+
+    # OUTPUTS:
+    #     srcDS: xarray Dataset containing the synthetic source data.
+
+
+    rng = np.random.default_rng(0)
+    numTime, numDepth, numY, numX = cubeShape
+    numSites = 2
+    gridded = (dataType == 'total') or (sensor == 'wera')
+    dims = ('TIME', 'DEPH', 'LATITUDE', 'LONGITUDE') if gridded else ('TIME', 'DEPH', 'BEAR', 'RNGE')
+    bounds = {'valid_min': -10000, 'valid_max': 10000, 'data_mode': 'R'}
+
+    # Build the coordinates
+    srcDS = xr.Dataset(coords={'TIME': ('TIME', np.datetime64(timeStart, 'ns') + np.arange(numTime) * np.timedelta64(1, 'h'), 
+                                        {'long_name': 'Time', 'standard_name': 'time', 'valid_min': -90000.0, 'valid_max': 90000.0, 'uncertainty': ' '}),
+                               'DEPH': ('DEPH', np.zeros(numDepth, np.float32), 
+                                        {'units': 'm', 'valid_min': -12000.0, 'valid_max': 12000.0, 'uncertainty': ' ', 'data_mode': 'R'})})
+    if gridded:
+        srcDS.coords['LATITUDE'] = ('LATITUDE', 43 + np.arange(numY) * 0.02, {'valid_min': -90.0, 'valid_max': 90.0, 'uncertainty': ' '})
+        srcDS.coords['LONGITUDE'] = ('LONGITUDE', 9 + np.arange(numX) * 0.02, {'valid_min': -180.0, 'valid_max': 180.0, 'uncertainty': ' '})
+    else:
+        srcDS.coords['BEAR'] = ('BEAR', np.arange(numY) * 360 / numY, {'standard_name': 'bearing', 'valid_min': 0.0, 'valid_max': 360.0, 'uncertainty': ' '})
+        srcDS.coords['RNGE'] = ('RNGE', np.arange(numX) * 1.5, {'standard_name': 'range', 'valid_min': 0.0, 'valid_max': 300.0, 'uncertainty': ' '})
+        srcDS['LATITUDE'] = (('BEAR', 'RNGE'), 43 + rng.random((numY, numX)), {'valid_min': -90.0, 'valid_max': 90.0, 'uncertainty': ' '})
+        srcDS['LONGITUDE'] = (('BEAR', 'RNGE'), 9 + rng.random((numY, numX)), {'valid_min': -180.0, 'valid_max': 180.0, 'uncertainty': ' '})
+    srcDS.TIME.encoding = {'units': 'days since 1950-01-01T00:00:00Z', 'calendar': 'standard', 'dtype': np.float64}
+
+    # Build the coverage mask (coverage range varying with time)
+    maxRange = numX * (0.5 + 0.3 * np.sin(np.arange(numTime) * 2 * np.pi / 24))
+    covered = np.broadcast_to((np.arange(numX)[None, :] < maxRange[:, None])[:, None, None, :], cubeShape)
+
+    # Build the data variables, packed as scaled int16
+    if dataType == 'total':
+        dataVars = ['EWCT', 'NSCT', 'EWCS', 'NSCS', 'CCOV', 'GDOP']
+        qcVars = ['TIME_QC', 'POSITION_QC', 'DEPH_QC', 'QCflag', 'VART_QC', 'GDOP_QC', 'DDNS_QC', 'CSPD_QC']
+    elif sensor == 'codar':
+        dataVars = ['RDVA', 'DRVA', 'EWCT', 'NSCT', 'ESPC', 'ETMP', 'MAXV', 'MINV', 'ERSC', 'ERTC', 'XDST', 'YDST', 'SPRC']
+        qcVars = ['TIME_QC', 'POSITION_QC', 'DEPH_QC', 'QCflag', 'OWTR_QC', 'MDFL_QC', 'VART_QC', 'CSPD_QC', 'AVRB_QC', 'RDCT_QC']
+    else:
+        dataVars = ['RDVA', 'DRVA', 'EWCT', 'NSCT', 'HCSS', 'EACC']
+        qcVars = ['TIME_QC', 'POSITION_QC', 'DEPH_QC', 'QCflag', 'OWTR_QC', 'MDFL_QC', 'VART_QC', 'CSPD_QC', 'AVRB_QC', 'RDCT_QC']
+    for varName in dataVars:
+        values = np.where(covered, rng.normal(0, 0.5, cubeShape).astype(np.float32), np.float32(np.nan))
+        srcDS[varName] = xr.Variable(dims, values, dict(bounds, units='m s-1', standard_name=varName.lower(), ioos_category='Currents', 
+                                                                coordsys='geographic', ancillary_variables='QCflag, VART_QC, CSPD_QC'))
+        srcDS[varName].encoding = {'dtype': np.int16, 'scale_factor': 0.001, 'add_offset': 0.0, '_FillValue': np.int16(-32768), 
+                                   'coordinates': 'TIME DEPH LATITUDE LONGITUDE'}
+
+    # Build the antenna variables
+    for varName in ['NARX', 'NATX']:
+        srcDS[varName] = xr.Variable(('TIME',), np.full(numTime, numSites, np.int8), {'standard_name': varName.lower(), 'valid_min': 0, 'valid_max': 127, 'data_mode': 'R'})
+        srcDS[varName].encoding = {'_FillValue': np.int8(-127)}
+    for varName in ['SLTR', 'SLNR', 'SLTT', 'SLNT']:
+        srcDS[varName] = xr.Variable(('TIME', 'MAXSITE'), np.full((numTime, numSites), 43.5, np.float32), {'valid_min': -90000, 'valid_max': 90000, 'data_mode': 'R'})
+        srcDS[varName].encoding = {'dtype': np.int32, 'scale_factor': 0.001, '_FillValue': np.int32(-2147483647)}
+    for varName in ['SCDR', 'SCDT']:
+        srcDS[varName] = xr.Variable(('TIME', 'MAXSITE'), np.full((numTime, numSites), b'SITE', 'S4'), {'standard_name': varName.lower(), 'data_mode': 'R'})
+        srcDS[varName].encoding = {'char_dim_name': 'STRING4'}
+
+    # Build the QC variables (mostly good values, missing beyond the coverage range)
+    for varName in qcVars:
+        qcDims = {'TIME_QC': ('TIME',), 'DEPH_QC': ('TIME', 'DEPH')}.get(varName, dims)
+        qcShape = cubeShape[:len(qcDims)]
+        values = np.where(rng.random(qcShape) < 0.95, 1, 4).astype(np.int8)
+        if len(qcDims) == len(dims):
+            values[~covered] = -127
+        srcDS[varName] = xr.Variable(qcDims, values, {'conventions': 'Copernicus Marine In Situ reference table 2', 'valid_min': 0, 'valid_max': 9, 'comment': ''})
+        srcDS[varName].encoding = {'_FillValue': np.int8(-127)}
+
+    # Build the SDN variables and the global attributes
+    for varName in ['SDN_CRUISE', 'SDN_STATION', 'SDN_LOCAL_CDI_ID', 'SDN_REFERENCES', 'SDN_XLINK']:
+        srcDS[varName] = xr.Variable((), 'HFR-Synthetic')
+    srcDS['SDN_EDMO_CODE'] = xr.Variable(('MAXINST',), np.array([134], np.int16))
+    srcDS.attrs = {'sensor': 'CODAR SeaSonde' if sensor == 'codar' else 'WERA', 
+                   'citation': 'Copernicus Marine In Situ', 'distribution_statement': 'Copernicus Marine In Situ', 
+                   'grid_resolution': '2 km'}
+
+    return srcDS
+
+def SDCsyntheticArchive(srcFile, dataType, sensor, gridShape, numMonths):
+    # This function stores a synthetic source dataset containing hourly records for the last numMonths
+    # months before the current one (i.e. the aggregation interval of the longest time span), as the
+    # aggregated datasets served by the THREDDS catalog. The records are built and appended month by 
+    # month, so that the memory usage does not depend on the number of months.
+
+    # INPUTS:
+    #     srcFile: path of the source netCDF file.
+    #     dataType: type of data ('radial' or 'total').
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     gridShape: shape of each TIME record (DEPTH, BEAR/LATITUDE, RNGE/LONGITUDE).
+    #     numMonths: number of months.
+
+    # OUTPUTS:
+    #     srcBytes: size of the source file in bytes.
+
+
+    firstMonth = datetime.datetime.today().replace(day=1, hour=0, minute=0, second=0, microsecond=0) - relativedelta(months=numMonths)
+    for mIDX in range(numMonths):
+        monthStart = firstMonth + relativedelta(months=mIDX)
+        numHours = int(((monthStart + relativedelta(months=1)) - monthStart).total_seconds() // 3600)
+        monthDS = SDCsyntheticSourceDataset(dataType, sensor, (numHours,) + tuple(gridShape), monthStart)
+        if mIDX == 0:
+            monthDS.to_netcdf(srcFile, format='NETCDF4_CLASSIC', unlimited_dims=['TIME'])
+        else:
+            builder.SDCncAppendRecords(srcFile, monthDS, 'TIME')
+
+    return os.path.getsize(srcFile)
+
+
+#####################################
+# DATABASE STAND-IN
+#####################################
+
+def SDCsqliteQuery(dbFile, query, params=()):
+    # This function executes the input select query on the SQLite stand-in of the EU HFR NODE database
+    # and returns the fetched rows, as builder.SDCdbQuery.
+
+    # INPUTS:
+    #     dbFile: path of the SQLite database file.
+    #     query: select query, with %s placeholders for the parameters.
+    #     params: tuple of the query parameters.
+
+    # OUTPUTS:
+    #     rows: list of row dictionaries <columnName>:<value>.
+
+
+    with sqlite3.connect(dbFile) as cnx:
+        cnx.row_factory = sqlite3.Row
+        rows = [dict(row) for row in cnx.execute(query.replace('%s', '?'), params)]
+
+    return rows
+
+def SDCsqliteUpsert(dbFile, table, columns, records, keyColumn):
+    # This function inserts the input records into the input table of the SQLite stand-in of the EU HFR
+    # NODE database in a single transaction, replacing the rows with the same values of the key column,
+    # as builder.SDCdbUpsert.
+
+    # INPUTS:
+    #     dbFile: path of the SQLite database file.
+    #     table: name of the table.
+    #     columns: list of the column names.
+    #     records: list of tuples containing the values of the columns for each record.
+    #     keyColumn: name of the column identifying the rows to be replaced (one of columns).
+
+    # OUTPUTS:
+
+
+    keyValues = list(dict.fromkeys(record[columns.index(keyColumn)] for record in records))
+    with sqlite3.connect(dbFile) as cnx:
+        cnx.execute('DELETE FROM ' + table + ' WHERE ' + keyColumn + ' IN (' + ', '.join(['?'] * len(keyValues)) + ')', keyValues)
+        cnx.executemany('INSERT INTO ' + table + ' (' + ', '.join(columns) + ') VALUES (' + ', '.join(['?'] * len(columns)) + ')', 
+                        [tuple(str(v) if isinstance(v, datetime.datetime) else v for v in record) for record in records])
+
+    return
+
+def SDCsqliteExecute(dbFile, table, statements):
+    # This function executes the input parameterized statements on the input table of the SQLite stand-in
+    # of the EU HFR NODE database in a single transaction, as builder.SDCdbExecute.
+
+    # INPUTS:
+    #     dbFile: path of the SQLite database file.
+    #     table: name of the table.
+    #     statements: list of tuples (statement with %s placeholders, list of tuples of the statement parameters).
+
+    # OUTPUTS:
+
+
+    with sqlite3.connect(dbFile) as cnx:
+        for query, records in statements:
+            cnx.executemany(query.replace('%s', '?'), [tuple(str(v) if isinstance(v, datetime.datetime) else v for v in record) for record in records])
+
+    return
+
+def SDCsqliteDatabase(dbFile, networkID, stationSources, totalSource, outFolder, cdiConfFiles, cdiIDs):
+    # This function builds the SQLite stand-in of the EU HFR NODE database, containing the tables read
+    # and written by EHN_SDCdatasetBuilder: network_tb and station_tb (with the synthetic network and its
+    # stations), radial_SDCnetCDF_tb and total_SDCnetCDF_tb, and the CDI configuration tables with the
+    # columns queried by the input Mikado configuration files (filled with placeholder values for the 
+    # input CDI identifiers).
+
+    # INPUTS:
+    #     dbFile: path of the SQLite database file.
+    #     networkID: network_id of the synthetic network.
+    #     stationSources: dictionary containing key-values pairs <station_id>:<sourceFile>.
+    #     totalSource: path of the source file of the totals of the network.
+    #     outFolder: folder of the aggregated datasets.
+    #     cdiConfFiles: list of the paths of the Mikado configuration files.
+    #     cdiIDs: list of the CDI identifiers of the datasets to be aggregated.
+
+    # OUTPUTS:
+
+
+    with sqlite3.connect(dbFile) as cnx:
+        cnx.execute('CREATE TABLE network_tb (network_id TEXT PRIMARY KEY, SDC_distribution_flag INTEGER, SDC_output_profile TEXT, EDMO_code INTEGER, '
+                    'SDC_OpenDAP_data_url TEXT, SDC_folder_path TEXT, temporal_resolution REAL)')
+        cnx.execute('CREATE TABLE station_tb (network_id TEXT, station_id TEXT, SDC_distribution_flag INTEGER, EDMO_code INTEGER, '
+                    'SDC_OpenDAP_data_url TEXT, SDC_folder_path TEXT, temporal_resolution REAL)')
+        cnx.execute('CREATE TABLE radial_SDCnetCDF_tb (filename TEXT, network_id TEXT, station_id TEXT, start_date TEXT, end_date TEXT, '
+                    'creation_date TEXT, filesize REAL, sent_flag INTEGER, SDN_local_CDI_id TEXT, build_time REAL, source_bytes REAL)')
+        cnx.execute('CREATE TABLE total_SDCnetCDF_tb (filename TEXT, network_id TEXT, start_date TEXT, end_date TEXT, '
+                    'creation_date TEXT, filesize REAL, sent_flag INTEGER, SDN_local_CDI_id TEXT, build_time REAL, source_bytes REAL)')
+        cnx.execute('INSERT INTO network_tb VALUES (?, 1, ?, 134, ?, ?, 60)', (networkID, '', totalSource, outFolder))
+        for stationID, srcFile in stationSources.items():
+            cnx.execute('INSERT INTO station_tb VALUES (?, ?, 1, 134, ?, ?, 60)', (networkID, stationID, srcFile, outFolder))
+
+        # CDI configuration tables
+        cdiColumns = {}
+        for confFile in cdiConfFiles:
+            confFields = builder.SDCcdiConfFields(confFile)
+            cdiColumns.setdefault(confFields['table'], set()).update(c for v,c in confFields['single'] + confFields['multi'])
+        for cdiTable, tableColumns in cdiColumns.items():
+            tableColumns = ['cdi_identifier'] + sorted(tableColumns - {'cdi_identifier'})
+            cnx.execute('CREATE TABLE ' + cdiTable + ' (' + ', '.join(c + ' TEXT' for c in tableColumns) + ')')
+            cnx.executemany('INSERT INTO ' + cdiTable + ' VALUES (' + ', '.join(['?'] * len(tableColumns)) + ')', 
+                            [(cdiID,) + tuple('synthetic' for c in tableColumns[1:]) for cdiID in cdiIDs])
+
+    return
+
+
+#####################################
+# BENCHMARK FUNCTIONS
+#####################################
+
+def SDCbenchmarkRun(benchFunc, numRepeats):
+    # This function runs the input function numRepeats times and measures the mean wall time
+    # and the peak memory allocated by the function.
+
+    # INPUTS:
+    #     benchFunc: function to be benchmarked (no input arguments).
+    #     numRepeats: number of runs.
+
+    # OUTPUTS:
+    #     meanTime: mean wall time of the runs in seconds.
+    #     peakMem: peak memory allocated during the runs in MB.
+
+
+    tracemalloc.start()
+    tStart = time.perf_counter()
+    for rIDX in range(numRepeats):
+        benchFunc()
+    meanTime = (time.perf_counter() - tStart) / numRepeats
+    peakMem = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+
+    return meanTime, peakMem
+
+def SDCbenchmarkQCremap(cubeShape, QCremapDict, numRepeats):
+    # This function compares the lookup table QC remapping engine against the per-key loop
+    # on a synthetic QC variable with the input shape, both as decoded float variable (as read
+    # via OpenDAP with masked fill values) and as int8 variable.
+
+    # INPUTS:
+    #     cubeShape: shape of the QC variable (TIME, DEPTH, BEAR/LATITUDE, RNGE/LONGITUDE).
+    #     QCremapDict: dictionary for remapping QC variables towards SDC schema.
+    #     numRepeats: number of runs for each implementation.
+
+    # OUTPUTS:
+    #     benchResults: list of tuples (implementation, input dtype, mean time [s], peak memory [MB]).
+
+
+    # Build the synthetic QC variables
+    rng = np.random.default_rng(0)
+    intValues = rng.integers(0, 10, size=cubeShape).astype(np.int8)
+    floatValues = intValues.astype(np.float32)
+    floatValues[intValues == 9] = np.nan
+    dims = ('TIME', 'DEPTH', 'BEAR', 'RNGE')
+    intVar = xr.DataArray(intValues, dims=dims, name='QCflag')
+    floatVar = xr.DataArray(floatValues, dims=dims, name='QCflag')
+
+    # Build the lookup table
+    remapLUT = builder.SDCremapLUT(QCremapDict)
+
+    # Check that the implementations give the same results
+    loopResult = SDCremapvarLoop(floatVar, QCremapDict).fillna(57).astype(np.int8)
+    _, lutResult = builder.SDCremapvar(floatVar, remapLUT)
+    if not np.array_equal(loopResult.values, lutResult.values):
+        raise ValueError('QC remapping implementations give different results')
+
+    # Run the benchmarks
+    benchResults = []
+    benchResults.append(('loop', 'float32') + SDCbenchmarkRun(lambda: SDCremapvarLoop(floatVar, QCremapDict), numRepeats))
+    benchResults.append(('loop', 'int8') + SDCbenchmarkRun(lambda: SDCremapvarLoop(intVar, QCremapDict), numRepeats))
+    benchResults.append(('lookup table', 'float32') + SDCbenchmarkRun(lambda: builder.SDCremapvar(floatVar, remapLUT), numRepeats))
+    benchResults.append(('lookup table', 'int8') + SDCbenchmarkRun(lambda: builder.SDCremapvar(intVar, remapLUT), numRepeats))
+    benchResults.append(('lookup table in place', 'int8') + SDCbenchmarkRun(lambda: builder.SDCremapvar(intVar, remapLUT, inPlace=True), numRepeats))
+
+    return benchResults
+
+def SDCbenchmarkOutputProfiles(cubeShape, numRepeats):
+    # This function measures the write time, the read time and the file size of a synthetic radial
+    # cube with the input shape written with each output profile.
+
+    # INPUTS:
+    #     cubeShape: shape of the radial cube (TIME, DEPTH, BEAR, RNGE).
+    #     numRepeats: number of runs for each profile.
+
+    # OUTPUTS:
+    #     benchResults: list of tuples (profile, write time [s], read time [s], file size [MB]).
+
+
+    radialDS = SDCsyntheticRadialCube(cubeShape)
+    benchResults = []
+
+    with tempfile.TemporaryDirectory() as tmpFolder:
+        for profileName in builder.SDCoutputProfiles:
+            ncFile = os.path.join(tmpFolder, profileName + '.nc')
+
+            # Set the encodings of the profile on a shallow copy of the dataset
+            profileDS = radialDS.copy(deep=False)
+            for varName, profileVar in profileDS.variables.items():
+                profileVar.encoding = dict(radialDS.variables[varName].encoding)
+            profileDS = builder.SDCapplyOutputProfile(profileDS, profileName)
+
+            # Measure write and read (full load) times
+            writeTime = SDCbenchmarkRun(lambda: profileDS.to_netcdf(ncFile, format='NETCDF4_CLASSIC', unlimited_dims=['TIME']), numRepeats)[0]
+            def readFile():
+                with xr.open_dataset(ncFile) as readDS:
+                    readDS.load()
+            readTime = SDCbenchmarkRun(readFile, numRepeats)[0]
+
+            benchResults.append((profileName, writeTime, readTime, os.path.getsize(ncFile) / 1024**2))
+
+    return benchResults
+
+
+def SDCbenchmarkAggregation(sourceCubes, chunkSizes, QCremapDict):
+    # This function measures the throughput and the peak memory of the radial and total aggregation
+    # paths (read, SDC transform and write) on synthetic source datasets stored in local files, for
+    # each input chunk size (0 for a single chunk).
+
+    # INPUTS:
+    #     sourceCubes: dictionary containing key-values pairs <cubeName>:(dataType, sensor, cubeShape).
+    #     chunkSizes: list of the numbers of TIME records read, transformed and written at a time.
+    #     QCremapDict: dictionary for remapping QC variables towards SDC schema.
+
+    # OUTPUTS:
+    #     benchResults: list of tuples (cube, chunk size, time [s], throughput [MB/s], peak memory [MB]).
+
+
+    benchResults = []
+
+    with tempfile.TemporaryDirectory() as tmpFolder:
+        for cubeName, (dataType, sensor, cubeShape) in sourceCubes.items():
+            # Store the synthetic source dataset
+            srcFile = os.path.join(tmpFolder, cubeName + '_src.nc')
+            SDCsyntheticSourceDataset(dataType, sensor, cubeShape, datetime.datetime(2026, 1, 1)).to_netcdf(srcFile, format='NETCDF4_CLASSIC', unlimited_dims=['TIME'])
+
+            for chunkSize in chunkSizes:
+                builder.SDCworkerInit({'streamChunkSize': chunkSize, 'QCremapLUT': builder.SDCremapLUT(QCremapDict)})
+                ncFile = os.path.join(tmpFolder, cubeName + '_' + str(chunkSize) + '.nc')
+                with xr.open_dataset(srcFile, decode_times=True) as srcDS:
+                    srcSize = srcDS.nbytes / 1024**2
+                    runTime, peakMem = SDCbenchmarkRun(lambda: builder.SDCwriteChunks(srcDS, dataType, sensor, ncFile, None, 'default', chunkSize), 1)
+                benchResults.append((cubeName, chunkSize, runTime, srcSize / runTime, peakMem))
+                os.remove(ncFile)
+
+    return benchResults
+
+def SDCdapServer(srcFile):
+    # This function starts a local OpenDAP server of the input netCDF file (pydap server) on a free port,
+    # in a separate thread. The responses carry the Last-Modified validator of the file and conditional
+    # requests are answered with 304 Not Modified, as done by the THREDDS server, so that the data
+    # responses are stored in the HTTP cache of the builder and revalidated.
+
+    # INPUTS:
+    #     srcFile: path of the netCDF file.
+
+    # OUTPUTS:
+    #     server: WSGI server (to be stopped by shutdown), listening on server.server_port.
+
+
+    # The arrays are read in memory (as stored, i.e. packed and with char arrays), as the lazy arrays of the pydap 
+    # handler fail on multidimensional hyperslabs and on one-dimensional char arrays
+    ncHandler = NetCDFHandler(srcFile)
+    with nc4.Dataset(srcFile) as ncDS:
+        ncDS.set_auto_maskandscale(False)
+        ncDS.set_auto_chartostring(False)
+        for srcVar in walk(ncHandler.dataset, BaseType):
+            srcVar.data = ncDS.variables[srcVar.name][...]
+    lastModified = email.utils.formatdate(os.path.getmtime(srcFile), usegmt=True)
+
+    def application(environ, start_response):
+        if environ.get('HTTP_IF_MODIFIED_SINCE') == lastModified:
+            start_response('304 Not Modified', [('Last-Modified', lastModified)])
+            return [b'']
+        def validatedResponse(status, headers, exc_info=None):
+            return start_response(status, [header for header in headers if header[0].lower() != 'last-modified'] + [('Last-Modified', lastModified)], exc_info)
+        return ncHandler(environ, validatedResponse)
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = make_server('127.0.0.1', 0, application, handler_class=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
+
+def SDCbenchmarkOpenDAP(sourceCubes, QCremapDict):
+    # This function measures the time for reading, SDC transforming and writing synthetic source datasets
+    # served by a local OpenDAP server with the OpenDAP clients of the builder: the netCDF library (netCDF4)
+    # and the pydap client through the local HTTP cache, first with an empty cache (pydap) and then with
+    # the responses in the cache (pydap cached). The datasets built with the pydap client are checked to 
+    # be the same as the ones built with the netCDF4 client.
+
+    # INPUTS:
+    #     sourceCubes: dictionary containing key-values pairs <cubeName>:(dataType, sensor, cubeShape).
+    #     QCremapDict: dictionary for remapping QC variables towards SDC schema.
+
+    # OUTPUTS:
+    #     benchResults: list of tuples (cube, client, time [s], cache hits, cache misses).
+
+
+    benchResults = []
+
+    with tempfile.TemporaryDirectory() as tmpFolder:
+        for cubeName, (dataType, sensor, cubeShape) in sourceCubes.items():
+            # Store and serve the synthetic source dataset
+            timeStart = datetime.datetime(2026, 1, 1)
+            srcFile = os.path.join(tmpFolder, cubeName.replace(' ', '_') + '_src.nc')
+            SDCsyntheticSourceDataset(dataType, sensor, cubeShape, timeStart).to_netcdf(srcFile, format='NETCDF4_CLASSIC', unlimited_dims=['TIME'])
+            server = SDCdapServer(srcFile)
+            dataUrl = 'http://127.0.0.1:' + str(server.server_port) + '/' + os.path.basename(srcFile)
+            tEnd = timeStart + relativedelta(hours=cubeShape[0] - 1)
+            httpCacheFolder = os.path.join(tmpFolder, cubeName.replace(' ', '_') + '_httpCache')
+
+            try:
+                for clientName, cacheFolder in [('netCDF4', ''), ('pydap', httpCacheFolder), ('pydap cached', httpCacheFolder)]:
+                    builder.SDCworkerInit({'streamChunkSize': 0, 'QCremapLUT': builder.SDCremapLUT(QCremapDict), 'httpCacheFolder': cacheFolder, 
+                                           'httpCacheTTL': 3600, 'httpCacheMaxSize': 1024**4, 'profileMode': '', 'profileFolder': ''})
+                    ncFile = os.path.join(tmpFolder, cubeName.replace(' ', '_') + '_' + clientName.replace(' ', '_') + '.nc')
+                    tStart = time.perf_counter()
+                    with builder.SDCspanCollect('EHN_SDCbenchmark') as spans:
+                        sourceIndex = builder.SDCsourceIndex(dataUrl, builder.SDCdataTypes[dataType]['schema'], timeStart, tEnd)
+                        srcDS = builder.SDCopenSource(dataUrl, sourceIndex)
+                        builder.SDCwriteChunks(srcDS, dataType, sourceIndex['sensor'], ncFile, None, 'default', 0)
+                        builder.SDCsourceClose(srcDS)
+                    runTime = time.perf_counter() - tStart
+                    httpStages = [span['stage'] for span in spans]
+                    benchResults.append((cubeName, clientName, runTime, httpStages.count('http-hit') + httpStages.count('http-revalidated'), httpStages.count('http-miss')))
+            finally:
+                server.shutdown()
+                server.server_close()
+
+            # Check that the clients give the same datasets
+            with xr.open_dataset(os.path.join(tmpFolder, cubeName.replace(' ', '_') + '_netCDF4.nc'), decode_times=False, mask_and_scale=False) as refDS:
+                # The netCDF library flattens the attribute containers of the DAS (e.g. dimensions) into global attributes <container>.<attribute>
+                refDS.attrs = {attName: attValue for attName, attValue in refDS.attrs.items() if '.' not in attName}
+                for clientName in ['pydap', 'pydap cached']:
+                    with xr.open_dataset(os.path.join(tmpFolder, cubeName.replace(' ', '_') + '_' + clientName.replace(' ', '_') + '.nc'), decode_times=False, mask_and_scale=False) as outDS:
+                        if not refDS.identical(outDS):
+                            raise ValueError('the ' + clientName + ' client gives a different ' + cubeName + ' dataset than the netCDF4 client')
+
+    return benchResults
+
+
+def SDCbenchmarkRSS():
+    # This function returns the current resident set size of the process (Linux), or its peak resident
+    # set size where /proc is not available.
+
+    # INPUTS:
+
+    # OUTPUTS:
+    #     rss: resident set size in MB.
+
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def SDCbenchmarkStage(stageFunc, *stageArgs):
+    # This function runs the input stage function and measures its wall time and the peak resident set
+    # size of the process during the stage, sampled every 10 ms by a separate thread.
+
+    # INPUTS:
+    #     stageFunc: function of the stage.
+    #     stageArgs: input arguments of the stage function.
+
+    # OUTPUTS:
+    #     stageOutput: output of the stage function.
+    #     wallTime: wall time of the stage in seconds.
+    #     peakRSS: peak resident set size during the stage in MB.
+
+
+    peakRSS = [SDCbenchmarkRSS()]
+    stopSampling = threading.Event()
+    def sampleRSS():
+        while not stopSampling.wait(0.01):
+            peakRSS[0] = max(peakRSS[0], SDCbenchmarkRSS())
+    sampler = threading.Thread(target=sampleRSS, daemon=True)
+    sampler.start()
+
+    tStart = time.perf_counter()
+    try:
+        stageOutput = stageFunc(*stageArgs)
+    finally:
+        wallTime = time.perf_counter() - tStart
+        stopSampling.set()
+        sampler.join()
+
+    return stageOutput, wallTime, max(peakRSS[0], SDCbenchmarkRSS())
+
+def SDCbenchmarkTimeSpan(benchFolder, timeSpan, networkID, stationSources, totalSource, settings):
+    # This function runs the whole aggregation workflow of EHN_SDCdatasetBuilder for the input time span
+    # on the synthetic sources, against the SQLite stand-in of the database: the network and station
+    # records are loaded (metadata) and the radial and total datasets are built by SDCradials and SDCtotals
+    # in serial mode, so that the stages do not overlap. The stages are measured by the timed spans of the
+    # builder, grouped as opening of the sources (index), download of the source data (fetch), SDC
+    # transformation (transform: remap, stats and attrs spans), writing of the netCDF files (write: write
+    # and commit spans), database queries (db) and CDI generation (cdi), so that the stages of the streamed
+    # datasets, fetched and transformed chunk by chunk, are measured as the ones of the in-memory datasets.
+    # The function is run in a separate process, so that the peak memory is not affected by other runs.
+
+    # INPUTS:
+    #     benchFolder: folder of the benchmark files.
+    #     timeSpan: aggregation time span (number of months).
+    #     networkID: network_id of the synthetic network.
+    #     stationSources: dictionary containing key-values pairs <station_id>:<sourceFile>.
+    #     totalSource: path of the source file of the totals of the network.
+    #     settings: dictionary containing the global settings of EHN_SDCdatasetBuilder.
+
+    # OUTPUTS:
+    #     stageResults: list of tuples (stage, time [s], throughput [MB/s], peak RSS [MB]), the throughput
+    #                   being evaluated on the bytes fetched (fetch and transform) or written (write) by the
+    #                   stage (None for other stages).
+    #     peakRSS: peak resident set size of the run in MB.
+
+
+    # Set the builder settings (serial execution of the units, without runtime history and profiling) and the database stand-in
+    builder.SDCworkerInit(dict({'backfillRange': None, 'resumeRun': False, 'scheduleHistory': False, 'cdiEngine': 'native', 'profileMode': '', 'profileFolder': '', 
+                                'maxWorkers': 1, 'maxPerHost': 1}, **settings, timeSpan=timeSpan, executionMode='serial'))
+    outFolder = os.path.join(benchFolder, 'timeSpan' + str(timeSpan))
+    os.makedirs(os.path.join(outFolder, 'CDI'), exist_ok=True)
+    builder.cdiFolder = os.path.join(outFolder, 'CDI')
+    dbFile = os.path.join(outFolder, 'HFR_node_db.sqlite')
+    builder.SDCdbQuery = functools.partial(SDCsqliteQuery, dbFile)
+    builder.SDCdbUpsert = functools.partial(SDCsqliteUpsert, dbFile)
+    builder.SDCdbExecute = functools.partial(SDCsqliteExecute, dbFile)
+
+    # Build the database stand-in
+    timeExtent = builder.SDCaggregationTimeInterval()[3]
+    cdiConfFiles = {platformID: os.path.join(builder.cdiConfFolder, networkID + '-' + platformID + '.xml') for platformID in list(stationSources) + ['Total']}
+    cdiConfFiles = {platformID: confFile for platformID, confFile in cdiConfFiles.items() if os.path.isfile(confFile)}
+    cdiIDs = ['RV_HF_' + networkID + '-' + stationID + '_' + timeExtent for stationID in stationSources] + ['TV_HF_' + networkID + '-Total_' + timeExtent]
+    SDCsqliteDatabase(dbFile, networkID, stationSources, totalSource, outFolder, list(cdiConfFiles.values()), cdiIDs)
+
+    # Load the network and station records
+    (networks, stations), wallTime, peakRSS = SDCbenchmarkStage(builder.SDCmetadataLoad)
+    stageStats = {'metadata': [wallTime, 0, peakRSS]}
+    
+    # Aggregate the radial and total datasets, collecting the timed spans of the builder
+    with builder.SDCspanCollect('EHN_SDCbenchmark') as spans:
+        if builder.SDCradials(networks, stations) or builder.SDCtotals(networks):
+            raise RuntimeError('aggregation workflow failed')
+
+    # Group the spans by stage
+    stageNames = {'remap': 'transform', 'stats': 'transform', 'attrs': 'transform', 'commit': 'write'}
+    for stageName in ['index', 'fetch', 'transform', 'write', 'db', 'cdi']:
+        stageStats[stageName] = [0.0, 0, 0.0]
+    for span in spans:
+        stageName = stageNames.get(span['stage'], span['stage'])
+        stageStats.setdefault(stageName, [0.0, 0, 0.0])
+        stageStats[stageName][0] += span['duration']
+        stageStats[stageName][1] += span.get('bytes', 0) if stageName in ['fetch', 'write'] else 0
+        stageStats[stageName][2] = max(stageStats[stageName][2], span['maxRSS'])
+    stageStats['transform'][1] = stageStats['fetch'][1]
+
+    stageResults = [(stageName, wallTime, (stageBytes / 1024**2 / wallTime) if stageBytes else None, peakRSS) 
+                    for stageName, (wallTime, stageBytes, peakRSS) in stageStats.items() if wallTime > 0]
+
+    return stageResults, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def SDCbenchmarkWorkflow(timeSpans, networkID, archiveStations, gridShapes, settings):
+    # This function measures the per-stage wall time, throughput and peak memory of the whole aggregation
+    # workflow of EHN_SDCdatasetBuilder without the THREDDS catalog and the database: the synthetic radial
+    # and total sources covering the longest time span are stored in local files (read by the builder as
+    # the OpenDAP datasets) and the database is replaced by a SQLite stand-in. Each time span is run in
+    # a separate spawned process.
+
+    # INPUTS:
+    #     timeSpans: list of the aggregation time spans (number of months).
+    #     networkID: network_id of the synthetic network.
+    #     archiveStations: dictionary containing key-values pairs <station_id>:<sensor> of the synthetic stations.
+    #     gridShapes: dictionary containing the shape of each TIME record (DEPTH, BEAR/LATITUDE, RNGE/LONGITUDE)
+    #                 for each sensor (codar, wera) and for totals (total).
+    #     settings: dictionary containing the global settings of EHN_SDCdatasetBuilder.
+
+    # OUTPUTS:
+    #     benchResults: list of tuples (time span, stage, time [s], throughput [MB/s], peak RSS [MB]), the
+    #                   'run' stage reporting the total time and the peak RSS of the run.
+
+
+    benchResults = []
+
+    with tempfile.TemporaryDirectory() as benchFolder:
+        # Store the synthetic sources
+        numMonths = max(timeSpans)
+        stationSources = {}
+        for stationID, sensor in archiveStations.items():
+            stationSources[stationID] = os.path.join(benchFolder, networkID + '-' + stationID + '_src.nc')
+            SDCsyntheticArchive(stationSources[stationID], 'radial', sensor, gridShapes[sensor], numMonths)
+        totalSource = os.path.join(benchFolder, networkID + '-Total_src.nc')
+        SDCsyntheticArchive(totalSource, 'total', 'codar', gridShapes['total'], numMonths)
+
+        for timeSpan in timeSpans:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                tStart = time.perf_counter()
+                stageResults, peakRSS = executor.submit(SDCbenchmarkTimeSpan, benchFolder, timeSpan, networkID, stationSources, totalSource, settings).result()
+                runTime = time.perf_counter() - tStart
+            benchResults += [(timeSpan,) + stageResult for stageResult in stageResults]
+            benchResults.append((timeSpan, 'run', runTime, None, peakRSS))
+
+    return benchResults
+
+
+#####################################
+# SCRIPT LAUNCHER
+#####################################
+
+if __name__ == '__main__':
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCbenchmark started.')
+
+####################
+# SETUP
+####################
+
+    # Set the dictionaty for mapping QC variables towards SDC schema
+    QCremapDict = {0: 48, 1: 49, 2: 50, 3: 51, 4: 52, 8: 56}
+
+    # Set the number of runs for each benchmark
+    numRepeats = 3
+
+    # Set the reference radial cube shapes (1 month of hourly data)
+    cubeShapes = {'codar': (720, 1, 72, 60), 'wera': (720, 1, 150, 150)}
+    
+    # Set the reference source datasets for the aggregation benchmarks (1 month of hourly data)
+    sourceCubes = {'radial codar': ('radial', 'codar', (720, 1, 72, 60)), 'radial wera': ('radial', 'wera', (720, 1, 150, 150)), 
+                   'total codar': ('total', 'codar', (720, 1, 120, 150)), 'total wera': ('total', 'wera', (720, 1, 120, 150))}
+    
+    # Set the chunk sizes (TIME records) for the aggregation benchmarks (0 for a single chunk)
+    chunkSizes = [0, 168]
+    
+    # Set the aggregation time spans (number of months) for the workflow benchmarks
+    timeSpans = [1, 12, 36]
+    
+    # Set the synthetic network and stations (<station_id>:<sensor>) for the workflow benchmarks, named as
+    # the ones having a Mikado configuration file, so that the CDIs are generated
+    archiveNetwork = 'HFR-TirLig'
+    archiveStations = {'PCOR': 'codar', 'TINO': 'wera'}
+    
+    # Set the shape of the TIME records of the synthetic sources (DEPTH, BEAR/LATITUDE, RNGE/LONGITUDE)
+    gridShapes = {'codar': (1, 36, 30), 'wera': (1, 50, 50), 'total': (1, 40, 50)}
+    
+    # Set the settings of EHN_SDCdatasetBuilder for the workflow benchmarks
+    builderSettings = {'QCremapDict': QCremapDict, 'QCremapLUT': builder.SDCremapLUT(QCremapDict), 'streamChunkSize': 720, 
+                       'cacheFolder': '', 'cacheVerify': True, 'outputProfile': 'sdc', 'networkOutputProfiles': {}, 
+                       'forceRebuild': True, 'appendCurrent': False, 'cdiConfFolder': os.path.join(os.path.dirname(os.path.abspath(builder.__file__)), 'Mikado_conf_files'), 
+                       'cdiBatchSize': 200, 'journalFile': '', 'httpCacheFolder': '', 'memoryBudget': 0, 'memoryOverhead': 2.0}
+
+####################
+# QC REMAPPING
+####################
+
+    for sensor, cubeShape in cubeShapes.items():
+        benchResults = SDCbenchmarkQCremap(cubeShape, QCremapDict, numRepeats)
+        print('QC remapping - ' + sensor + ' ' + str(cubeShape))
+        for implementation, dtype, meanTime, peakMem in benchResults:
+            print('    {:<24}{:<10}{:>10.4f} s{:>12.1f} MB'.format(implementation, dtype, meanTime, peakMem))
+
+####################
+# OUTPUT PROFILES
+####################
+
+    for sensor, cubeShape in cubeShapes.items():
+        benchResults = SDCbenchmarkOutputProfiles(cubeShape, numRepeats)
+        print('Output profiles - ' + sensor + ' ' + str(cubeShape))
+        print('    {:<12}{:>12}{:>12}{:>12}'.format('profile', 'write [s]', 'read [s]', 'size [MB]'))
+        for profileName, writeTime, readTime, fileSize in benchResults:
+            print('    {:<12}{:>12.3f}{:>12.3f}{:>12.1f}'.format(profileName, writeTime, readTime, fileSize))
+
+####################
+# AGGREGATION
+####################
+
+    benchResults = SDCbenchmarkAggregation(sourceCubes, chunkSizes, QCremapDict)
+    print('Aggregation (read, SDC transform and write)')
+    print('    {:<16}{:>8}{:>12}{:>12}{:>12}'.format('dataset', 'chunk', 'time [s]', '[MB/s]', 'peak [MB]'))
+    for cubeName, chunkSize, runTime, throughput, peakMem in benchResults:
+        print('    {:<16}{:>8}{:>12.3f}{:>12.1f}{:>12.1f}'.format(cubeName, chunkSize, runTime, throughput, peakMem))
+
+####################
+# OPENDAP CLIENTS
+####################
+
+    if (NetCDFHandler is not None) and (builder.requests is not None):
+        benchResults = SDCbenchmarkOpenDAP(sourceCubes, QCremapDict)
+        print('OpenDAP clients (local OpenDAP server, read, SDC transform and write)')
+        print('    {:<16}{:<16}{:>12}{:>8}{:>8}'.format('dataset', 'client', 'time [s]', 'hits', 'misses'))
+        for cubeName, clientName, runTime, cacheHits, cacheMisses in benchResults:
+            print('    {:<16}{:<16}{:>12.3f}{:>8}{:>8}'.format(cubeName, clientName, runTime, cacheHits, cacheMisses))
+    else:
+        print('OpenDAP clients - skipped (the pydap and requests packages are required)')
+
+####################
+# WORKFLOW
+####################
+
+    benchResults = SDCbenchmarkWorkflow(timeSpans, archiveNetwork, archiveStations, gridShapes, builderSettings)
+    print('Workflow (synthetic sources, SQLite database stand-in)')
+    print('    {:<10}{:<12}{:>12}{:>12}{:>12}'.format('timeSpan', 'stage', 'time [s]', '[MB/s]', 'RSS [MB]'))
+    for timeSpan, stageName, wallTime, throughput, peakRSS in benchResults:
+        print('    {:<10}{:<12}{:>12.3f}{:>12}{:>12.1f}'.format(timeSpan, stageName, wallTime, '-' if throughput is None else '{:.1f}'.format(throughput), peakRSS))
+
+####################
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCbenchmark successfully executed.')
@@ -11,819 +11,4717 @@
 # datasets and the CDI entries for distribution on SeaDataNet infrastructure.
 
 
+import io
 import os
+import re
 import sys
+import time
+import shutil
+import socket
+import sqlite3
+import tempfile
+import json
+import argparse
+import hashlib
+import heapq
+import threading
+import contextlib
+import functools
+import importlib.util
+import resource
+import cProfile
+import tracemalloc
+import multiprocessing
+from dataclasses import dataclass, fields, asdict
 #import subprocess32
-#import subprocess
+import subprocess
 import numpy as np
 import mysql.connector as sql
-from mysql.connector import errorcode
+from mysql.connector import errorcode, pooling
 import datetime
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 import xarray as xr
 import netCDF4 as nc4
+from xarray.backends.netCDF4_ import NETCDF4_PYTHON_LOCK
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse, quote
+try:
+    # The OpenDAP HTTP cache (httpCacheFolder) runs on requests sessions, serving the pydap client
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+    HTTPAdapter = object
 #import LatLon
 
 
+# Network and station records passed to the workers, holding the fields of network_tb and station_tb 
+# used for the aggregation
+@dataclass(frozen=True, slots=True)
+class SDCnetworkRecord:
+    network_id: str
+    SDC_output_profile: str = ''
+    EDMO_code: int = 0
+    SDC_OpenDAP_data_url: str = ''
+    SDC_folder_path: str = ''
+    temporal_resolution: float = 60.0
+
+@dataclass(frozen=True, slots=True)
+class SDCstationRecord:
+    network_id: str
+    station_id: str
+    EDMO_code: int
+    SDC_OpenDAP_data_url: str
+    SDC_folder_path: str
+    temporal_resolution: float
+
+# Names of the global settings (set in the SCRIPT LAUNCHER) to be propagated to the worker processes
+SDCsharedSettings = ['timeSpan', 'QCremapDict', 'QCremapLUT', 'streamChunkSize', 'cacheFolder', 'cacheVerify', 
+                     'outputProfile', 'networkOutputProfiles', 'sqlConfig', 'dbPoolSize', 'forceRebuild', 
+                     'profileMode', 'profileFolder', 'backfillRange', 'appendCurrent', 'journalFile', 'httpCacheFolder', 'httpCacheMaxSize', 'httpCacheTTL', 
+                     'maxWorkers', 'memoryBudget', 'memoryOverhead']
+
+# Radial QC variables to be remapped, containing key-values pairs <sourceVariableName>:<SDCvariableName>
+radialQCvarDict = {'TIME_QC': 'TIME_SEADATANET_QC', 'POSITION_QC': 'POSITION_SEADATANET_QC', 'DEPH_QC': 'DEPTH_SEADATANET_QC', 
+                   'QCflag': 'QCflag', 'OWTR_QC': 'OWTR_QC', 'MDFL_QC': 'MDFL_QC', 'VART_QC': 'VART_QC', 
+                   'CSPD_QC': 'CSPD_QC', 'AVRB_QC': 'AVRB_QC', 'RDCT_QC': 'RDCT_QC'}
+
+# SeaDataNet QC flag attributes shared by all the SDC QC variables
+SDCqcFlagAttrs = {'Conventions': 'SeaDataNet measurand qualifier flags', 
+                  'valid_range': np.array([48, 65]).astype(np.int8), 
+                  'flag_values': np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8), 
+                  'flag_meanings': 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain', 
+                  'sdn_conventions_urn': 'SDN:L20::'}
+
+# Radial variable transformations towards the SDC schema. Each entry contains the name of the variable,
+# the sensor the entry applies to (None for all sensors) and the transformation spec, i.e. the attributes 
+# to be set (setAttrs), the attributes to be removed (popAttrs), the substrings to be replaced in the
+# attributes (replaceAttrs), the encodings to be set (setEncoding), the substrings to be replaced in the 
+# encodings (replaceEncoding) and the flag for setting the char dimension name from the data (charDim).
+SDCradialSchema = {
+    'QCvariables': radialQCvarDict,
+    'renameVariables': {'DEPH': 'DEPTH'},
+    'variables': [
+        ('TIME', None, {'setAttrs': {'long_name': 'Chronological Julian Date', 'ancillary_variables': 'TIME_SEADATANET_QC'}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'uncertainty'], 
+                        'setEncoding': {'calendar': 'julian', '_FillValue': None}}),
+        ('BEAR', 'codar', {'setAttrs': {'units': 'degrees_true', 'ancillary_variables': 'POSITION_SEADATANET_QC'}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'uncertainty'], 
+                           'setEncoding': {'_FillValue': None}}),
+        ('RNGE', 'codar', {'setAttrs': {'units': 'km', 'ancillary_variables': 'POSITION_SEADATANET_QC'}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'uncertainty'], 
+                           'setEncoding': {'_FillValue': None}}),
+        ('DEPTH', None, {'setAttrs': {'ancillary_variables': 'DEPTH_SEADATANET_QC'}, 
+                         'popAttrs': ['valid_min', 'valid_max', 'uncertainty', 'data_mode'], 
+                         'setEncoding': {'_FillValue': None}}),
+        ('LATITUDE', None, {'setAttrs': {'long_name': 'Latitude', 'units': 'degrees_north', 'ancillary_variables': 'POSITION_SEADATANET_QC', 
+                                         'valid_range': np.array([-90, 90])}, 
+                            'popAttrs': ['valid_min', 'valid_max', 'uncertainty']}),
+        ('LATITUDE', 'wera', {'setEncoding': {'_FillValue': None}}),
+        ('LONGITUDE', None, {'setAttrs': {'long_name': 'Longitude', 'units': 'degrees_east', 'ancillary_variables': 'POSITION_SEADATANET_QC', 
+                                          'valid_range': np.array([-180, 180])}, 
+                             'popAttrs': ['valid_min', 'valid_max', 'uncertainty']}),
+        ('LONGITUDE', 'wera', {'setEncoding': {'_FillValue': None}}),
+        ('RDVA', None, {'setAttrs': {'long_name': 'Radial Sea Water Velocity Away From Instrument', 'valid_range': np.array([-10000, 10000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('DRVA', None, {'setAttrs': {'long_name': 'Direction of Radial Vector Away From Instrument', 'valid_range': np.array([0, 360000]), 
+                                     'units': 'degrees_true'}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('EWCT', None, {'setAttrs': {'valid_range': np.array([-10000, 10000])}, 
+                        'popAttrs': ['ioos_category', 'coordsys', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('NSCT', None, {'setAttrs': {'valid_range': np.array([-10000, 10000])}, 
+                        'popAttrs': ['ioos_category', 'coordsys', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('HCSS', 'wera', {'setAttrs': {'long_name': 'Radial Variance of Current Velocity Over Coverage Period', 'valid_range': np.array([-10000000, 10000000]), 
+                                       'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                          'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                          'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('EACC', 'wera', {'setAttrs': {'long_name': 'Radial Accuracy of Current Velocity Over Coverage Period', 'valid_range': np.array([-10000, 10000]), 
+                                       'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                          'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                          'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('ESPC', 'codar', {'setAttrs': {'long_name': 'Radial Standard Deviation of Current Velocity over the Scatter Patch', 'valid_range': np.array([-32000, 32000]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('ETMP', 'codar', {'setAttrs': {'long_name': 'Radial Standard Deviation of Current Velocity over Coverage Period', 'valid_range': np.array([-32000, 32000]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('MAXV', 'codar', {'setAttrs': {'long_name': 'Radial Sea Water Velocity Away From Instrument Maximum', 'valid_range': np.array([-10000, 10000])}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('MINV', 'codar', {'setAttrs': {'long_name': 'Radial Sea Water Velocity Away From Instrument Minimum', 'valid_range': np.array([-10000, 10000])}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('ERSC', 'codar', {'setAttrs': {'long_name': 'Radial Sea Water Velocity Spatial Quality Count', 'valid_range': np.array([0, 127]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('ERTC', 'codar', {'setAttrs': {'long_name': 'Radial Sea Water Velocity Temporal Quality Count', 'valid_range': np.array([0, 127]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('XDST', 'codar', {'setAttrs': {'long_name': 'Eastward Distance From Instrument', 'valid_range': np.array([0, 1000000]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('YDST', 'codar', {'setAttrs': {'long_name': 'Northward Distance From Instrument', 'valid_range': np.array([0, 1000000]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('SPRC', 'codar', {'setAttrs': {'long_name': 'Radial Sea Water Velocity Cross Spectra Range Cell', 'valid_range': np.array([0, 127]), 
+                                        'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                           'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                           'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('NARX', None, {'setAttrs': {'long_name': 'Number of Receive Antennas', 'valid_range': np.array([0, 127]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode']}),
+        ('NATX', None, {'setAttrs': {'long_name': 'Number of Transmit Antennas', 'valid_range': np.array([0, 127]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode']}),
+        ('SLTR', None, {'setAttrs': {'long_name': 'Receive Antenna Latitudes', 'units': 'degrees_north', 'valid_range': np.array([-90000, 90000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SLNR', None, {'setAttrs': {'long_name': 'Receive Antenna Longitudes', 'units': 'degrees_east', 'valid_range': np.array([-180000, 180000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SLTT', None, {'setAttrs': {'long_name': 'Transmit Antenna Latitudes', 'units': 'degrees_north', 'valid_range': np.array([-90000, 90000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SLNT', None, {'setAttrs': {'long_name': 'Transmit Antenna Longitudes', 'units': 'degrees_east', 'valid_range': np.array([-180000, 180000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SCDR', None, {'setAttrs': {'long_name': 'Receive Antenna Codes', 'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'data_mode'], 
+                        'setEncoding': {'_FillValue': b''}, 'charDim': True}),
+        ('SCDT', None, {'setAttrs': {'long_name': 'Transmit Antenna Codes', 'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'data_mode'], 
+                        'setEncoding': {'_FillValue': b''}, 'charDim': True}),
+        ('TIME_SEADATANET_QC', None, {'setAttrs': dict({'long_name': 'Time SeaDataNet Quality Flag'}, **SDCqcFlagAttrs), 
+                                      'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                                      'setEncoding': {'_FillValue': np.int8(57)}}),
+        ('POSITION_SEADATANET_QC', None, {'setAttrs': dict({'long_name': 'Position SeaDataNet Quality Flags'}, **SDCqcFlagAttrs), 
+                                          'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                                          'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('DEPTH_SEADATANET_QC', None, {'setAttrs': dict({'long_name': 'Depth SeaDataNet Quality Flag'}, **SDCqcFlagAttrs), 
+                                       'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                                       'setEncoding': {'_FillValue': np.int8(57)}}),
+        ('QCflag', None, {'setAttrs': dict({'long_name': 'Overall Quality Flags'}, **SDCqcFlagAttrs), 
+                          'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                          'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('OWTR_QC', None, {'setAttrs': dict({'long_name': 'Over-water Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('MDFL_QC', None, {'setAttrs': dict({'long_name': 'Median Filter Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('VART_QC', None, {'setAttrs': dict({'long_name': 'Variance Threshold Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('CSPD_QC', None, {'setAttrs': dict({'long_name': 'Velocity Threshold Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('AVRB_QC', None, {'setAttrs': dict({'long_name': 'Average Radial Bearing Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max'], 
+                           'setEncoding': {'_FillValue': np.int8(57)}}),
+        ('RDCT_QC', None, {'setAttrs': dict({'long_name': 'Radial Count Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max'], 
+                           'setEncoding': {'_FillValue': np.int8(57)}}),
+    ]
+}
+
+# Total QC variables to be remapped, containing key-values pairs <sourceVariableName>:<SDCvariableName>
+totalQCvarDict = {'TIME_QC': 'TIME_SEADATANET_QC', 'POSITION_QC': 'POSITION_SEADATANET_QC', 'DEPH_QC': 'DEPTH_SEADATANET_QC', 
+                  'QCflag': 'QCflag', 'VART_QC': 'VART_QC', 'GDOP_QC': 'GDOP_QC', 'DDNS_QC': 'DDNS_QC', 'CSPD_QC': 'CSPD_QC'}
+
+# Total variable transformations towards the SDC schema (same structure as SDCradialSchema).
+SDCtotalSchema = {
+    'QCvariables': totalQCvarDict,
+    'renameVariables': {'DEPH': 'DEPTH'},
+    'variables': [
+        ('TIME', None, {'setAttrs': {'long_name': 'Chronological Julian Date', 'ancillary_variables': 'TIME_SEADATANET_QC'}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'uncertainty'], 
+                        'setEncoding': {'calendar': 'julian', '_FillValue': None}}),
+        ('LATITUDE', None, {'setAttrs': {'long_name': 'Latitude', 'units': 'degrees_north', 'ancillary_variables': 'POSITION_SEADATANET_QC', 
+                                         'valid_range': np.array([-90, 90])}, 
+                            'popAttrs': ['valid_min', 'valid_max', 'uncertainty'], 
+                            'setEncoding': {'_FillValue': None}}),
+        ('LONGITUDE', None, {'setAttrs': {'long_name': 'Longitude', 'units': 'degrees_east', 'ancillary_variables': 'POSITION_SEADATANET_QC', 
+                                          'valid_range': np.array([-180, 180])}, 
+                             'popAttrs': ['valid_min', 'valid_max', 'uncertainty'], 
+                             'setEncoding': {'_FillValue': None}}),
+        ('DEPTH', None, {'setAttrs': {'ancillary_variables': 'DEPTH_SEADATANET_QC'}, 
+                         'popAttrs': ['valid_min', 'valid_max', 'uncertainty', 'data_mode'], 
+                         'setEncoding': {'_FillValue': None}}),
+        ('EWCT', None, {'setAttrs': {'valid_range': np.array([-10000, 10000])}, 
+                        'popAttrs': ['ioos_category', 'coordsys', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('NSCT', None, {'setAttrs': {'valid_range': np.array([-10000, 10000])}, 
+                        'popAttrs': ['ioos_category', 'coordsys', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('EWCS', None, {'setAttrs': {'long_name': 'Standard Deviation of Surface Eastward Sea Water Velocity', 'valid_range': np.array([-32000, 32000]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('NSCS', None, {'setAttrs': {'long_name': 'Standard Deviation of Surface Northward Sea Water Velocity', 'valid_range': np.array([-32000, 32000]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('CCOV', None, {'setAttrs': {'long_name': 'Covariance of Surface Sea Water Velocity', 'valid_range': np.array([-2147483647, 2147483647]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('GDOP', None, {'setAttrs': {'long_name': 'Geometrical Dilution of Precision', 'valid_range': np.array([-32000, 32000]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode'], 
+                        'replaceAttrs': {'ancillary_variables': (',', '')}, 'replaceEncoding': {'coordinates': ('DEPH', 'DEPTH')}}),
+        ('NARX', None, {'setAttrs': {'long_name': 'Number of Receive Antennas', 'valid_range': np.array([0, 127]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode']}),
+        ('NATX', None, {'setAttrs': {'long_name': 'Number of Transmit Antennas', 'valid_range': np.array([0, 127]), 
+                                     'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'valid_min', 'valid_max', 'data_mode']}),
+        ('SLTR', None, {'setAttrs': {'long_name': 'Receive Antenna Latitudes', 'units': 'degrees_north', 'valid_range': np.array([-90000, 90000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SLNR', None, {'setAttrs': {'long_name': 'Receive Antenna Longitudes', 'units': 'degrees_east', 'valid_range': np.array([-180000, 180000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SLTT', None, {'setAttrs': {'long_name': 'Transmit Antenna Latitudes', 'units': 'degrees_north', 'valid_range': np.array([-90000, 90000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SLNT', None, {'setAttrs': {'long_name': 'Transmit Antenna Longitudes', 'units': 'degrees_east', 'valid_range': np.array([-180000, 180000])}, 
+                        'popAttrs': ['valid_min', 'valid_max', 'data_mode']}),
+        ('SCDR', None, {'setAttrs': {'long_name': 'Receive Antenna Codes', 'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'data_mode'], 
+                        'setEncoding': {'_FillValue': b''}, 'charDim': True}),
+        ('SCDT', None, {'setAttrs': {'long_name': 'Transmit Antenna Codes', 'sdn_parameter_name': '', 'sdn_parameter_urn': ''}, 
+                        'popAttrs': ['standard_name', 'data_mode'], 
+                        'setEncoding': {'_FillValue': b''}, 'charDim': True}),
+        ('TIME_SEADATANET_QC', None, {'setAttrs': dict({'long_name': 'Time SeaDataNet Quality Flag'}, **SDCqcFlagAttrs), 
+                                      'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                                      'setEncoding': {'_FillValue': np.int8(57)}}),
+        ('POSITION_SEADATANET_QC', None, {'setAttrs': dict({'long_name': 'Position SeaDataNet Quality Flags'}, **SDCqcFlagAttrs), 
+                                          'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                                          'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('DEPTH_SEADATANET_QC', None, {'setAttrs': dict({'long_name': 'Depth SeaDataNet Quality Flag'}, **SDCqcFlagAttrs), 
+                                       'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                                       'setEncoding': {'_FillValue': np.int8(57)}}),
+        ('QCflag', None, {'setAttrs': dict({'long_name': 'Overall Quality Flags'}, **SDCqcFlagAttrs), 
+                          'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                          'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('VART_QC', None, {'setAttrs': dict({'long_name': 'Variance Threshold Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('GDOP_QC', None, {'setAttrs': dict({'long_name': 'GDOP Threshold Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('DDNS_QC', None, {'setAttrs': dict({'long_name': 'Data Density Threshold Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+        ('CSPD_QC', None, {'setAttrs': dict({'long_name': 'Velocity Threshold Quality Flags'}, **SDCqcFlagAttrs), 
+                           'popAttrs': ['conventions', 'valid_min', 'valid_max', 'comment'], 
+                           'setEncoding': {'coordinates': 'TIME DEPTH LATITUDE LONGITUDE', '_FillValue': np.int8(57)}}),
+    ]
+}
+
+# Radial product transformations towards the SDC schema, applied to the aggregated product. The SDN
+# variables are rebuilt from the values of the product metadata dictionary (value), with the given 
+# dimension (dim) and data type (dtype), the global attributes are set from templates filled with the 
+# product metadata dictionary.
+SDCradialProductSchema = {
+    'SDNvariables': [
+        ('SDN_CRUISE', {'value': 'siteCode', 'setAttrs': {'long_name': 'Grid grouping label'}}),
+        ('SDN_STATION', {'value': 'platformCode', 'setAttrs': {'long_name': 'Grid label'}}),
+        ('SDN_LOCAL_CDI_ID', {'value': 'dataID', 'setAttrs': {'long_name': 'SeaDataNet CDI identifier'}}),
+        ('SDN_EDMO_CODE', {'value': 'EDMOcode', 'dim': 'MAXINST', 'dtype': np.int16, 
+                           'setAttrs': {'long_name': 'European Directory of Marine Organisations code for the CDI partner', 'units': 1}}),
+        ('SDN_XLINK', {'value': 'xlinkString', 'dim': 'REFMAX', 'setAttrs': {'long_name': 'External resource linkages'}}),
+    ],
+    'dropVariables': ['SDN_REFERENCES'],
+    'popGlobalAttrs': ['platform_name', 'wmo_platform_code', 'ices_platform_code', 'feature_type', 'bottom_depth', 'contact', 
+                       'grid_resolution', 'doi', 'pi_name', 'qc_manual', 'wmo_inst_type'],
+    'setGlobalAttrs': {'id': '{dataID}', 
+                       'time_coverage_start': '{timeCoverageStart}', 
+                       'time_coverage_end': '{timeCoverageEnd}', 
+                       'time_coverage_duration': '{timeCoverageDuration}', 
+                       'format_version': 'v2.2', 
+                       'Conventions': 'CF-1.6, OceanSITES Manual 1.2, SeaDataNet_1.0, INSPIRE', 
+                       'naming_authority': 'eu.eurogoos', 
+                       'cdm_data_type': 'Grid', 
+                       'netcdf_version': '4.3.3.1', 
+                       'software_name': 'EU_HFR_NODE_pySDC', 
+                       'software_version': 'v2.2', 
+                       'references': 'Corgnati, L. et al (2019) SeaDataNet data management protocols for HF Radar data, WP9 - Deliverable D9.12. Version 1.6. SeaDataNet, 83pp. DOI: http://dx.doi.org/10.25607/OBP-1011', 
+                       'date_created': '{creationDate}', 
+                       'date_modified': '{creationDate}', 
+                       'date_update': '{creationDate}', 
+                       'date_issued': '{creationDate}', 
+                       'metadata_date_stamp': '{creationDate}', 
+                       'history': 'Data collected from {timeCoverageStart} to {timeCoverageEnd}.NetCDF file created by the European HFR Node on {creationDate}.'},
+    'replaceGlobalAttrs': {'citation': ('Copernicus', 'SeaDataNet'), 'distribution_statement': ('Copernicus', 'SeaDataNet')}
+}
+
+# Total product transformations towards the SDC schema (as for radials, the grid resolution is kept)
+SDCtotalProductSchema = dict(SDCradialProductSchema, 
+                             popGlobalAttrs=[k for k in SDCradialProductSchema['popGlobalAttrs'] if k != 'grid_resolution'])
+
+# Global attributes of the product schemas updated when records are appended to an existing dataset (the history
+# records the update, while the other attributes, e.g. date_created, are kept)
+SDCappendGlobalAttrs = ['time_coverage_start', 'time_coverage_end', 'time_coverage_duration', 'date_modified', 'date_update', 'metadata_date_stamp']
+
+# Connection pool to the database, as tuple (process id, pool), and the lock for its creation
+SDCdbPool = None
+SDCdbPoolLock = threading.Lock()
+
+# Timed spans of the unit processed by each thread (see SDCspanCollect)
+SDCspanState = threading.local()
+
+# Requests sessions of the OpenDAP HTTP cache of each thread (see SDChttpSession)
+SDChttpState = threading.local()
+
+# Lock serializing all the netCDF I/O of the threads of a process: indexing and opening of the source datasets,
+# loading of their data, and writes and appends of the output files. The netCDF and HDF5 libraries are not
+# thread-safe, and xarray holds its own lock (NETCDF4_PYTHON_LOCK) while reading data but neither while reading
+# the structure of the opened files nor while creating files and variables. Data read with the pydap client
+# do not go through the netCDF library and are loaded without the lock (see SDCsourceLoad).
+SDCncLock = threading.RLock()
+
+# Compiled schemas, containing key-values pairs <(schemaName, sensor)>:<compiledSchema>
+SDCcompiledSchemas = {}
+
+# Storage profiles of the output netCDF files, containing the zlib compression level (0 for no compression),
+# the shuffle filter flag and the chunk sizes along the dimensions (dimensions not listed are not split,
+# so that chunks are TIME-major). The default profile keeps the storage settings of the source data.
+SDCoutputProfiles = {
+    'default': None,
+    'fast': {'complevel': 1, 'shuffle': True, 'chunkSizes': {'TIME': 24}},
+    'sdc': {'complevel': 4, 'shuffle': True, 'chunkSizes': {'TIME': 24}},
+    'archive': {'complevel': 6, 'shuffle': True, 'chunkSizes': {'TIME': 168}},
+}
+
+# Data types of the aggregated datasets, containing key-values pairs <dataType>:<descriptor>. Each descriptor holds
+# the schema tables of the data type, the data variable whose valid (not NaN) values define the coverage statistics
+# of the datasets, the prefix of the dataset IDs, the database tables of the datasets and of their CDI metadata and
+# the columns of the dataset table identifying the unit (station or totals of a network) of each dataset.
+SDCdataTypes = {
+    'radial': {'schema': SDCradialSchema, 'productSchema': SDCradialProductSchema, 'statsVariable': 'RDVA', 'dataPrefix': 'RV_HF_', 
+               'datasetTable': 'radial_SDCnetCDF_tb', 'cdiTable': 'radial_CDIconf_tb', 'unitColumns': ['network_id', 'station_id']},
+    'total': {'schema': SDCtotalSchema, 'productSchema': SDCtotalProductSchema, 'statsVariable': 'EWCT', 'dataPrefix': 'TV_HF_', 
+              'datasetTable': 'total_SDCnetCDF_tb', 'cdiTable': 'total_CDIconf_tb', 'unitColumns': ['network_id']},
+}
+
+# Namespaces of the ISO 19139 SeaDataNet CDI (cdi19139) xml documents
+SDCcdiNamespaces = {'gmd': 'http://www.isotc211.org/2005/gmd', 'gco': 'http://www.isotc211.org/2005/gco', 
+                    'gml': 'http://www.opengis.net/gml', 'gmx': 'http://www.isotc211.org/2005/gmx', 
+                    'xlink': 'http://www.w3.org/1999/xlink', 'sdn': 'http://www.seadatanet.org'}
+for prefix, uri in SDCcdiNamespaces.items():
+    ET.register_namespace(prefix, uri)
+
+# Code lists referenced by the CDI xml documents
+SDCcdiCodeLists = {'gmx': 'http://vocab.nerc.ac.uk/isoCodelists/sdnCodelists/gmxCodeLists.xml', 
+                   'sdn': 'http://vocab.nerc.ac.uk/isoCodelists/sdnCodelists/cdicsrCodeList.xml'}
+
+# Parsed Mikado configuration files, containing key-values pairs <confFile>:<confFields>
+SDCcdiConfCache = {}
+
+
+#####################################
+# GENERAL FUNCTIONS (to be moved in a separate file)
+#####################################   
+
+def SDCremapLUT(remapDict):
+    # This function builds the lookup table for remapping 8-bit integer variables according to the
+    # input remap dictionary. The table is indexed by the unsigned 8-bit representation of the values
+    # to be replaced and maps all the values not contained in the dictionary onto themselves.
+    
+    # INPUTS:
+    #     remapDict: dictionary for remapping, containing key-values pairs <valueToBeReplaced>:<valueToReplace>
+               
+    # OUTPUTS:
+    #     remapLUT: int8 lookup table with 256 entries.
+    
+    
+    # Build the identity table
+    remapLUT = np.arange(256, dtype=np.uint8).view(np.int8)
+    
+    # Insert the remapped values
+    for k,v in remapDict.items():
+        remapLUT[int(k) & 0xFF] = v
+        
+    return remapLUT
+
+def SDCremapArray(values, remapLUT, fillValue, inPlace=False):
+    # This function remaps the values of the input array in a single vectorized pass via the input
+    # lookup table. Integer arrays are remapped without any float conversion (in place, if requested
+    # and if the array is int8). Float arrays (i.e. integer variables decoded with NaN in place of the
+    # fill value) are converted to int8 and NaN values are replaced by the input fill value. Values not
+    # representable as int8 (e.g. of wider integer variables) are replaced by the input fill value too,
+    # instead of being wrapped onto the lookup table.
+    
+    # INPUTS:
+    #     values: numpy array to be remapped.
+    #     remapLUT: int8 lookup table built by SDCremapLUT.
+    #     fillValue: int8 value replacing NaN values and values outside the int8 range.
+    #     inPlace: flag for remapping int8 arrays in place.
+               
+    # OUTPUTS:
+    #     remapped: remapped int8 numpy array.
+    
+    
+    if (values.dtype == np.int8) and inPlace and values.flags.writeable and values.flags.c_contiguous:
+        # Remap in place by blocks of the flattened array (the unsigned 8-bit representation of the values indexes the lookup table)
+        flatValues = values.reshape(-1)
+        for bIDX in range(0, flatValues.size, 1048576):
+            flatValues[bIDX:bIDX + 1048576] = remapLUT[flatValues[bIDX:bIDX + 1048576].view(np.uint8)]
+        remapped = values
+    elif values.dtype == np.int8:
+        # Index the lookup table with the unsigned 8-bit representation of the values
+        remapped = remapLUT[values.view(np.uint8)]
+    else:
+        # Remap the values within the int8 range and set the missing and out of range ones to the fill value
+        missing = (values < -128) | (values > 127)
+        if not np.issubdtype(values.dtype, np.integer):
+            missing |= np.isnan(values)
+        remapped = remapLUT[np.where(missing, 0, values).astype(np.int8).view(np.uint8)]
+        remapped[missing] = fillValue
+        
+    return remapped
+
+def SDCremapvar(remappedVar, remapLUT, fillValue=np.int8(57), inPlace=False, verbose=True):
+    # This function remaps values in the input variable according to the input lookup table,
+    # in a single vectorized pass that keeps the int8 data type. Dask-backed variables are
+    # remapped chunk-wise.
+    # The remapped variable is returned.
+    
+    # INPUTS:
+    #     remappedVar: data array variable to be remapped.
+    #     remapLUT: int8 lookup table built by SDCremapLUT from the remap dictionary.
+    #     fillValue: int8 value replacing missing values.
+    #     inPlace: flag for remapping int8 in-memory variables in place.
+    #     verbose: flag for logging the start and the outcome of the remapping (unset when the
+    #              variable is remapped chunk by chunk).
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     remappedVar: remapped data array variable.
+    
+
+    if verbose:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCremapvar started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Store the encoding dictionary
+    encDict = remappedVar.encoding
+    
+    # Remap
+    if remappedVar.chunks is not None:
+        remapped = remappedVar.data.map_blocks(SDCremapArray, remapLUT, fillValue, dtype=np.int8)
+    else:
+        remapped = SDCremapArray(remappedVar.values, remapLUT, fillValue, inPlace)
+    remappedVar = remappedVar.copy(deep=False, data=remapped)
+        
+    # Assign the encoding dictionary to the remapped variable
+    remappedVar.encoding = encDict
+        
+    if(Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCremapvar exited with an error for variable ' + remappedVar.name + '.')
+    elif verbose:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCremapvar successfully executed for variable ' + remappedVar.name + '.')
+        
+    return Rerr, remappedVar
+
+def SDCremapQCvariables(sdcDS, QCvarDict, remapLUT, inPlace=False, verbose=True):
+    # This function remaps and renames the QC variables of the input dataset according to the input
+    # lookup table. The dataset is modified in place, without building intermediate Dataset copies:
+    # the data of the variables are replaced and only the renamed variables are reinserted.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset containing the QC variables to be remapped.
+    #     QCvarDict: dictionary containing key-values pairs <sourceVariableName>:<remappedVariableName>
+    #     remapLUT: int8 lookup table built by SDCremapLUT from the remap dictionary.
+    #     inPlace: flag for remapping int8 in-memory variables in place.
+    #     verbose: flag for logging the remapping of each variable.
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     sdcDS: xarray Dataset containing the remapped QC variables.
+    
+    
+    # Initialize error flag
+    Rerr = False
+    
+    for srcName, remappedName in QCvarDict.items():
+        RVerr, remappedVar = SDCremapvar(sdcDS[srcName], remapLUT, inPlace=inPlace, verbose=verbose)
+        # Replace the data of the source variable (no dataset alignment is needed, as the shape is unchanged)
+        srcVar = sdcDS.variables[srcName]
+        srcVar.data = remappedVar.data
+        if remappedName != srcName:
+            del sdcDS[srcName]
+            sdcDS[remappedName] = srcVar
+        Rerr = Rerr or RVerr
+        
+    return Rerr, sdcDS
+
+def SDCcompileSchema(schema, sensor):
+    # This function compiles the variable transformations of the input schema for the input sensor,
+    # i.e. selects the entries applying to the sensor and merges the entries of the same variable
+    # into a single list of operations. Compiled schemas are cached, so that the schema table is 
+    # processed only once for each sensor.
+    
+    # INPUTS:
+    #     schema: dictionary containing the schema table (e.g. SDCradialSchema).
+    #     sensor: manufacturer of the radar system (codar or wera).
+               
+    # OUTPUTS:
+    #     compiledSchema: list of tuples (variableName, setAttrs, popAttrs, replaceAttrs, setEncoding, replaceEncoding, charDim).
+    
+    
+    # Look for the compiled schema in the cache
+    schemaKey = (id(schema), sensor.casefold())
+    if schemaKey in SDCcompiledSchemas:
+        return SDCcompiledSchemas[schemaKey]
+    
+    # Select and merge the entries applying to the sensor
+    mergedSpecs = {}
+    for varName, varSensor, varSpec in schema['variables']:
+        if (varSensor is not None) and (varSensor.casefold() not in sensor.casefold()):
+            continue
+        mergedSpec = mergedSpecs.setdefault(varName, {'setAttrs': {}, 'popAttrs': [], 'replaceAttrs': {}, 
+                                                      'setEncoding': {}, 'replaceEncoding': {}, 'charDim': False})
+        for opName in ['setAttrs', 'replaceAttrs', 'setEncoding', 'replaceEncoding']:
+            mergedSpec[opName].update(varSpec.get(opName, {}))
+        mergedSpec['popAttrs'] += varSpec.get('popAttrs', [])
+        mergedSpec['charDim'] = mergedSpec['charDim'] or varSpec.get('charDim', False)
+    
+    # Build the operation tuples
+    compiledSchema = [(varName, tuple(spec['setAttrs'].items()), tuple(spec['popAttrs']), tuple(spec['replaceAttrs'].items()), 
+                       tuple(spec['setEncoding'].items()), tuple(spec['replaceEncoding'].items()), spec['charDim']) 
+                      for varName, spec in mergedSpecs.items()]
+    SDCcompiledSchemas[schemaKey] = compiledSchema
+    
+    return compiledSchema
+
+def SDCapplySchema(sdcDS, compiledSchema):
+    # This function applies the compiled schema to the attributes and encodings of the variables of 
+    # the input dataset in a single pass. The variables are modified in place, without building
+    # intermediate Dataset copies and without loading the data.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset to be transformed.
+    #     compiledSchema: compiled schema built by SDCcompileSchema.
+               
+    # OUTPUTS:
+    #     sdcDS: transformed xarray Dataset.
+    
+    
+    for varName, setAttrs, popAttrs, replaceAttrs, setEncoding, replaceEncoding, charDim in compiledSchema:
+        sdcVar = sdcDS.variables[varName]
+        varAttrs = sdcVar.attrs
+        varEncoding = sdcVar.encoding
+        for k,v in setAttrs:
+            varAttrs[k] = v
+        for k in popAttrs:
+            varAttrs.pop(k, None)
+        for k,(old,new) in replaceAttrs:
+            varAttrs[k] = varAttrs[k].replace(old, new)
+        for k,v in setEncoding:
+            varEncoding[k] = v
+        for k,(old,new) in replaceEncoding:
+            varEncoding[k] = varEncoding[k].replace(old, new)
+        if charDim:
+            # Read only the first string for setting the char dimension name
+            varEncoding['char_dim_name'] = 'STRING' + str(len(sdcVar[(0,) * sdcVar.ndim].values.item()))
+            
+    return sdcDS
+
+def SDCschemaTransform(sdcDS, schema, sensor, inPlace=False, verbose=True):
+    # This function transforms the input dataset according to the input schema table: the QC
+    # variables are remapped, the variables are renamed and the variable attributes and encodings 
+    # are modified in a single pass.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset to be transformed.
+    #     schema: dictionary containing the schema table (e.g. SDCradialSchema).
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     inPlace: flag for remapping the QC variables in place (to be set only for in-memory datasets).
+    #     verbose: flag for logging the remapping of the QC variables.
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     sdcDS: transformed xarray Dataset.
+    
+    
+    # Remap and rename QC variables
+    with SDCspan('remap'):
+        Rerr, sdcDS = SDCremapQCvariables(sdcDS, schema['QCvariables'], QCremapLUT, inPlace, verbose)
+    
+    with SDCspan('attrs'):
+        # Rename variables (shallow copy, the data are not copied)
+        if schema.get('renameVariables'):
+            sdcDS = sdcDS.rename(schema['renameVariables'])
+        
+        # Modify variable attributes and encodings
+        sdcDS = SDCapplySchema(sdcDS, SDCcompileSchema(schema, sensor))
+    
+    return Rerr, sdcDS
+
+def SDCproductTransform(sdcDS, productSchema, productMeta):
+    # This function sets the SDN variables and the global attributes of the input dataset according to
+    # the input product schema table, filled with the values of the product metadata dictionary. 
+    # The dataset is modified in place and the variable order is preserved.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset transformed by SDCschemaTransform.
+    #     productSchema: dictionary containing the product schema table (e.g. SDCradialProductSchema).
+    #     productMeta: dictionary containing the product metadata (siteCode, platformCode, dataID, EDMOcode, xlinkString,
+    #                  timeCoverageStart, timeCoverageEnd, timeCoverageDuration and creationDate, see SDCaggregationJob).
+               
+    # OUTPUTS:
+    #     sdcDS: xarray Dataset of the aggregated product.
+    
+    
+    with SDCspan('attrs'):
+        # SDN variables
+        for varName, varSpec in productSchema['SDNvariables']:
+            varValue = productMeta[varSpec['value']]
+            varData = np.array(varValue, dtype=varSpec.get('dtype'))
+            varDims = ()
+            if 'dim' in varSpec:
+                varData = varData.reshape(1)
+                varDims = (varSpec['dim'],)
+            if varName in sdcDS.variables:
+                del sdcDS[varName]
+            sdcDS[varName] = xr.Variable(varDims, varData, dict(varSpec['setAttrs']))
+            if isinstance(varValue, str):
+                sdcDS.variables[varName].encoding['char_dim_name'] = 'STRING' + str(len(varValue))
+        for varName in productSchema['dropVariables']:
+            if varName in sdcDS.variables:
+                del sdcDS[varName]
+        
+        # Global attributes
+        for k in productSchema['popGlobalAttrs']:
+            sdcDS.attrs.pop(k, None)
+        for k,v in productSchema['setGlobalAttrs'].items():
+            sdcDS.attrs[k] = v.format(**productMeta)
+        for k,(old,new) in productSchema['replaceGlobalAttrs'].items():
+            sdcDS.attrs[k] = sdcDS.attrs[k].replace(old, new)
+        
+    return sdcDS
+
+def SDCaggregationTimeInterval(tRef=None):
+    # This function evaluates the start and end datetimes for aggregation based on the selected time span.
+    # In particular, this function selects the last n months before the current one, where n is the selected
+    # time span. If appendCurrent is set (and no reference datetime is given), the current month is selected
+    # instead. The function also returns the aggregation time extent string for the dataset ID.
+    
+    # INPUTS:
+    #     tRef: reference datetime, whose month follows the aggregation interval (None for the current date).
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     tStart: starting time of the dataset.
+    #     tEnd: ending time of the dataset.
+    #     timeExtent: time extent string for the dataset ID.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCaggregationTimeInterval started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Evaluate the start and end datetimes for aggregation based on the selectedtime span
+    if appendCurrent and (tRef is None):
+        tStart = datetime.datetime.today().replace(day=1, hour=0, minute=0, second =0, microsecond=0)
+        tEnd = tStart + relativedelta(months=1) - datetime.timedelta(microseconds=1)
+    else:
+        if tRef is None:
+            tRef = datetime.datetime.today()
+        tEnd = tRef.replace(day=1, hour=23, minute=59, second =59, microsecond=999999) - datetime.timedelta(hours=24)
+        tStart = (tEnd - relativedelta(months=timeSpan-1)).replace(day=1, hour=0, minute=0, second =0, microsecond=0)
+    
+    # Build the aggregation time extent string
+    if (timeSpan == 1) or ((tStart.year, tStart.month) == (tEnd.year, tEnd.month)):    # 1-month time extent
+        timeExtent = str(tStart.year) + str(tStart.month).zfill(2)    
+    elif timeSpan == 12:            # 1-year time extent
+        timeExtent = str(tStart.year)
+    elif ((timeSpan % 12) == 0):    # multi-years time extent
+        timeExtent = str(tStart.year) + '-' + str(tEnd.year)
+    else:                           # general time extent
+        timeExtent = str(tStart.year) + str(tStart.month).zfill(2) + '-' + str(tEnd.year) + str(tEnd.month).zfill(2)
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCaggregationTimeInterval successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCaggregationTimeInterval exited with an error.')
+        
+    return Rerr, tStart, tEnd, timeExtent
+
+def SDCbackfillIntervals():
+    # This function splits the backfill range into consecutive aggregation intervals of timeSpan months,
+    # starting from the first month of the range. Only the intervals ending within the last month of the
+    # range and before the current month (i.e. complete intervals) are returned.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     intervals: list of tuples containing the starting time, the ending time and the time extent
+    #                string of each aggregation interval (as returned by SDCaggregationTimeInterval).
+    
+    
+    # Set the first month after the backfill range (the current month at most)
+    endMonth = min(backfillRange[1].replace(day=1, hour=0, minute=0, second=0, microsecond=0) + relativedelta(months=1), 
+                   datetime.datetime.today().replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+    
+    intervals = []
+    tRef = backfillRange[0].replace(day=1, hour=0, minute=0, second=0, microsecond=0) + relativedelta(months=timeSpan)
+    while tRef <= endMonth:
+        Rerr, tStart, tEnd, timeExtent = SDCaggregationTimeInterval(tRef)
+        intervals.append((tStart, tEnd, timeExtent))
+        tRef += relativedelta(months=timeSpan)
+    
+    return intervals
+
+def SDCsourceVariables(schema, sensor, srcDims):
+    # This function selects the variables of the source dataset needed for building the SDC product
+    # according to the input schema table, i.e. the source variables transformed by the schema (named
+    # as before the QC remapping and the renaming) and the dimension coordinate variables. The SDN
+    # variables, rebuilt or dropped by the product schema, are not needed.
+
+    # INPUTS:
+    #     schema: dictionary containing the schema table (e.g. SDCradialSchema).
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     srcDims: dictionary containing the dimensions of the variables of the source dataset (name:dimensions).
+
+    # OUTPUTS:
+    #     varNames: list of the names of the needed source variables (in source order).
+
+
+    # Source names of the schema variables
+    renamedVars = {v: k for k,v in schema.get('renameVariables', {}).items()}
+    remappedVars = {v: k for k,v in schema['QCvariables'].items()}
+    schemaVars = set()
+    for varName, varSensor, varSpec in schema['variables']:
+        if (varSensor is not None) and (varSensor.casefold() not in sensor.casefold()):
+            continue
+        varName = renamedVars.get(varName, varName)
+        schemaVars.add(remappedVars.get(varName, varName))
+
+    varNames = [varName for varName, varDims in srcDims.items() if (varName in schemaVars) or (tuple(varDims) == (varName,))]
+
+    return varNames
+
+def SDCdecodedItemsize(varName, varDtype, varAttrs):
+    # This function evaluates the size in bytes of an element of the input source variable once decoded
+    # by xarray according to the CF conventions (e.g. packed integers are unpacked to floats and TIME is
+    # decoded to datetimes), i.e. the size of the element when the variable is loaded in memory.
+
+    # INPUTS:
+    #     varName: name of the variable.
+    #     varDtype: numpy data type of the variable in the source dataset.
+    #     varAttrs: dictionary containing the attributes of the variable in the source dataset.
+
+    # OUTPUTS:
+    #     itemSize: size in bytes of a decoded element.
+
+
+    try:
+        decodedVar = xr.conventions.decode_cf_variable(varName, xr.Variable(('element',), np.zeros(1, dtype=varDtype), dict(varAttrs)))
+        itemSize = decodedVar.dtype.itemsize
+    except (ValueError, TypeError):
+        itemSize = varDtype.itemsize
+
+    return max(itemSize, 1)
+
+def SDCsourceIndex(dataUrl, schema, tStart, tEnd):
+    # This function reads the structure (DDS and DAS) and the TIME coordinate of the source dataset for
+    # the aggregation from the THREDDS catalog via OpenDAP, and evaluates the TIME index range of the 
+    # aggregation interval and the hyperslabs of the variables needed by the input schema table, to be
+    # requested by SDCopenSource. The index also describes the state of the source data (TIME coverage,
+    # number of records and modification stamp) for detecting changes since the last build. If 
+    # httpCacheFolder is set, the OpenDAP responses are read with the pydap client through the local
+    # HTTP cache (see SDChttpCacheAdapter).
+
+    # INPUTS:
+    #     dataUrl: OpenDAP url (or local path) of the source dataset.
+    #     schema: dictionary containing the schema table (e.g. SDCradialSchema).
+    #     tStart: starting time of the aggregation interval.
+    #     tEnd: ending time of the aggregation interval.
+
+    # OUTPUTS:
+    #     sourceIndex: dictionary containing the sensor, the TIME index range (tIDX, tEndIDX), the number of 
+    #                  records, the first and last TIME (timeFirst, timeLast), the TIME values within the range
+    #                  (timeValues), the modification stamp of the source, the hyperslabs of the needed variables,
+    #                  the unneeded variables and the size in bytes of the requested data (fetchBytes), of the
+    #                  requested data once decoded in memory (memoryBytes) and of the whole source dataset (sourceBytes).
+
+
+    # Read the structure of the source dataset (dimensions, shape, data type and attributes of each variable) and its TIME coordinate
+    if (httpCacheFolder != '') and (urlparse(dataUrl).scheme in ['http', 'https']):
+        # OpenDAP responses through the local HTTP cache (pydap client)
+        with xr.open_dataset(dataUrl, engine='pydap', application=SDChttpApplication(dataUrl), decode_cf=False) as srcDS:
+            srcAttrs = dict(srcDS.attrs)
+            srcVars = {varName: (srcVar.dims, srcVar.shape, srcVar.dtype, srcVar.attrs) for varName, srcVar in srcDS.variables.items()}
+            timeRaw, timeAttrs = srcDS['TIME'].values, srcDS['TIME'].attrs
+    else:
+        # The netCDF library is not thread-safe: direct accesses are serialized with the lock used by xarray
+        with SDCncLock, NETCDF4_PYTHON_LOCK, nc4.Dataset(dataUrl) as ncDS:
+            ncDS.set_auto_mask(False)
+            srcAttrs = ncDS.__dict__
+            srcVars = {varName: (srcVar.dimensions, srcVar.shape, np.dtype(srcVar.dtype), {attName: srcVar.getncattr(attName) for attName in srcVar.ncattrs()}) 
+                       for varName, srcVar in ncDS.variables.items()}
+            timeRaw, timeAttrs = ncDS.variables['TIME'][:], ncDS.variables['TIME'].__dict__
+    timeValues = xr.coding.times.decode_cf_datetime(timeRaw, timeAttrs['units'], timeAttrs.get('calendar', 'standard')).astype('datetime64[ns]')
+
+    # Evaluate the TIME index range of the aggregation interval
+    tIDX = np.searchsorted(timeValues, np.datetime64(tStart), side='left')
+    tEndIDX = np.searchsorted(timeValues, np.datetime64(tEnd), side='right')
+    if tEndIDX <= tIDX:
+        raise ValueError('no TIME records within the aggregation interval in ' + dataUrl)
+
+    # Build the hyperslabs of the needed variables
+    varNames = SDCsourceVariables(schema, srcAttrs['sensor'], {varName: varDims for varName, (varDims, varShape, varDtype, varAttrs) in srcVars.items()})
+    hyperslabs = []
+    fetchBytes = timeRaw.dtype.itemsize * timeRaw.size
+    memoryBytes = 0
+    sourceBytes = 0
+    for varName, (varDims, varShape, varDtype, varAttrs) in srcVars.items():
+        varSize = max(varDtype.itemsize, 1)
+        sourceBytes += varSize * int(np.prod(varShape))
+        if varName not in varNames:
+            continue
+        varRanges = [(tIDX, tEndIDX) if dimName == 'TIME' else (0, dimSize) for dimName, dimSize in zip(varDims, varShape)]
+        varElements = int(np.prod([dimEnd - dimStart for dimStart, dimEnd in varRanges]))
+        fetchBytes += varSize * varElements
+        memoryBytes += SDCdecodedItemsize(varName, varDtype, varAttrs) * varElements
+        # Char arrays are served as DAP strings, without the string length dimension
+        if varDtype == 'S1':
+            varRanges = varRanges[:-1]
+        hyperslabs.append(varName + ''.join('[' + str(dimStart) + ':1:' + str(dimEnd - 1) + ']' for dimStart, dimEnd in varRanges))
+
+    # Modification stamp of the source (update date of the THREDDS dataset or modification time of local files)
+    if urlparse(dataUrl).scheme in ['http', 'https']:
+        modified = str(srcAttrs.get('date_update', srcAttrs.get('date_modified', '')))
+    else:
+        modified = datetime.datetime.utcfromtimestamp(os.path.getmtime(dataUrl)).isoformat()
+
+    sourceIndex = {'sensor': srcAttrs['sensor'], 'tIDX': int(tIDX), 'tEndIDX': int(tEndIDX), 'numRecords': int(tEndIDX - tIDX), 
+                   'timeFirst': timeValues[tIDX], 'timeLast': timeValues[tEndIDX - 1], 'timeValues': timeValues[tIDX:tEndIDX], 'modified': modified, 
+                   'hyperslabs': hyperslabs, 'unneededVars': [varName for varName in srcVars if varName not in varNames], 
+                   'fetchBytes': fetchBytes, 'memoryBytes': memoryBytes, 'sourceBytes': sourceBytes}
+
+    return sourceIndex
+
+def SDCsourceSplit(sourceIndex, intervals):
+    # This function splits the source index of a backfill range into the source indexes of its aggregation
+    # intervals. The hyperslabs and the unneeded variables of the whole range are kept, as the source 
+    # dataset is opened only once for the whole range (see SDCbackfillPrepare).
+
+    # INPUTS:
+    #     sourceIndex: dictionary containing the source index of the backfill range built by SDCsourceIndex.
+    #     intervals: list of tuples containing the starting time, the ending time and the time extent string
+    #                of each aggregation interval (as returned by SDCbackfillIntervals).
+
+    # OUTPUTS:
+    #     intervalIndexes: list containing the source index of each aggregation interval (None for intervals
+    #                      without TIME records).
+
+
+    timeValues = sourceIndex['timeValues']
+    intervalIndexes = []
+    for tStart, tEnd, timeExtent in intervals:
+        iIDX = np.searchsorted(timeValues, np.datetime64(tStart), side='left')
+        iEndIDX = np.searchsorted(timeValues, np.datetime64(tEnd), side='right')
+        if iEndIDX <= iIDX:
+            intervalIndexes.append(None)
+            continue
+        intervalIndexes.append(dict(sourceIndex, tIDX=sourceIndex['tIDX'] + int(iIDX), tEndIDX=sourceIndex['tIDX'] + int(iEndIDX), 
+                                    numRecords=int(iEndIDX - iIDX), timeFirst=timeValues[iIDX], timeLast=timeValues[iEndIDX - 1], 
+                                    timeValues=timeValues[iIDX:iEndIDX], fetchBytes=sourceIndex['fetchBytes'] * int(iEndIDX - iIDX) // sourceIndex['numRecords'], 
+                                    memoryBytes=sourceIndex['memoryBytes'] * int(iEndIDX - iIDX) // sourceIndex['numRecords']))
+
+    return intervalIndexes
+
+def SDCopenSource(dataUrl, sourceIndex):
+    # This function opens the source dataset for the aggregation from the THREDDS catalog via OpenDAP,
+    # requesting only the variables needed by the schema table and only the TIME records within the
+    # aggregation interval: the dataset is opened with a DAP constraint expression containing the
+    # hyperslab of each needed variable, so that the server subsets the data. If httpCacheFolder is set,
+    # the dataset is opened with the pydap client through the local HTTP cache (see SDChttpCacheAdapter).
+    # Local source files (e.g. for testing) are opened and subset by xarray. Data are lazily loaded.
+
+    # INPUTS:
+    #     dataUrl: OpenDAP url (or local path) of the source dataset.
+    #     sourceIndex: dictionary containing the source index built by SDCsourceIndex.
+
+    # OUTPUTS:
+    #     srcDS: xarray Dataset containing the needed variables within the aggregation interval.
+
+
+    if (httpCacheFolder != '') and (urlparse(dataUrl).scheme in ['http', 'https']):
+        # Server-side subset via DAP constraint expression, with the OpenDAP responses through the local HTTP cache (pydap client, 
+        # marked for loading the data without the netCDF lock)
+        srcDS = xr.open_dataset(dataUrl + '?' + ','.join(sourceIndex['hyperslabs']), engine='pydap', application=SDChttpApplication(dataUrl), decode_times=True)
+        srcDS.encoding['engine'] = 'pydap'
+        # pydap returns the attributes of the variables left out of the constraint as dictionaries among the global attributes, 
+        # and the floating point attributes without decimals (e.g. add_offset 0) as integers
+        srcDS.attrs = {attName: attValue for attName, attValue in srcDS.attrs.items() if not isinstance(attValue, dict)}
+        for srcVar in srcDS.variables.values():
+            for attName in ['scale_factor', 'add_offset']:
+                if isinstance(srcVar.encoding.get(attName), int):
+                    srcVar.encoding[attName] = float(srcVar.encoding[attName])
+    else:
+        with SDCncLock:
+            if urlparse(dataUrl).scheme in ['http', 'https']:
+                # Server-side subset via DAP constraint expression
+                srcDS = xr.open_dataset(dataUrl + '?' + ','.join(sourceIndex['hyperslabs']), decode_times=True)
+            else:
+                srcDS = xr.open_dataset(dataUrl, decode_times=True).drop_vars(sourceIndex['unneededVars']).isel(TIME=slice(sourceIndex['tIDX'], sourceIndex['tEndIDX']))
+
+    return srcDS
+
+def SDCsourceLoad(srcDS):
+    # This function loads in memory the data of the input lazily loaded source dataset (or of a subset of
+    # it). Datasets read by the netCDF library (local files and OpenDAP via the netCDF client) are loaded
+    # holding SDCncLock, so that the reads do not overlap with the netCDF I/O of the other threads of the
+    # process, while datasets read with the pydap client (see SDCopenSource) are loaded without the lock,
+    # so that their downloads overlap.
+    
+    # INPUTS:
+    #     srcDS: lazily loaded xarray Dataset opened by SDCopenSource.
+               
+    # OUTPUTS:
+    #     srcDS: xarray Dataset with the data loaded in memory.
+    
+    
+    if srcDS.encoding.get('engine') == 'pydap':
+        return srcDS.load()
+    
+    with SDCncLock:
+        return srcDS.load()
+
+def SDCsourceClose(srcDS):
+    # This function closes the files of the input source dataset holding SDCncLock, instead of leaving
+    # them to be closed by the garbage collector while the other threads of the process access the 
+    # netCDF library. Files are reopened if the data of the dataset (or of a subset of it) are read again.
+    
+    # INPUTS:
+    #     srcDS: xarray Dataset opened by SDCopenSource (None for nothing to be closed).
+               
+    # OUTPUTS:
+    
+    
+    if srcDS is not None:
+        with SDCncLock:
+            srcDS.close()
+    
+    return
+
+def SDCncAppendRecords(ncFile, appendDS, recordDim):
+    # This function appends the records of the input dataset to an existing netCDF file along its
+    # unlimited record dimension. Variables are CF-encoded by xarray (time units, scale factors, fill
+    # values and character arrays) according to their encoding dictionaries and written as raw values.
+    # Only the variables depending on the record dimension and already existing in the file are appended.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file to be appended.
+    #     appendDS: xarray Dataset containing the records to be appended.
+    #     recordDim: name of the unlimited record dimension.
+               
+    # OUTPUTS:
+    #     numRecords: number of records of the netCDF file after the append.
+    
+    
+    # Encode the variables according to the CF conventions
+    encVars, _ = xr.conventions.cf_encoder(dict(appendDS.variables), appendDS.attrs)
+    
+    # The records are in memory, thus the file can be written holding the lock of the netCDF library
+    with SDCncLock, NETCDF4_PYTHON_LOCK, nc4.Dataset(ncFile, 'a') as f:
+        f.set_auto_maskandscale(False)
+        f.set_auto_chartostring(False)
+        
+        # Retrieve the current number of records
+        recStart = len(f.dimensions[recordDim])
+        recEnd = recStart + appendDS.sizes[recordDim]
+        
+        # Write the records of each variable depending on the record dimension
+        for varName, encVar in encVars.items():
+            if (recordDim not in encVar.dims) or (varName not in f.variables):
+                continue
+            ncVar = f.variables[varName]
+            values = encVar.values
+            # Convert strings to character arrays with the string length of the file variable
+            if (values.dtype.kind in ('S', 'U', 'O')) and (ncVar.ndim == values.ndim + 1):
+                values = np.asarray(values, dtype='S' + str(ncVar.shape[-1])).view('S1').reshape(values.shape + (ncVar.shape[-1],))
+            hyperslab = tuple(slice(recStart, recEnd) if dimName == recordDim else slice(0, dimSize) for dimName, dimSize in zip(ncVar.dimensions, values.shape))
+            ncVar[hyperslab] = values
+        
+        numRecords = len(f.dimensions[recordDim])
+        
+    return numRecords
+
+def SDCncAppendFile(ncFile, srcFile, recordDim):
+    # This function appends the records of the input source netCDF file to an existing netCDF file
+    # along its unlimited record dimension. Raw values are copied without decoding, thus the two files
+    # must share the same encoding of the variables (as the files built from the same OpenDAP source).
+    # Time variables with different units are converted to the units of the destination file.
+    # Only the variables depending on the record dimension and existing in both files are appended.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file to be appended.
+    #     srcFile: path of the netCDF file containing the records to be appended.
+    #     recordDim: name of the unlimited record dimension.
+               
+    # OUTPUTS:
+    #     numRecords: number of records of the netCDF file after the append.
+    
+    
+    with SDCncLock, NETCDF4_PYTHON_LOCK, nc4.Dataset(ncFile, 'a') as f, nc4.Dataset(srcFile, 'r') as src:
+        f.set_auto_maskandscale(False)
+        f.set_auto_chartostring(False)
+        src.set_auto_maskandscale(False)
+        src.set_auto_chartostring(False)
+        
+        # Retrieve the current number of records
+        recStart = len(f.dimensions[recordDim])
+        recEnd = recStart + len(src.dimensions[recordDim])
+        
+        # Copy the records of each variable depending on the record dimension
+        for varName, ncVar in f.variables.items():
+            if (recordDim not in ncVar.dimensions) or (varName not in src.variables):
+                continue
+            values = src.variables[varName][:]
+            # Convert time values to the units of the destination file
+            if ('since' in getattr(ncVar, 'units', '')) and (ncVar.units.replace('+00:00','Z') != src.variables[varName].units.replace('+00:00','Z')):
+                calendar = getattr(ncVar, 'calendar', 'standard')
+                values = nc4.date2num(nc4.num2date(values, src.variables[varName].units, calendar), ncVar.units, calendar).astype(ncVar.dtype)
+            hyperslab = tuple(slice(recStart, recEnd) if dimName == recordDim else slice(0, dimSize) for dimName, dimSize in zip(ncVar.dimensions, values.shape))
+            ncVar[hyperslab] = values
+        
+        numRecords = len(f.dimensions[recordDim])
+        
+    return numRecords
+
+def SDCncLastRecord(ncFile, recordDim):
+    # This function reads the last value and the units of the coordinate variable of the unlimited record
+    # dimension of an existing netCDF file, without reading the other records. An error is raised if the
+    # record dimension is not unlimited, as no records can be appended to the file.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file.
+    #     recordDim: name of the unlimited record dimension (and of its time coordinate variable).
+               
+    # OUTPUTS:
+    #     lastTime: last value of the time coordinate (numpy datetime64).
+    #     timeUnits: units of the time coordinate.
+    
+    
+    with SDCncLock, NETCDF4_PYTHON_LOCK, nc4.Dataset(ncFile, 'r') as f:
+        if not f.dimensions[recordDim].isunlimited():
+            raise ValueError(recordDim + ' is not an unlimited dimension of ' + ncFile)
+        timeVar = f.variables[recordDim]
+        timeVar.set_auto_maskandscale(False)
+        lastRaw = timeVar[-1:]
+        timeUnits = timeVar.units
+        calendar = getattr(timeVar, 'calendar', 'standard')
+    lastTime = xr.coding.times.decode_cf_datetime(lastRaw, timeUnits, calendar).astype('datetime64[ns]')[0]
+    
+    return lastTime, timeUnits
+
+def SDCfileChecksum(filePath):
+    # This function evaluates the SHA-256 checksum of the input file, reading it by blocks.
+    
+    # INPUTS:
+    #     filePath: path of the file.
+               
+    # OUTPUTS:
+    #     checksum: hexadecimal SHA-256 checksum of the file.
+    
+    
+    sha = hashlib.sha256()
+    with open(filePath, 'rb') as f:
+        for block in iter(lambda: f.read(1048576), b''):
+            sha.update(block)
+            
+    return sha.hexdigest()
+
+def SDCstagePath(filePath):
+    # This function builds the path of the temporary file used for staging the input output file,
+    # in the same folder of the output file (so that it can be atomically renamed).
+    
+    # INPUTS:
+    #     filePath: path of the output file.
+               
+    # OUTPUTS:
+    #     partFile: path of the staging file.
+    
+    
+    return filePath + '.part'
+
+def SDCcommitFile(partFile, filePath):
+    # This function commits the input staging file: its content is flushed to disk, its size and
+    # SHA-256 checksum are evaluated while it is still hot in the page cache and it is atomically
+    # renamed to the output path, so that readers never see a partially written file.
+    
+    # INPUTS:
+    #     partFile: path of the staging file.
+    #     filePath: path of the output file.
+               
+    # OUTPUTS:
+    #     fileSize: size of the file in bytes.
+    #     checksum: hexadecimal SHA-256 checksum of the file.
+    
+    
+    sha = hashlib.sha256()
+    with open(partFile, 'rb') as f:
+        os.fsync(f.fileno())
+        fileSize = os.fstat(f.fileno()).st_size
+        for block in iter(lambda: f.read(1048576), b''):
+            sha.update(block)
+    os.replace(partFile, filePath)
+            
+    return fileSize, sha.hexdigest()
+
+def SDCfingerprintPath(ncFile):
+    # This function builds the path of the fingerprint file of the input netCDF file, stored next to
+    # it as a hidden file.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file.
+               
+    # OUTPUTS:
+    #     fingerprintFile: path of the fingerprint file.
+    
+    
+    return os.path.join(os.path.dirname(ncFile), '.' + os.path.basename(ncFile) + '.fingerprint')
+
+def SDCfingerprint(sourceIndex, profileName, productSchema):
+    # This function builds the fingerprint of an aggregated dataset from the state of its source data
+    # (TIME coverage, number of records and modification stamp) and from the settings affecting the
+    # content of the file (output profile and software version of the product).
+    
+    # INPUTS:
+    #     sourceIndex: dictionary containing the source index built by SDCsourceIndex.
+    #     profileName: name of the output profile of the dataset.
+    #     productSchema: dictionary containing the product schema table (e.g. SDCradialProductSchema).
+               
+    # OUTPUTS:
+    #     fingerprint: dictionary containing the fingerprint.
+    
+    
+    fingerprint = {'timeFirst': str(sourceIndex['timeFirst']), 'timeLast': str(sourceIndex['timeLast']), 
+                   'numRecords': sourceIndex['numRecords'], 'modified': sourceIndex['modified'], 
+                   'profileName': profileName, 'softwareVersion': productSchema['setGlobalAttrs']['software_version']}
+    
+    return fingerprint
+
+def SDCfingerprintMatch(ncFile, fingerprint):
+    # This function checks if the input netCDF file was built from the same source data and settings
+    # described by the input fingerprint, i.e. if the file exists with the size recorded in its 
+    # fingerprint file and the recorded fingerprint matches the input one.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file.
+    #     fingerprint: dictionary containing the fingerprint built by SDCfingerprint.
+               
+    # OUTPUTS:
+    #     match: flag for unchanged datasets.
+    
+    
+    try:
+        with open(SDCfingerprintPath(ncFile)) as f:
+            storedFingerprint = json.load(f)
+        ncFilesize = storedFingerprint.pop('fileSize')
+        storedFingerprint.pop('stats', None)
+        return (storedFingerprint == fingerprint) and (os.path.getsize(ncFile) == ncFilesize)
+    except (OSError, ValueError, KeyError):
+        return False
+
+def SDCfingerprintStore(ncFile, fingerprint, stats=None):
+    # This function writes the fingerprint of the input netCDF file (together with its size and its
+    # coverage statistics, for appending records to it) to its fingerprint file, via a staging file
+    # atomically renamed.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file.
+    #     fingerprint: dictionary containing the fingerprint built by SDCfingerprint.
+    #     stats: dictionary containing the coverage statistics of the file (see SDCstatsChunk).
+               
+    # OUTPUTS:
+    
+    
+    fingerprintFile = SDCfingerprintPath(ncFile)
+    with open(SDCstagePath(fingerprintFile), 'w') as f:
+        json.dump(dict(fingerprint, fileSize=os.path.getsize(ncFile), stats=stats), f)
+    os.replace(SDCstagePath(fingerprintFile), fingerprintFile)
+    
+    return
+
+def SDCfingerprintDiscard(ncFiles):
+    # This function removes the fingerprint files of the input netCDF files, so that the datasets are
+    # rebuilt at the next run (e.g. when their database records or CDIs could not be written).
+    
+    # INPUTS:
+    #     ncFiles: list of the paths of the netCDF files.
+               
+    # OUTPUTS:
+    
+    
+    for ncFile in ncFiles:
+        if os.path.isfile(SDCfingerprintPath(ncFile)):
+            os.remove(SDCfingerprintPath(ncFile))
+    
+    return
+
+def SDCappendIndex(ncFile, sourceIndex, fingerprint):
+    # This function checks if the TIME records of the input source index newer than the last record of the
+    # existing netCDF file can be appended to it, i.e. if the file exists with the size recorded in its
+    # fingerprint file and with unlimited TIME dimension, it was built with the same settings and the source
+    # data it was built from are unchanged (same first TIME and same number of records up to its last TIME).
+    # The last TIME of the file is read from the file itself.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file.
+    #     sourceIndex: dictionary containing the source index of the aggregation interval built by SDCsourceIndex.
+    #     fingerprint: dictionary containing the fingerprint of the source index built by SDCfingerprint.
+               
+    # OUTPUTS:
+    #     appendIndex: source index of the records to be appended (None if the records cannot be appended).
+    #     stats: coverage statistics of the existing file (None if the records cannot be appended).
+    
+    
+    try:
+        with open(SDCfingerprintPath(ncFile)) as f:
+            storedFingerprint = json.load(f)
+        isValid = ((os.path.getsize(ncFile) == storedFingerprint['fileSize']) and (storedFingerprint.get('stats') is not None) and 
+                   all(storedFingerprint[key] == fingerprint[key] for key in ['timeFirst', 'profileName', 'softwareVersion']) and 
+                   (np.searchsorted(sourceIndex['timeValues'], np.datetime64(storedFingerprint['timeLast']), side='right') == storedFingerprint['numRecords']))
+    except (OSError, ValueError, KeyError):
+        return None, None
+    if not isValid:
+        return None, None
+    
+    # Select the source records newer than the last record of the file
+    try:
+        lastTime, timeUnits = SDCncLastRecord(ncFile, 'TIME')
+    except (OSError, ValueError):
+        return None, None
+    appendIndex = SDCsourceSplit(sourceIndex, [(lastTime + np.timedelta64(1, 'ns'), sourceIndex['timeLast'], None)])[0]
+    if appendIndex is None:
+        return None, None
+    
+    return appendIndex, storedFingerprint['stats']
+
+def SDCappendMetadata(ncFile, productSchema, productMeta):
+    # This function updates the global attributes of the time coverage and of the modification dates of
+    # the input netCDF file (see SDCappendGlobalAttrs) after appending records to it, according to the
+    # input product schema table. The history records the update.
+    
+    # INPUTS:
+    #     ncFile: path of the netCDF file.
+    #     productSchema: dictionary containing the product schema table (e.g. SDCradialProductSchema).
+    #     productMeta: dictionary containing the product metadata of the dataset after the append.
+               
+    # OUTPUTS:
+    
+    
+    with SDCncLock, NETCDF4_PYTHON_LOCK, nc4.Dataset(ncFile, 'a') as f:
+        for attName in SDCappendGlobalAttrs:
+            f.setncattr(attName, productSchema['setGlobalAttrs'][attName].format(**productMeta))
+        historyMeta = dict(productMeta, creationDate=f.getncattr('date_created'))
+        f.setncattr('history', productSchema['setGlobalAttrs']['history'].format(**historyMeta) + 
+                    'NetCDF file updated by the European HFR Node on ' + productMeta['creationDate'] + '.')
+    
+    return
+
+def SDCencodeTime(sdcDS):
+    # This function encodes the TIME variable of the input dataset according to the CF conventions
+    # and sets the timezone of its units attribute as 'Z' (xarray writes it as '+00:00'), so that the
+    # final TIME units are written together with the data and the file does not need to be reopened.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset with decoded TIME variable.
+               
+    # OUTPUTS:
+    #     sdcDS: xarray Dataset with encoded TIME variable.
+    
+    
+    timeVar = xr.conventions.encode_cf_variable(sdcDS.variables['TIME'], name='TIME')
+    timeVar.attrs['units'] = timeVar.attrs.pop('units').replace('+00:00','Z')
+    
+    # Rebuild the dataset (shallow) with the encoded TIME variable, keeping the order of the variables
+    allVars = {varName: (timeVar if varName == 'TIME' else sdcVar) for varName, sdcVar in sdcDS.variables.items()}
+    encodedDS = xr.Dataset(allVars, attrs=sdcDS.attrs).set_coords(list(sdcDS.coords))
+    encodedDS.encoding = sdcDS.encoding
+    
+    return encodedDS
+
+def SDCoutputProfileName(curNetwork):
+    # This function selects the output profile of the input network: the profile set for the network
+    # in the configuration (networkOutputProfiles) is used first, then the one set in the database
+    # (SDC_output_profile field of network_tb, if present) and finally the default one (outputProfile).
+    
+    # INPUTS:
+    #     curNetwork: SDCnetworkRecord of the network.
+               
+    # OUTPUTS:
+    #     profileName: name of the output profile (key of SDCoutputProfiles).
+    
+    
+    networkID = curNetwork.network_id
+    
+    if networkID in networkOutputProfiles:
+        profileName = networkOutputProfiles[networkID]
+    elif curNetwork.SDC_output_profile != '':
+        profileName = curNetwork.SDC_output_profile
+    else:
+        profileName = outputProfile
+        
+    if profileName not in SDCoutputProfiles:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: unknown output profile ' + str(profileName) + ' for network ' + networkID + ', ' + outputProfile + ' profile used.')
+        profileName = outputProfile
+        
+    return profileName
+
+def SDCapplyOutputProfile(sdcDS, profileName):
+    # This function sets the compression, shuffle and chunking encodings of the variables of the input
+    # dataset according to the input output profile. Chunk shapes are built for each variable from its
+    # dimensions (TIME-major chunks, limited to the variable shape). String variables are not modified.
+    # The encodings are modified in place (passing them to to_netcdf would replace the SDC encodings).
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset to be written.
+    #     profileName: name of the output profile (key of SDCoutputProfiles).
+               
+    # OUTPUTS:
+    #     sdcDS: xarray Dataset with the encodings of the profile.
+    
+    
+    profile = SDCoutputProfiles[profileName]
+    if profile is None:
+        return sdcDS
+    
+    for sdcVar in sdcDS.variables.values():
+        if (sdcVar.ndim == 0) or (sdcVar.dtype.kind in ('S', 'U', 'O')):
+            continue
+        varEncoding = sdcVar.encoding
+        # Remove the storage settings of the source data (original_shape would make xarray drop the chunk sizes)
+        for k in ['contiguous', 'original_shape', 'compression']:
+            varEncoding.pop(k, None)
+        varEncoding['zlib'] = profile['complevel'] > 0
+        varEncoding['complevel'] = profile['complevel']
+        varEncoding['shuffle'] = profile['shuffle']
+        varEncoding['chunksizes'] = tuple(max(min(profile['chunkSizes'].get(dimName, dimSize), dimSize), 1) for dimName, dimSize in zip(sdcVar.dims, sdcVar.shape))
+        
+    return sdcDS
+
+def SDCworkerSettings():
+    # This function collects the global settings to be propagated to the worker processes.
+    # The names of the settings are listed in SDCsharedSettings.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     settings: dictionary containing key-values pairs <settingName>:<settingValue>.
+    
+    
+    return {k: globals()[k] for k in SDCsharedSettings if k in globals()}
+
+def SDCworkerInit(settings):
+    # This function initializes the global settings of a worker process, in order to make
+    # the worker independent from the process start method (fork or spawn).
+    
+    # INPUTS:
+    #     settings: dictionary containing key-values pairs <settingName>:<settingValue>.
+               
+    # OUTPUTS:
+    
+    
+    globals().update(settings)
+    
+    return
+
+def SDCparallelExec(workerFunc, workUnits, unitHosts, unitCosts=None):
+    # This function runs the input worker function on each work unit according to the selected
+    # execution mode ('serial', 'thread' or 'process'). No more than maxWorkers units are run at
+    # the same time and no more than maxPerHost units are run at the same time against the same
+    # host, in order not to flood a single THREDDS server. If the costs of the units are estimated,
+    # the units are run within the memory budget (see SDCmemoryAdmit).
+    # Exceptions raised by a single unit are isolated and the related result is set to None.
+    
+    # INPUTS:
+    #     workerFunc: function to be run on each work unit.
+    #     workUnits: list of tuples containing the input arguments of workerFunc for each unit.
+    #     unitHosts: list containing the name of the host accessed by each unit.
+    #     unitCosts: list containing the estimated cost of each unit (see SDCplanUnits), or None.
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     results: list containing the outputs of workerFunc for each unit, in the same order as workUnits.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCparallelExec started in ' + executionMode + ' mode.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Initialize results
+    results = [None] * len(workUnits)
+    
+    # Serial execution
+    if executionMode == 'serial':
+        for uIDX in range(len(workUnits)):
+            try:
+                results[uIDX] = workerFunc(*workUnits[uIDX])
+            except Exception as err:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                Rerr = True
+    
+    # Parallel execution
+    else:
+        if executionMode == 'process':
+            executor = ProcessPoolExecutor(max_workers=maxWorkers, initializer=SDCworkerInit, initargs=(SDCworkerSettings(),))
+        else:
+            executor = ThreadPoolExecutor(max_workers=maxWorkers)
+        
+        unitCosts = unitCosts or [None] * len(workUnits)
+        pendingUnits = list(range(len(workUnits)))
+        runningUnits = {}
+        hostLoad = {}
+        memoryLoad = 0
+        with executor:
+            while pendingUnits or runningUnits:
+                # Submit the pending units whose host is below the concurrency cap and which fit in the memory budget
+                for uIDX in list(pendingUnits):
+                    if len(runningUnits) >= maxWorkers:
+                        break
+                    if (hostLoad.get(unitHosts[uIDX], 0) < maxPerHost) and SDCmemoryAdmit(unitCosts[uIDX], memoryLoad, len(runningUnits)):
+                        runningUnits[executor.submit(workerFunc, *workUnits[uIDX])] = uIDX
+                        hostLoad[unitHosts[uIDX]] = hostLoad.get(unitHosts[uIDX], 0) + 1
+                        memoryLoad += unitCosts[uIDX]['peakBytes'] if unitCosts[uIDX] is not None else 0
+                        pendingUnits.remove(uIDX)
+                
+                # Wait for at least one unit to be completed and collect the results
+                doneUnits, _ = wait(runningUnits, return_when=FIRST_COMPLETED)
+                for fut in doneUnits:
+                    uIDX = runningUnits.pop(fut)
+                    hostLoad[unitHosts[uIDX]] -= 1
+                    memoryLoad -= unitCosts[uIDX]['peakBytes'] if unitCosts[uIDX] is not None else 0
+                    try:
+                        results[uIDX] = fut.result()
+                    except Exception as err:
+                        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                        Rerr = True
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCparallelExec successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCparallelExec exited with an error.')
+        
+    return Rerr, results
+
+
+#####################################
+# INSTRUMENTATION
+#####################################
+
+def SDCunitName(curNetwork, curStation=None):
+    # This function builds the name of a processing unit (station or totals of a network), used for
+    # labelling its timed spans and profiles.
+    
+    # INPUTS:
+    #     curNetwork: SDCnetworkRecord of the network.
+    #     curStation: SDCstationRecord of the station (None for totals).
+               
+    # OUTPUTS:
+    #     unitName: name of the unit (platform code).
+    
+    
+    return curNetwork.network_id + '-' + (curStation.station_id if curStation is not None else 'Total')
+
+def SDCunitIDs(curNetwork, curStation=None):
+    # This function builds the identifiers of a processing unit (station or totals of a network), as
+    # the values of the columns of the dataset table identifying the unit (see SDCdataTypes).
+    
+    # INPUTS:
+    #     curNetwork: SDCnetworkRecord of the network.
+    #     curStation: SDCstationRecord of the station (None for totals).
+               
+    # OUTPUTS:
+    #     unitIDs: dictionary containing the network_id (and the station_id for stations) of the unit.
+    
+    
+    if curStation is None:
+        return {'network_id': curNetwork.network_id}
+    
+    return {'network_id': curNetwork.network_id, 'station_id': curStation.station_id}
+
+@contextlib.contextmanager
+def SDCspan(stageName, **spanInfo):
+    # This function (context manager) measures a timed span of the input stage (e.g. fetch, remap, attrs,
+    # write, db) of the unit processed by the current thread. The span contains the unit name, the stage
+    # name, the start time, the duration, the peak resident memory of the process at the end of the span 
+    # and the input info (e.g. bytes), and it is recorded only within SDCspanCollect. In tracemalloc 
+    # profile mode the peak traced memory during the span is recorded too.
+    
+    # INPUTS:
+    #     stageName: name of the stage.
+    #     spanInfo: additional key-values pairs of the span (e.g. bytes=<number of bytes>).
+               
+    # OUTPUTS:
+    #     span: dictionary containing the span, to which further info can be added within the span.
+    
+    
+    spans = getattr(SDCspanState, 'spans', None)
+    span = dict(unit=getattr(SDCspanState, 'unit', None), stage=stageName, start=time.time(), **spanInfo)
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    tStart = time.perf_counter()
+    try:
+        yield span
+    except BaseException:
+        span['error'] = True
+        raise
+    finally:
+        span['duration'] = time.perf_counter() - tStart
+        span['maxRSS'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        if tracemalloc.is_tracing():
+            span['peakTraced'] = tracemalloc.get_traced_memory()[1] / 1024**2
+        if spans is not None:
+            spans.append(span)
+
+@contextlib.contextmanager
+def SDCspanCollect(unitName, profileTag=None):
+    # This function (context manager) collects the timed spans of the input unit processed by the 
+    # current thread, to be returned by the workers together with their results. If a profile tag is
+    # given, the unit is profiled according to profileMode: 'cprofile' dumps the cProfile statistics
+    # of the unit to <profileFolder>/<unitName><profileTag>.prof, 'tracemalloc' traces the memory
+    # allocations and writes the top allocation sites to <profileFolder>/<unitName><profileTag>.tracemalloc.txt.
+    
+    # INPUTS:
+    #     unitName: name of the unit.
+    #     profileTag: suffix of the profile files of the unit (None for not profiling the unit).
+               
+    # OUTPUTS:
+    #     spans: list of the span dictionaries collected within the context.
+    
+    
+    prevState = (getattr(SDCspanState, 'unit', None), getattr(SDCspanState, 'spans', None))
+    SDCspanState.unit = unitName
+    SDCspanState.spans = spans = []
+    
+    # Start the profiler
+    profiler = None
+    tracing = False
+    if (profileTag is not None) and (profileMode == 'cprofile'):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active in this process (Python >= 3.12 allows one at a time)
+            profiler = None
+    elif (profileTag is not None) and (profileMode == 'tracemalloc') and (not tracemalloc.is_tracing()):
+        tracemalloc.start()
+        tracing = True
+    
+    try:
+        yield spans
+    finally:
+        SDCspanState.unit, SDCspanState.spans = prevState
+        profileFile = os.path.join(profileFolder, unitName + (profileTag or ''))
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profileFile + '.prof')
+        elif tracing:
+            topStats = tracemalloc.take_snapshot().statistics('lineno')[:25]
+            tracemalloc.stop()
+            with open(profileFile + '.tracemalloc.txt', 'w') as f:
+                f.write('\n'.join(str(stat) for stat in topStats) + '\n')
+
+def SDCspanExtend(spans):
+    # This function adds the input spans (e.g. returned by the workers) to the spans collected by the
+    # current thread.
+    
+    # INPUTS:
+    #     spans: list of span dictionaries.
+               
+    # OUTPUTS:
+    
+    
+    collectedSpans = getattr(SDCspanState, 'spans', None)
+    if collectedSpans is not None:
+        collectedSpans.extend(spans)
+        
+    return
+
+def SDCmetricsExport(spans, metricsFile, metricsFormat, runStart, runDuration):
+    # This function exports the timed spans of a run to the metrics sink, either as JSON lines (one
+    # line per span, appended to the metrics file) or as a Prometheus textfile (gauges aggregated by
+    # unit and stage, replacing the metrics file atomically, as required by the textfile collector).
+    
+    # INPUTS:
+    #     spans: list of span dictionaries.
+    #     metricsFile: path of the metrics file.
+    #     metricsFormat: format of the metrics file ('jsonl' or 'prometheus').
+    #     runStart: start time of the run (seconds since the epoch).
+    #     runDuration: duration of the run in seconds.
+               
+    # OUTPUTS:
+    
+    
+    os.makedirs(os.path.dirname(metricsFile) or '.', exist_ok=True)
+    if metricsFormat == 'jsonl':
+        runID = datetime.datetime.utcfromtimestamp(runStart).isoformat('T','seconds') + 'Z'
+        with open(metricsFile, 'a') as f:
+            for span in spans:
+                f.write(json.dumps(dict(span, run=runID), default=str) + '\n')
+            f.write(json.dumps({'run': runID, 'unit': None, 'stage': 'run', 'start': runStart, 'duration': runDuration, 
+                                'maxRSS': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}) + '\n')
+        return
+    
+    # Aggregate the spans by unit and stage
+    stageMetrics = {}
+    for span in spans:
+        metrics = stageMetrics.setdefault((span['unit'], span['stage']), {'duration': 0.0, 'spans': 0, 'bytes': 0, 'maxRSS': 0.0, 'errors': 0})
+        metrics['duration'] += span['duration']
+        metrics['spans'] += 1
+        metrics['bytes'] += span.get('bytes', 0)
+        metrics['maxRSS'] = max(metrics['maxRSS'], span['maxRSS'])
+        metrics['errors'] += int(span.get('error', False))
+    
+    metricDefs = [('duration', 'sdc_stage_duration_seconds', 'Wall time spent in the stage by the unit in the last run.'), 
+                  ('spans', 'sdc_stage_spans', 'Number of timed spans of the stage of the unit in the last run.'), 
+                  ('bytes', 'sdc_stage_bytes', 'Bytes loaded or written in the stage by the unit in the last run.'), 
+                  ('maxRSS', 'sdc_stage_max_rss_megabytes', 'Peak resident memory of the process at the end of the stage in the last run.'), 
+                  ('errors', 'sdc_stage_errors', 'Number of failed spans of the stage of the unit in the last run.')]
+    lines = []
+    for metricKey, metricName, metricHelp in metricDefs:
+        lines += ['# HELP ' + metricName + ' ' + metricHelp, '# TYPE ' + metricName + ' gauge']
+        for (unitName, stageName), metrics in sorted(stageMetrics.items(), key=lambda item: (str(item[0][0]), item[0][1])):
+            lines.append(metricName + '{unit="' + str(unitName or '') + '",stage="' + stageName + '"} ' + repr(metrics[metricKey]))
+    lines += ['# HELP sdc_run_duration_seconds Wall time of the last run.', '# TYPE sdc_run_duration_seconds gauge', 
+              'sdc_run_duration_seconds ' + repr(runDuration), 
+              '# HELP sdc_run_timestamp_seconds Start time of the last run.', '# TYPE sdc_run_timestamp_seconds gauge', 
+              'sdc_run_timestamp_seconds ' + repr(runStart)]
+    with open(SDCstagePath(metricsFile), 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(SDCstagePath(metricsFile), metricsFile)
+    
+    return
+
+
+#####################################
+# MONTHLY CACHE MANAGEMENT
+#####################################
+
+def SDCcachePaths(platformCode, month):
+    # This function builds the paths of the netCDF file and of the metadata file of the cached
+    # SDC-transformed monthly slice of the input platform.
+    
+    # INPUTS:
+    #     platformCode: platform code (EDIOS_Series_ID-EDIOS_Platform_ID).
+    #     month: datetime of the first day of the month.
+               
+    # OUTPUTS:
+    #     cacheFile: path of the cached netCDF file.
+    #     metaFile: path of the metadata file of the cached netCDF file.
+    
+    
+    cacheFile = os.path.join(cacheFolder, platformCode, platformCode + '_' + month.strftime('%Y%m') + '.nc')
+    metaFile = cacheFile + '.json'
+    
+    return cacheFile, metaFile
+
+def SDCcacheSchemaHash():
+    # This function builds the hash of the settings used for SDC-transforming the cached monthly slices:
+    # the radial schema table, the QC remapping lookup table and the software version of the product.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     schemaHash: SHA-256 hex digest of the settings.
+    
+    
+    schemaState = [SDCradialSchema, QCremapLUT.tolist(), SDCradialProductSchema['setGlobalAttrs']['software_version']]
+    schemaJSON = json.dumps(schemaState, sort_keys=True, default=lambda obj: sorted(map(repr, obj)) if isinstance(obj, (set, frozenset)) else repr(obj))
+    
+    return hashlib.sha256(schemaJSON.encode()).hexdigest()
+
+def SDCcacheLoad(platformCode, month, numRecords, timeStart, timeEnd, profileName):
+    # This function checks if a valid cached monthly slice exists for the input platform and month.
+    # The cached slice is valid if it is finalized, if its integrity is verified against the stored
+    # checksum (if cacheVerify is set), if the source data did not change (i.e. the number of
+    # records and the time range of the source data are the same as the cached ones) and if it was
+    # transformed with the same settings (schema hash, see SDCcacheSchemaHash, and output profile).
+    # Corrupted or outdated cached slices (and slices cached without coverage statistics) are removed,
+    # as well as the slices of the months not finalized yet, rebuilt at each run.
+    
+    # INPUTS:
+    #     platformCode: platform code (EDIOS_Series_ID-EDIOS_Platform_ID).
+    #     month: datetime of the first day of the month.
+    #     numRecords: number of TIME records of the source data for the month.
+    #     timeStart: first TIME of the source data for the month (ISO string).
+    #     timeEnd: last TIME of the source data for the month (ISO string).
+    #     profileName: name of the output profile (key of SDCoutputProfiles).
+               
+    # OUTPUTS:
+    #     cacheFile: path of the cached netCDF file (None if no valid cached slice exists).
+    #     stats: coverage statistics of the cached slice (None if no valid cached slice exists).
+    
+    
+    cacheFile, metaFile = SDCcachePaths(platformCode, month)
+    
+    # Read the metadata of the cached slice
+    try:
+        with open(metaFile, 'r') as f:
+            cacheMeta = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    
+    # Check the cached slice
+    isValid = (cacheMeta['finalized'] and ('stats' in cacheMeta) and os.path.isfile(cacheFile) and (cacheMeta['num_records'] == numRecords) and (cacheMeta['time_start'] == timeStart) and 
+               (cacheMeta['time_end'] == timeEnd) and (cacheMeta.get('schema_hash') == SDCcacheSchemaHash()) and (cacheMeta.get('profile_name') == profileName))
+    if isValid and cacheVerify:
+        isValid = (SDCfileChecksum(cacheFile) == cacheMeta['checksum'])
+        
+    if not isValid:
+        if cacheMeta['finalized']:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Cached slice ' + cacheFile + ' is outdated or corrupted and will be rebuilt.')
+        for filePath in (cacheFile, metaFile):
+            if os.path.isfile(filePath):
+                os.remove(filePath)
+        return None, None
+    
+    # Update the last access time
+    cacheMeta['last_access'] = datetime.datetime.now().isoformat('T','seconds')
+    with open(metaFile + '.tmp', 'w') as f:
+        json.dump(cacheMeta, f)
+    os.replace(metaFile + '.tmp', metaFile)
+    
+    return cacheFile, cacheMeta['stats']
+
+def SDCcacheStore(platformCode, month, monthDS, sensor, numRecords, timeStart, timeEnd, profileName):
+    # This function transforms the input monthly slice according to the SDC schema and stores
+    # it in the cache, together with its metadata (checksum, number of records, time range, coverage
+    # statistics, schema hash and output profile).
+    # Only months that are completely elapsed are marked as finalized.
+    
+    # INPUTS:
+    #     platformCode: platform code (EDIOS_Series_ID-EDIOS_Platform_ID).
+    #     month: datetime of the first day of the month.
+    #     monthDS: xarray Dataset containing the source data of the month.
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     numRecords: number of TIME records of the source data for the month.
+    #     timeStart: first TIME of the source data for the month (ISO string).
+    #     timeEnd: last TIME of the source data for the month (ISO string).
+    #     profileName: name of the output profile (key of SDCoutputProfiles).
+               
+    # OUTPUTS:
+    #     cacheFile: path of the cached netCDF file.
+    #     stats: coverage statistics of the monthly slice (see SDCstatsChunk).
+    
+    
+    cacheFile, metaFile = SDCcachePaths(platformCode, month)
+    os.makedirs(os.path.dirname(cacheFile), exist_ok=True)
+    
+    # Transform and write the monthly slice (the metadata file is removed first, so that an
+    # interrupted write leaves an invalid entry)
+    if os.path.isfile(metaFile):
+        os.remove(metaFile)
+    stats = SDCwriteChunks(monthDS, 'radial', sensor, SDCstagePath(cacheFile), None, profileName, streamChunkSize)
+    with SDCspan('commit'):
+        cacheSize, cacheChecksum = SDCcommitFile(SDCstagePath(cacheFile), cacheFile)
+    
+    # Write the metadata of the cached slice
+    cacheMeta = {'platform_code': platformCode, 'month': month.strftime('%Y%m'), 'num_records': numRecords, 
+                 'time_start': timeStart, 'time_end': timeEnd, 'checksum': cacheChecksum, 'stats': stats, 
+                 'schema_hash': SDCcacheSchemaHash(), 'profile_name': profileName, 
+                 'size': cacheSize, 'finalized': (month + relativedelta(months=1)) <= datetime.datetime.utcnow(), 
+                 'created': datetime.datetime.now().isoformat('T','seconds'), 'last_access': datetime.datetime.now().isoformat('T','seconds')}
+    with open(metaFile + '.tmp', 'w') as f:
+        json.dump(cacheMeta, f)
+    os.replace(metaFile + '.tmp', metaFile)
+    
+    return cacheFile, stats
+
+def SDCcacheEvict():
+    # This function evicts from the cache the monthly slices not accessed for more than cacheMaxAge days
+    # and then the least recently used slices, until the cache size is below cacheMaxSize bytes.
+    # Orphan netCDF files (i.e. without metadata file) are removed too.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcacheEvict started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    try:
+        # List the cached slices
+        cacheEntries = []
+        for dirPath, dirNames, fileNames in os.walk(cacheFolder):
+            for fileName in fileNames:
+                filePath = os.path.join(dirPath, fileName)
+                if fileName.endswith('.nc'):
+                    if not os.path.isfile(filePath + '.json'):
+                        os.remove(filePath)
+                elif fileName.endswith('.nc.json'):
+                    with open(filePath, 'r') as f:
+                        cacheMeta = json.load(f)
+                    cacheEntries.append((cacheMeta['last_access'], cacheMeta['size'], filePath[:-len('.json')], filePath))
+        
+        # Evict the slices from the least recently used one
+        cacheEntries.sort()
+        cacheSize = sum(entry[1] for entry in cacheEntries)
+        oldestAccess = (datetime.datetime.now() - datetime.timedelta(days=cacheMaxAge)).isoformat('T','seconds')
+        for lastAccess, fileSize, cacheFile, metaFile in cacheEntries:
+            if (lastAccess >= oldestAccess) and (cacheSize <= cacheMaxSize):
+                break
+            os.remove(metaFile)
+            if os.path.isfile(cacheFile):
+                os.remove(cacheFile)
+            cacheSize -= fileSize
+    except Exception as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+        Rerr = True
+        
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcacheEvict successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcacheEvict exited with an error.')
+        
+    return Rerr
+
+
+#####################################
+# OPENDAP HTTP CACHE
+#####################################
+
+def SDChttpCachePaths(url):
+    # This function builds the paths of the body file and of the metadata file of the cached response
+    # to the input url (DDS, DAS or data response of an OpenDAP request).
+    
+    # INPUTS:
+    #     url: url of the request, including the constraint expression.
+               
+    # OUTPUTS:
+    #     bodyFile: path of the cached response body.
+    #     metaFile: path of the metadata file of the cached response.
+    
+    
+    urlKey = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    bodyFile = os.path.join(httpCacheFolder, urlKey[:2], urlKey + '.body')
+    metaFile = bodyFile + '.json'
+    
+    return bodyFile, metaFile
+
+def SDChttpCacheStore(url, response, body):
+    # This function stores the input response in the cache, together with its validators (ETag and 
+    # Last-Modified headers) and its validation and access times. Body and metadata files are staged
+    # and atomically renamed, the metadata file last, so that readers never see a partial entry.
+    
+    # INPUTS:
+    #     url: url of the request.
+    #     response: requests Response object.
+    #     body: content of the response.
+               
+    # OUTPUTS:
+    #     cacheMeta: dictionary containing the metadata of the cached response.
+    
+    
+    bodyFile, metaFile = SDChttpCachePaths(url)
+    os.makedirs(os.path.dirname(bodyFile), exist_ok=True)
+    headers = {k: v for k, v in response.headers.items() if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding', 'connection')}
+    cacheMeta = {'url': url, 'headers': headers, 'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified'), 
+                 'validated': time.time(), 'last_access': datetime.datetime.now().isoformat('T','seconds'), 'size': len(body)}
+    partFile = bodyFile + '.' + str(os.getpid()) + '-' + str(threading.get_ident()) + '.part'
+    with open(partFile, 'wb') as f:
+        f.write(body)
+    os.replace(partFile, bodyFile)
+    SDChttpCacheTouch(url, cacheMeta)
+    
+    return cacheMeta
+
+def SDChttpCacheTouch(url, cacheMeta):
+    # This function updates the metadata file of the cached response to the input url (e.g. its access
+    # time for the LRU eviction, or its validation time).
+    
+    # INPUTS:
+    #     url: url of the request.
+    #     cacheMeta: dictionary containing the metadata of the cached response.
+               
+    # OUTPUTS:
+    
+    
+    bodyFile, metaFile = SDChttpCachePaths(url)
+    cacheMeta['last_access'] = datetime.datetime.now().isoformat('T','seconds')
+    partFile = metaFile + '.' + str(os.getpid()) + '-' + str(threading.get_ident()) + '.part'
+    with open(partFile, 'w') as f:
+        json.dump(cacheMeta, f)
+    os.replace(partFile, metaFile)
+    
+    return
+
+def SDChttpCacheLoad(url):
+    # This function reads the metadata of the cached response to the input url, if any.
+    
+    # INPUTS:
+    #     url: url of the request.
+               
+    # OUTPUTS:
+    #     cacheMeta: dictionary containing the metadata of the cached response (None if not cached).
+    
+    
+    bodyFile, metaFile = SDChttpCachePaths(url)
+    try:
+        with open(metaFile, 'r') as f:
+            cacheMeta = json.load(f)
+        if (cacheMeta['url'] != url) or (os.path.getsize(bodyFile) != cacheMeta['size']):
+            return None
+    except (OSError, ValueError, KeyError):
+        return None
+    
+    return cacheMeta
+
+# Transport adapter of the requests sessions of the OpenDAP client, answering GET requests from the
+# local on-disk cache of httpCacheFolder:
+#     - metadata responses (DDS, DAS and DMR) validated less than httpCacheTTL seconds ago are served
+#       from the cache without contacting the server;
+#     - the other cached responses are revalidated with a conditional request (If-None-Match and 
+#       If-Modified-Since headers, from their ETag and Last-Modified validators) and served from the
+#       cache if the server answers 304 Not Modified;
+#     - successful responses are stored in the cache (data responses only if they carry a validator).
+# Each request is recorded as a timed span of stage http-hit, http-revalidated or http-miss, whose
+# counts are the hit and miss counters of the cache.
+class SDChttpCacheAdapter(HTTPAdapter):
+    
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+        
+        url = request.url
+        metaRequest = os.path.splitext(urlparse(url).path)[1] in ('.dds', '.das', '.dmr')
+        cacheMeta = SDChttpCacheLoad(url)
+        with SDCspan('http-miss') as span:
+            # Fresh metadata response
+            if (cacheMeta is not None) and metaRequest and (time.time() - cacheMeta['validated'] < httpCacheTTL):
+                span['stage'] = 'http-hit'
+                return self.cachedResponse(request, cacheMeta, span)
+            
+            # Conditional request for the cached responses
+            if cacheMeta is not None:
+                if cacheMeta['etag']:
+                    request.headers['If-None-Match'] = cacheMeta['etag']
+                if cacheMeta['last_modified']:
+                    request.headers['If-Modified-Since'] = cacheMeta['last_modified']
+            response = super().send(request, **kwargs)
+            if (cacheMeta is not None) and (response.status_code == 304):
+                response.close()
+                cacheMeta['validated'] = time.time()
+                span['stage'] = 'http-revalidated'
+                return self.cachedResponse(request, cacheMeta, span)
+            
+            # Store the successful responses
+            if (response.status_code == 200) and (metaRequest or response.headers.get('ETag') or response.headers.get('Last-Modified')):
+                SDChttpCacheStore(url, response, response.content)
+            span['bytes'] = len(response.content)
+            
+        return response
+    
+    def cachedResponse(self, request, cacheMeta, span):
+        # Build the response to the request from the cached body
+        bodyFile, metaFile = SDChttpCachePaths(request.url)
+        with open(bodyFile, 'rb') as f:
+            body = f.read()
+        SDChttpCacheTouch(request.url, cacheMeta)
+        span['bytes'] = len(body)
+        
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = requests.structures.CaseInsensitiveDict(cacheMeta['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = io.BytesIO(body)
+        response._content = body
+        response._content_consumed = True
+        
+        return response
+
+def SDChttpSession():
+    # This function gets the requests session of the current thread, answering from the local HTTP 
+    # cache (see SDChttpCacheAdapter). Sessions are created at the first request of each
+    # thread, as requests sessions are not thread-safe.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     session: requests Session object.
+    
+    
+    session = getattr(SDChttpState, 'session', None)
+    if session is None:
+        session = requests.Session()
+        cacheAdapter = SDChttpCacheAdapter()
+        session.mount('http://', cacheAdapter)
+        session.mount('https://', cacheAdapter)
+        SDChttpState.session = session
+        
+    return session
+
+def SDChttpApplication(dataUrl):
+    # This function builds the WSGI application through which the pydap client reaches the OpenDAP 
+    # server of the input dataset: the requests of the client are forwarded to the server by the requests
+    # session of the current thread, answering from the local HTTP cache (see SDChttpSession). The WSGI 
+    # application interface of pydap is used as its remote requests run on sessions built internally.
+    # Error responses of the server are raised as requests HTTPError exceptions.
+    
+    # INPUTS:
+    #     dataUrl: OpenDAP url of the source dataset.
+               
+    # OUTPUTS:
+    #     application: WSGI application callable, to be passed to the pydap client.
+    
+    
+    serverUrl = urlparse(dataUrl).scheme + '://' + urlparse(dataUrl).netloc
+    
+    def application(environ, start_response):
+        url = serverUrl + quote(environ['PATH_INFO']) + ('?' + environ['QUERY_STRING'] if environ.get('QUERY_STRING') else '')
+        response = SDChttpSession().get(url)
+        response.raise_for_status()
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding', 'connection')]
+        start_response(str(response.status_code) + ' ' + (response.reason or ''), headers + [('Content-Length', str(len(response.content)))])
+        return [response.content]
+    
+    return application
+
+def SDChttpCacheEvict():
+    # This function evicts from the HTTP cache the least recently used responses, until the cache size
+    # is below httpCacheMaxSize bytes. Orphan body files (i.e. without metadata file) and staging files
+    # left by interrupted writes (older than one day) are removed too.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDChttpCacheEvict started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    try:
+        # List the cached responses
+        cacheEntries = []
+        for dirPath, dirNames, fileNames in os.walk(httpCacheFolder):
+            for fileName in fileNames:
+                filePath = os.path.join(dirPath, fileName)
+                if (fileName.endswith('.part') and (time.time() - os.path.getmtime(filePath) > 86400)) or (fileName.endswith('.body') and not os.path.isfile(filePath + '.json')):
+                    os.remove(filePath)
+                elif fileName.endswith('.body.json'):
+                    with open(filePath, 'r') as f:
+                        cacheMeta = json.load(f)
+                    cacheEntries.append((cacheMeta['last_access'], cacheMeta['size'], filePath[:-len('.json')], filePath))
+        
+        # Evict the responses from the least recently used one
+        cacheEntries.sort()
+        cacheSize = sum(entry[1] for entry in cacheEntries)
+        for lastAccess, bodySize, bodyFile, metaFile in cacheEntries:
+            if cacheSize <= httpCacheMaxSize:
+                break
+            os.remove(metaFile)
+            if os.path.isfile(bodyFile):
+                os.remove(bodyFile)
+            cacheSize -= bodySize
+    except Exception as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+        Rerr = True
+        
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDChttpCacheEvict successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDChttpCacheEvict exited with an error.')
+        
+    return Rerr
+
+
+#####################################
+# DATABASE ACCESS
+#####################################
+
+def SDCdbConnect():
+    # This function gets a connection to the database from the connection pool of the current process.
+    # The pool (of dbPoolSize connections, with the sqlConfig parameters) is created at the first request 
+    # in each process. Closing the connection returns it to the pool.
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     cnx: pooled connection to the database.
+    
+    
+    global SDCdbPool
+    
+    with SDCdbPoolLock:
+        if (SDCdbPool is None) or (SDCdbPool[0] != os.getpid()):
+            SDCdbPool = (os.getpid(), pooling.MySQLConnectionPool(pool_name='SDCpool' + str(os.getpid()), pool_size=dbPoolSize, **sqlConfig))
+            
+    return SDCdbPool[1].get_connection()
+
+def SDCdbQuery(query, params=()):
+    # This function executes the input parameterized select query on a pooled connection and returns
+    # the fetched rows.
+    
+    # INPUTS:
+    #     query: select query, with %s placeholders for the parameters.
+    #     params: tuple of the query parameters.
+               
+    # OUTPUTS:
+    #     rows: list of row dictionaries <columnName>:<value>.
+    
+    
+    cnx = SDCdbConnect()
+    try:
+        cursor = cnx.cursor(dictionary=True)
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        cnx.close()
+        
+    return rows
+
+def SDCdbUpsert(table, columns, records, keyColumn):
+    # This function inserts the input records into the input table with a single transaction, replacing
+    # the existing rows with the same values of the key column: the rows are deleted with one DELETE
+    # statement and the records are inserted with one bulk INSERT statement, so that the key column
+    # does not need to be a unique key of the table (as filename in the dataset tables, or cdi_identifier
+    # in the CDI configuration tables, which can have several rows per dataset). The transaction is
+    # rolled back on errors.
+    
+    # INPUTS:
+    #     table: name of the table.
+    #     columns: list of the column names.
+    #     records: list of tuples containing the values of the columns for each record.
+    #     keyColumn: name of the column identifying the rows to be replaced (one of columns).
+               
+    # OUTPUTS:
+    
+    
+    keyValues = list(dict.fromkeys(record[columns.index(keyColumn)] for record in records))
+    deleteQuery = 'DELETE FROM ' + table + ' WHERE ' + keyColumn + ' IN (' + ', '.join(['%s'] * len(keyValues)) + ')'
+    insertQuery = 'INSERT INTO ' + table + ' (' + ', '.join(columns) + ') VALUES (' + ', '.join(['%s'] * len(columns)) + ')'
+    
+    with SDCspan('db', table=table, records=len(records)):
+        cnx = SDCdbConnect()
+        try:
+            cursor = cnx.cursor()
+            cursor.execute(deleteQuery, tuple(keyValues))
+            cursor.executemany(insertQuery, records)
+            cnx.commit()
+            cursor.close()
+        except:
+            cnx.rollback()
+            raise
+        finally:
+            cnx.close()
+        
+    return
+
+def SDCdbExecute(table, statements):
+    # This function executes the input parameterized statements on the input table with a single
+    # transaction, each statement once for each of its parameter tuples (executemany). The transaction
+    # is rolled back on errors.
+    
+    # INPUTS:
+    #     table: name of the table.
+    #     statements: list of tuples (statement with %s placeholders, list of tuples of the statement parameters).
+               
+    # OUTPUTS:
+    
+    
+    with SDCspan('db', table=table, records=sum(len(records) for query, records in statements)):
+        cnx = SDCdbConnect()
+        try:
+            cursor = cnx.cursor()
+            for query, records in statements:
+                cursor.executemany(query, records)
+            cnx.commit()
+            cursor.close()
+        except:
+            cnx.rollback()
+            raise
+        finally:
+            cnx.close()
+        
+    return
+
+def SDCmetadataLoad(snapshotFile='', fromSnapshot=False):
+    # This function loads the records of the SDC-enabled networks and stations, either from the database
+    # with a single joined query on network_tb and station_tb or from the snapshot file written by a 
+    # previous run (for starting without the database). The records loaded from the database are saved
+    # to the snapshot file, if set.
+    
+    # INPUTS:
+    #     snapshotFile: path of the JSON snapshot file of the records ('' for no snapshot).
+    #     fromSnapshot: flag for loading the records from the snapshot file instead of the database.
+               
+    # OUTPUTS:
+    #     networks: dictionary containing key-values pairs <network_id>:<SDCnetworkRecord>.
+    #     stations: list of the SDCstationRecord of the stations, sorted by network and station.
+    
+    
+    stationFields = [f.name for f in fields(SDCstationRecord)]
+    
+    if fromSnapshot:
+        with open(snapshotFile, 'r') as f:
+            snapshot = json.load(f)
+        networks = {netRecord['network_id']: SDCnetworkRecord(**netRecord) for netRecord in snapshot['networks']}
+        stations = [SDCstationRecord(**staRecord) for staRecord in snapshot['stations']]
+        
+        return networks, stations
+    
+    # Fetch networks and stations with a single query (networks with no SDC-enabled stations are kept for totals)
+    metadataQuery = ('SELECT n.*, ' + ', '.join(['s.' + f + ' AS sta__' + f for f in stationFields]) + ' FROM network_tb n '
+                     'LEFT JOIN station_tb s ON s.network_id=n.network_id AND s.SDC_distribution_flag=1 '
+                     'WHERE n.SDC_distribution_flag=1 ORDER BY n.network_id, s.station_id')
+    networks = {}
+    stations = []
+    with SDCspan('db', table='network_tb') as span:
+        metadataRows = SDCdbQuery(metadataQuery)
+        span['records'] = len(metadataRows)
+    for row in metadataRows:
+        if row['network_id'] not in networks:
+            networks[row['network_id']] = SDCnetworkRecord(row['network_id'], row.get('SDC_output_profile') or '', int(row.get('EDMO_code') or 0), 
+                                                           row.get('SDC_OpenDAP_data_url') or '', row.get('SDC_folder_path') or '', 
+                                                           float(row.get('temporal_resolution') or 60))
+        if row['sta__station_id'] is not None:
+            staRecord = {f: row['sta__' + f] for f in stationFields}
+            staRecord['EDMO_code'] = int(staRecord['EDMO_code'])
+            staRecord['temporal_resolution'] = float(staRecord['temporal_resolution'])
+            stations.append(SDCstationRecord(**staRecord))
+            
+    # Save the snapshot
+    if snapshotFile != '':
+        os.makedirs(os.path.dirname(snapshotFile) or '.', exist_ok=True)
+        with open(SDCstagePath(snapshotFile), 'w') as f:
+            json.dump({'networks': [asdict(r) for r in networks.values()], 'stations': [asdict(r) for r in stations]}, f, indent=1)
+        os.replace(SDCstagePath(snapshotFile), snapshotFile)
+    
+    return networks, stations
+
+
+#####################################
+# RUN JOURNAL
+#####################################
+
+def SDCjournalConnect():
+    # This function opens a connection to the run journal, the SQLite database file journalFile recording
+    # the state of each processing unit (network, station and time extent of a dataset; station_id is
+    # 'Total' for the totals of a network). The journal table is created at the first connection. The
+    # journal is written by the workers too, so that the state of the units survives a crash of the run.
+    
+    # INPUTS:
+    
+    # OUTPUTS:
+    #     cnx: connection to the journal.
+    
+    
+    os.makedirs(os.path.dirname(journalFile) or '.', exist_ok=True)
+    cnx = sqlite3.connect(journalFile, timeout=60)
+    cnx.execute('PRAGMA journal_mode=WAL')
+    cnx.execute('CREATE TABLE IF NOT EXISTS SDCjournal_tb (network_id TEXT NOT NULL, station_id TEXT NOT NULL, time_extent TEXT NOT NULL, '
+                'status TEXT NOT NULL, output_path TEXT, checksum TEXT, updated TEXT, PRIMARY KEY (network_id, station_id, time_extent))')
+    
+    return cnx
+
+def SDCjournalKey(job):
+    # This function builds the journal key of the input aggregation job.
+    
+    # INPUTS:
+    #     job: dictionary containing the aggregation job.
+       
+    # OUTPUTS:
+    #     unitKey: tuple (network_id, station_id, time_extent) of the unit.
+    
+    
+    return (job['unitIDs']['network_id'], job['unitIDs'].get('station_id', 'Total'), job['timeExtent'])
+
+def SDCjournalUpdate(unitKeys, status, outputPath=None, checksum=None):
+    # This function sets the status ('pending', 'running', 'done' or 'failed') of the input units in
+    # the run journal (single transaction). The output path and the checksum of the units are updated
+    # only if given. Nothing is recorded if journalFile is not set.
+    
+    # INPUTS:
+    #     unitKeys: list of the tuples (network_id, station_id, time_extent) of the units.
+    #     status: status of the units.
+    #     outputPath: path of the output file of the units (None for keeping the recorded one).
+    #     checksum: SHA-256 checksum of the output file of the units (None for keeping the recorded one).
+       
+    # OUTPUTS:
+    
+    
+    if (journalFile == '') or (not unitKeys):
+        return
+    
+    updated = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    cnx = SDCjournalConnect()
+    try:
+        with cnx:
+            cnx.executemany('INSERT INTO SDCjournal_tb VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (network_id, station_id, time_extent) DO UPDATE SET '
+                            'status = excluded.status, output_path = COALESCE(excluded.output_path, output_path), '
+                            'checksum = COALESCE(excluded.checksum, checksum), updated = excluded.updated', 
+                            [unitKey + (status, outputPath, checksum, updated) for unitKey in unitKeys])
+    finally:
+        cnx.close()
+    
+    return
+
+def SDCjournalResume(unitKeys):
+    # This function checks the state of the input units recorded in the run journal, for resuming an
+    # interrupted run. A unit is completed if it is recorded as done and its output file (if any) still
+    # exists with the recorded checksum. The half-written (staged) output files of the other units are
+    # removed and the fingerprints of their output files are discarded, so that they are rebuilt and
+    # their database records and CDIs are written.
+    
+    # INPUTS:
+    #     unitKeys: list of the tuples (network_id, station_id, time_extent) of the units.
+       
+    # OUTPUTS:
+    #     doneKeys: set of the tuples (network_id, station_id, time_extent) of the completed units.
+    
+    
+    cnx = SDCjournalConnect()
+    try:
+        unitStates = {row[:3]: row[3:] for row in cnx.execute('SELECT network_id, station_id, time_extent, status, output_path, checksum FROM SDCjournal_tb')}
+    finally:
+        cnx.close()
+    
+    doneKeys = set()
+    for unitKey in unitKeys:
+        status, outputPath, checksum = unitStates.get(unitKey, ('pending', None, None))
+        if (status == 'done') and ((outputPath is None) or (os.path.isfile(outputPath) and (checksum is None or SDCfileChecksum(outputPath) == checksum))):
+            doneKeys.add(unitKey)
+        elif outputPath is not None:
+            if os.path.isfile(SDCstagePath(outputPath)):
+                os.remove(SDCstagePath(outputPath))
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + '-'.join(unitKey) + ': half-written file ' + SDCstagePath(outputPath) + ' discarded.')
+            SDCfingerprintDiscard([outputPath])
+    
+    return doneKeys
+
+def SDCjournalStart(workUnits, unitHosts, unitKeys):
+    # This function records the input work units as pending in the run journal. If resumeRun is set,
+    # the work units whose journal units are all completed (see SDCjournalResume) are left out of the run.
+    
+    # INPUTS:
+    #     workUnits: list of the argument tuples of the work units.
+    #     unitHosts: list of the THREDDS hosts of the work units.
+    #     unitKeys: list of the lists of the journal keys of the work units (one key for each aggregation interval).
+       
+    # OUTPUTS:
+    #     workUnits: list of the argument tuples of the work units to be processed.
+    #     unitHosts: list of the THREDDS hosts of the work units to be processed.
+    #     unitKeys: list of the lists of the journal keys of the work units to be processed.
+    
+    
+    if journalFile == '':
+        return workUnits, unitHosts, unitKeys
+    
+    if resumeRun:
+        doneKeys = SDCjournalResume([unitKey for keys in unitKeys for unitKey in keys])
+        unitsLeft = [idx for idx, keys in enumerate(unitKeys) if not set(keys) <= doneKeys]
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(len(workUnits) - len(unitsLeft)) + ' of ' + str(len(workUnits)) + 
+              ' work units already completed by the previous runs, ' + str(len(unitsLeft)) + ' to be resumed.')
+        workUnits = [workUnits[idx] for idx in unitsLeft]
+        unitHosts = [unitHosts[idx] for idx in unitsLeft]
+        unitKeys = [unitKeys[idx] for idx in unitsLeft]
+    
+    SDCjournalUpdate([unitKey for keys in unitKeys for unitKey in keys], 'pending')
+    
+    return workUnits, unitHosts, unitKeys
+
+
+#####################################
+# DATASET STATISTICS
+#####################################
+
+def SDCstatsChunk(sdcDS, dataVar):
+    # This function evaluates the coverage statistics of the input SDC-transformed chunk of a dataset
+    # (before the encoding of TIME): number and time range of the TIME records, number of values and
+    # of valid values of the data variable, geographic bounding box of the cells and vertical extent
+    # of the levels with valid values, and distribution of the flags of each QC variable. The statistics
+    # of the chunks of a dataset are merged by SDCstatsMerge.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset containing the SDC-transformed chunk.
+    #     dataVar: name of the data variable (see SDCdataTypes).
+               
+    # OUTPUTS:
+    #     stats: dictionary containing the statistics of the chunk (None for quantities not evaluated on valid values).
+    
+    
+    # Mask of the valid values of the data variable, reduced over TIME and DEPTH for the cells and over the other dimensions for the levels
+    dataValid = sdcDS[dataVar].notnull()
+    validCells = dataValid.any(['TIME', 'DEPTH'])
+    validLevels = dataValid.any([dim for dim in dataValid.dims if dim != 'DEPTH'])
+    numValid = int(dataValid.sum())
+    
+    def validRange(coordVar, validMask):
+        if numValid == 0:
+            return None, None
+        validValues = coordVar.where(validMask)
+        return float(validValues.min()), float(validValues.max())
+    
+    stats = {'numRecords': sdcDS.sizes['TIME'], 
+             'timeMin': str(np.datetime_as_string(sdcDS.TIME.values.min(), unit='s')), 
+             'timeMax': str(np.datetime_as_string(sdcDS.TIME.values.max(), unit='s')), 
+             'numValues': dataValid.size, 'numValid': numValid}
+    stats['latMin'], stats['latMax'] = validRange(sdcDS.LATITUDE, validCells)
+    stats['lonMin'], stats['lonMax'] = validRange(sdcDS.LONGITUDE, validCells)
+    stats['depthMin'], stats['depthMax'] = validRange(sdcDS.DEPTH, validLevels)
+    
+    # Count the flags of the QC variables (flags are stored as character codes)
+    stats['qcFlags'] = {}
+    for varName, sdcVar in sdcDS.data_vars.items():
+        if 'flag_values' in sdcVar.attrs:
+            flagCounts = np.bincount(sdcVar.values.ravel().astype(np.uint8, copy=False), minlength=256)
+            stats['qcFlags'][varName] = {chr(flag): int(flagCounts[flag]) for flag in np.flatnonzero(flagCounts)}
+    
+    return stats
+
+def SDCstatsMerge(stats, chunkStats):
+    # This function merges the statistics of a chunk into the running statistics of a dataset.
+    
+    # INPUTS:
+    #     stats: dictionary containing the running statistics of the dataset (None for the first chunk).
+    #     chunkStats: dictionary containing the statistics of the chunk (see SDCstatsChunk).
+               
+    # OUTPUTS:
+    #     stats: dictionary containing the merged statistics.
+    
+    
+    if stats is None:
+        return chunkStats
+    
+    # Ranges (None for chunks without valid values), counts and flag distributions
+    for key, reduceFunc in [('timeMin', min), ('latMin', min), ('lonMin', min), ('depthMin', min), 
+                            ('timeMax', max), ('latMax', max), ('lonMax', max), ('depthMax', max)]:
+        rangeValues = [v for v in [stats[key], chunkStats[key]] if v is not None]
+        stats[key] = reduceFunc(rangeValues) if rangeValues else None
+    for key in ['numRecords', 'numValues', 'numValid']:
+        stats[key] += chunkStats[key]
+    for varName, flagCounts in chunkStats['qcFlags'].items():
+        varCounts = stats['qcFlags'].setdefault(varName, {})
+        for flag, count in flagCounts.items():
+            varCounts[flag] = varCounts.get(flag, 0) + count
+            
+    return stats
+
+def SDCstatsSummary(stats):
+    # This function formats the number of records, the fraction of valid values and the distribution
+    # of the overall QC flags (QCflag) of the input coverage statistics for the log.
+    
+    # INPUTS:
+    #     stats: dictionary containing the coverage statistics of a dataset (see SDCstatsChunk).
+               
+    # OUTPUTS:
+    #     summary: string summarizing the statistics.
+    
+    
+    validFraction = stats['numValid'] / stats['numValues'] if stats['numValues'] else 0
+    flagCounts = stats['qcFlags'].get('QCflag', {})
+    summary = (str(stats['numRecords']) + ' records, ' + '{:.1f}'.format(100 * validFraction) + '% valid values, QCflag ' + 
+               ' '.join(flag + ':' + str(flagCounts[flag]) for flag in sorted(flagCounts)))
+    
+    return summary
+
+
+#####################################
+# METADATA MANAGEMENT
+#####################################
+
+def SDCcdiConfFields(confFile):
+    # This function parses the input Mikado configuration file and retrieves the table and the
+    # columns queried for each CDI variable, split into single-valued and multi-valued (multiFixed)
+    # variables. Parsed configurations are cached.
+    
+    # INPUTS:
+    #     confFile: path of the Mikado xml configuration file.
+               
+    # OUTPUTS:
+    #     confFields: dictionary containing the CDI table (table) and the lists of tuples (variable, column)
+    #                 of the single-valued (single) and multi-valued (multi) variables.
+    
+    
+    if confFile in SDCcdiConfCache:
+        return SDCcdiConfCache[confFile]
+    
+    confRoot = ET.parse(confFile).getroot()
+    confFields = {'table': confRoot.find('./queries/main/query/from').text, 'single': [], 'multi': []}
+    for queryType, fieldType in [('single', 'single'), ('multiFixed', 'multi')]:
+        for query in confRoot.findall('./queries/' + queryType + '/query'):
+            for col in query.findall('./select/col'):
+                if col.findtext('sql'):
+                    confFields[fieldType].append((col.findtext('var'), col.findtext('sql')))
+    SDCcdiConfCache[confFile] = confFields
+    
+    return confFields
+
+def SDCcdiFetchBatch(cdiTable, cdiColumns, cdiIDs):
+    # This function fetches all the CDI columns of a batch of datasets from the input CDI configuration
+    # table with a single parameterized query. Datasets with more than one row (multi-valued fields)
+    # get all their rows.
+    
+    # INPUTS:
+    #     cdiTable: name of the CDI configuration table (radial_CDIconf_tb or total_CDIconf_tb).
+    #     cdiColumns: list of the columns to be fetched.
+    #     cdiIDs: list of the cdi_identifier of the datasets.
+               
+    # OUTPUTS:
+    #     cdiRecords: dictionary containing key-values pairs <cdi_identifier>:<list of row dictionaries>.
+    
+    
+    # Column and table names come from the Mikado configuration files and are checked as identifiers
+    for name in [cdiTable] + cdiColumns:
+        if not name.isidentifier():
+            raise ValueError('invalid column or table name ' + name)
+    
+    cdiQuery = ('SELECT ' + ', '.join(['cdi_identifier'] + [c for c in cdiColumns if c != 'cdi_identifier']) + ' FROM ' + cdiTable + 
+                ' WHERE cdi_identifier IN (' + ', '.join(['%s'] * len(cdiIDs)) + ')')
+    cdiRecords = {cdiID: [] for cdiID in cdiIDs}
+    for row in SDCdbQuery(cdiQuery, tuple(cdiIDs)):
+        cdiRecords[row['cdi_identifier']].append(row)
+        
+    return cdiRecords
+
+def SDCcdiMetadataRecord(cdiID, platformCode, datasetName, datasetSize, stats, temporalResolution):
+    # This function builds the record of the CDI configuration table of the input dataset from its
+    # coverage statistics: geographic bounding box, vertical extent and time coverage (extended by half
+    # the temporal resolution, as the time coverage attributes of the dataset) and size of the file.
+    
+    # INPUTS:
+    #     cdiID: SDN local CDI id of the dataset.
+    #     platformCode: platform code (EDIOS_Series_ID-EDIOS_Platform_ID).
+    #     datasetName: filename of the dataset.
+    #     datasetSize: size of the file (kB).
+    #     stats: dictionary containing the coverage statistics of the dataset (see SDCstatsChunk).
+    #     temporalResolution: temporal resolution of the dataset (minutes).
+               
+    # OUTPUTS:
+    #     cdiRecord: dictionary containing key-values pairs <columnName>:<value>.
+    
+    
+    dtStart = datetime.datetime.fromisoformat(stats['timeMin']) - relativedelta(minutes=temporalResolution/2)
+    dtEnd = datetime.datetime.fromisoformat(stats['timeMax']) + relativedelta(minutes=temporalResolution/2)
+    
+    cdiRecord = {'cdi_identifier': cdiID, 'platform_code': platformCode, 'filename': datasetName, 
+                 'geospatial_lat_min': stats['latMin'], 'geospatial_lat_max': stats['latMax'], 
+                 'geospatial_lon_min': stats['lonMin'], 'geospatial_lon_max': stats['lonMax'], 
+                 'geospatial_vertical_min': stats['depthMin'], 'geospatial_vertical_max': stats['depthMax'], 
+                 'time_coverage_start': dtStart.replace(microsecond=0).isoformat('T','seconds') + 'Z', 
+                 'time_coverage_end': dtEnd.replace(microsecond=0).isoformat('T','seconds') + 'Z', 
+                 'data_size': round(datasetSize / 1024, 3)}
+    
+    return cdiRecord
+
+def SDCcdiMetadata2db(cdiTable, cdiRecords):
+    # This function writes the records built by SDCcdiMetadataRecord to the input CDI configuration
+    # table with a single transaction. The rows of datasets already in the table are updated in place
+    # (only the record columns are set, the other columns are kept). The rows of new datasets are copied
+    # from the rows of the last dataset of the same platform, taking from them the other columns listed
+    # in the Mikado configuration files (e.g. EDMO codes, summary); new datasets of platforms without
+    # datasets get a single row with the record columns only.
+    
+    # INPUTS:
+    #     cdiTable: name of the CDI configuration table (radial_CDIconf_tb or total_CDIconf_tb).
+    #     cdiRecords: list of tuples (record dictionary, Mikado configuration file path).
+               
+    # OUTPUTS:
+    
+    
+    if not cdiRecords:
+        return
+    
+    # Collect the columns of the records and the other columns of all configurations
+    recordColumns = list(cdiRecords[0][0])
+    copyColumns = []
+    for cdiRecord, confFile in cdiRecords:
+        confFields = SDCcdiConfFields(confFile)
+        for col in [c for v,c in confFields['single'] + confFields['multi']]:
+            if (col not in recordColumns) and (col not in copyColumns):
+                copyColumns.append(col)
+    
+    # Column and table names come from the Mikado configuration files and are checked as identifiers
+    for name in [cdiTable] + recordColumns + copyColumns:
+        if not name.isidentifier():
+            raise ValueError('invalid column or table name ' + name)
+    
+    # Find the datasets already in the table and the last dataset of the platforms of the new datasets
+    cdiIDs = [cdiRecord['cdi_identifier'] for cdiRecord, confFile in cdiRecords]
+    knownIDs = {row['cdi_identifier'] for row in SDCdbQuery('SELECT DISTINCT cdi_identifier FROM ' + cdiTable + ' WHERE cdi_identifier IN (' + 
+                                                            ', '.join(['%s'] * len(cdiIDs)) + ')', tuple(cdiIDs))}
+    newPlatforms = list({cdiRecord['platform_code'] for cdiRecord, confFile in cdiRecords if cdiRecord['cdi_identifier'] not in knownIDs})
+    templateIDs = {}
+    if newPlatforms:
+        lastIDs = SDCdbQuery('SELECT platform_code, MAX(cdi_identifier) AS cdi_identifier FROM ' + cdiTable + ' WHERE platform_code IN (' + 
+                             ', '.join(['%s'] * len(newPlatforms)) + ') GROUP BY platform_code', tuple(newPlatforms))
+        templateIDs = {row['platform_code']: row['cdi_identifier'] for row in lastIDs}
+    
+    # Split the records into updates of existing rows, copies of the rows of the last dataset and new rows
+    updateColumns = [col for col in recordColumns if col != 'cdi_identifier']
+    updateRecords, copyRecords, insertRecords = [], [], []
+    for cdiRecord, confFile in cdiRecords:
+        if cdiRecord['cdi_identifier'] in knownIDs:
+            updateRecords.append(tuple(cdiRecord[col] for col in updateColumns) + (cdiRecord['cdi_identifier'],))
+        elif cdiRecord['platform_code'] in templateIDs:
+            copyRecords.append(tuple(cdiRecord[col] for col in recordColumns) + (templateIDs[cdiRecord['platform_code']],))
+        else:
+            insertRecords.append(tuple(cdiRecord[col] for col in recordColumns))
+    
+    updateQuery = 'UPDATE ' + cdiTable + ' SET ' + ', '.join(col + '=%s' for col in updateColumns) + ' WHERE cdi_identifier=%s'
+    copyQuery = ('INSERT INTO ' + cdiTable + ' (' + ', '.join(recordColumns + copyColumns) + ') SELECT ' + ', '.join(['%s'] * len(recordColumns) + copyColumns) + 
+                 ' FROM ' + cdiTable + ' WHERE cdi_identifier=%s')
+    insertQuery = 'INSERT INTO ' + cdiTable + ' (' + ', '.join(recordColumns) + ') VALUES (' + ', '.join(['%s'] * len(recordColumns)) + ')'
+    SDCdbExecute(cdiTable, [(query, records) for query, records in [(updateQuery, updateRecords), (copyQuery, copyRecords), (insertQuery, insertRecords)] if records])
+    
+    return
+
+def SDCcdiText(value):
+    # This function converts a value fetched from the database into the text of an xml element.
+    
+    # INPUTS:
+    #     value: value fetched from the database.
+               
+    # OUTPUTS:
+    #     text: string representation of the value ('' for missing values).
+    
+    
+    if value is None:
+        return ''
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    
+    return str(value)
+
+def SDCcdiRender(cdiRows):
+    # This function renders the CDI of a dataset in the ISO 19139 SeaDataNet profile (cdi19139) from
+    # the rows of the CDI configuration table fetched for the dataset. Single-valued fields are read
+    # from the first row, multi-valued fields (EDMO codes of the institutions, parameters, instruments)
+    # are collected from all rows.
+    
+    # INPUTS:
+    #     cdiRows: list of row dictionaries fetched by SDCcdiFetchBatch for the dataset.
+               
+    # OUTPUTS:
+    #     cdiXml: xml string of the CDI.
+    
+    
+    field = lambda col: SDCcdiText(cdiRows[0].get(col))
+    def multiField(col):
+        values = []
+        for row in cdiRows:
+            for value in SDCcdiText(row.get(col)).split(','):
+                if value.strip() and (value.strip() not in values):
+                    values.append(value.strip())
+        return values
+    
+    # Build xml elements in the gmd, gco, gml and sdn namespaces
+    def element(parent, tag, text=None, **attrib):
+        prefix, name = tag.split(':')
+        xmlElement = ET.SubElement(parent, '{' + SDCcdiNamespaces[prefix] + '}' + name, 
+                                   {('{' + SDCcdiNamespaces[k.split('_')[0]] + '}' + k.split('_')[1]) if '_' in k else k: v for k,v in attrib.items()})
+        if text is not None:
+            xmlElement.text = text
+        return xmlElement
+    def characterString(parent, tag, text):
+        element(element(parent, tag), 'gco:CharacterString', text)
+    def codeListValue(parent, tag, codeList, value):
+        element(parent, tag, value, codeList=SDCcdiCodeLists[codeList] + '#' + tag.split(':')[1], codeListValue=value)
+    def responsibleParty(parent, tag, edmoCode, role):
+        party = element(element(parent, tag), 'gmd:CI_ResponsibleParty')
+        codeListValue(element(party, 'gmd:organisationName'), 'sdn:SDN_EDMOCode', 'sdn', edmoCode)
+        codeListValue(element(party, 'gmd:role'), 'gmd:CI_RoleCode', 'gmx', role)
+    def keywords(parent, tag, values, keywordType, thesaurus):
+        mdKeywords = element(element(parent, 'gmd:descriptiveKeywords'), 'gmd:MD_Keywords')
+        for value in values:
+            codeListValue(element(mdKeywords, 'gmd:keyword'), tag, 'sdn', value)
+        codeListValue(element(mdKeywords, 'gmd:type'), 'gmd:MD_KeywordTypeCode', 'gmx', keywordType)
+        characterString(element(element(mdKeywords, 'gmd:thesaurusName'), 'gmd:CI_Citation'), 'gmd:title', thesaurus)
+    def decimal(parent, tag, value):
+        element(element(parent, tag), 'gco:Decimal', value)
+    
+    # Metadata
+    cdiRoot = ET.Element('{' + SDCcdiNamespaces['gmd'] + '}MD_Metadata')
+    characterString(cdiRoot, 'gmd:fileIdentifier', 'urn:SDN:CDI:LOCAL:' + field('partner_edmo_code') + ':' + field('cdi_identifier'))
+    codeListValue(element(cdiRoot, 'gmd:language'), 'gmd:LanguageCode', 'gmx', 'eng')
+    codeListValue(element(cdiRoot, 'gmd:characterSet'), 'gmd:MD_CharacterSetCode', 'gmx', 'utf8')
+    codeListValue(element(cdiRoot, 'gmd:hierarchyLevel'), 'gmd:MD_ScopeCode', 'gmx', 'dataset')
+    responsibleParty(cdiRoot, 'gmd:contact', field('partner_edmo_code'), 'pointOfContact')
+    element(element(cdiRoot, 'gmd:dateStamp'), 'gco:DateTime', field('date_modified'))
+    characterString(cdiRoot, 'gmd:metadataStandardName', 'ISO 19115/SeaDataNet profile')
+    characterString(cdiRoot, 'gmd:metadataStandardVersion', '1.0')
+    refSystem = element(element(element(cdiRoot, 'gmd:referenceSystemInfo'), 'gmd:MD_ReferenceSystem'), 'gmd:referenceSystemIdentifier')
+    characterString(element(refSystem, 'gmd:RS_Identifier'), 'gmd:code', field('reference_system'))
+    
+    # Identification
+    dataID = element(element(cdiRoot, 'gmd:identificationInfo'), 'sdn:SDN_DataIdentification', gco_isoType='MD_DataIdentification_Type')
+    citation = element(element(dataID, 'gmd:citation'), 'gmd:CI_Citation')
+    characterString(citation, 'gmd:title', field('filename'))
+    characterString(citation, 'gmd:alternateTitle', field('cdi_identifier'))
+    citationDate = element(element(citation, 'gmd:date'), 'gmd:CI_Date')
+    element(element(citationDate, 'gmd:date'), 'gco:DateTime', field('date_modified'))
+    codeListValue(element(citationDate, 'gmd:dateType'), 'gmd:CI_DateTypeCode', 'gmx', 'revision')
+    characterString(dataID, 'gmd:abstract', field('summary'))
+    for edmoCode in multiField('institution_edmo_code'):
+        responsibleParty(dataID, 'gmd:pointOfContact', edmoCode, 'originator')
+    keywords(dataID, 'sdn:SDN_ParameterDiscoveryCode', multiField('parameters'), 'parameter', 'SeaDataNet Parameter Discovery Vocabulary')
+    keywords(dataID, 'sdn:SDN_DeviceCategoryCode', multiField('instrument'), 'instrument', 'SeaDataNet device categories')
+    keywords(dataID, 'sdn:SDN_PlatformCategoryCode', [field('source')], 'platform_class', 'SeaDataNet Platform Classes')
+    keywords(dataID, 'sdn:SDN_PlatformCode', [field('platform_code')], 'platform', 'European HFR Node platforms')
+    keywords(dataID, 'sdn:SDN_SiteCode', [field('site_code')], 'place', 'European HFR Node sites')
+    constraints = element(element(dataID, 'gmd:resourceConstraints'), 'gmd:MD_LegalConstraints')
+    codeListValue(element(constraints, 'gmd:accessConstraints'), 'gmd:MD_RestrictionCode', 'gmx', 'otherRestrictions')
+    codeListValue(element(constraints, 'gmd:otherConstraints'), 'sdn:SDN_DataAccessRestrictionCode', 'sdn', field('dataset_access_restriction'))
+    codeListValue(element(dataID, 'gmd:language'), 'gmd:LanguageCode', 'gmx', 'eng')
+    element(element(dataID, 'gmd:topicCategory'), 'gmd:MD_TopicCategoryCode', 'oceans')
+    
+    # Extent
+    extent = element(element(dataID, 'gmd:extent'), 'gmd:EX_Extent')
+    characterString(extent, 'gmd:description', field('feature_type'))
+    bbox = element(element(extent, 'gmd:geographicElement'), 'gmd:EX_GeographicBoundingBox')
+    decimal(bbox, 'gmd:westBoundLongitude', field('geospatial_lon_min'))
+    decimal(bbox, 'gmd:eastBoundLongitude', field('geospatial_lon_max'))
+    decimal(bbox, 'gmd:southBoundLatitude', field('geospatial_lat_min'))
+    decimal(bbox, 'gmd:northBoundLatitude', field('geospatial_lat_max'))
+    timePeriod = element(element(element(element(extent, 'gmd:temporalElement'), 'gmd:EX_TemporalExtent'), 'gmd:extent'), 'gml:TimePeriod', gml_id='TimePeriod_1')
+    element(timePeriod, 'gml:beginPosition', field('time_coverage_start'))
+    element(timePeriod, 'gml:endPosition', field('time_coverage_end'))
+    element(timePeriod, 'gml:timeInterval', field('time_coverage_resolution'), unit=field('time_coverage_resolution_units'))
+    vertical = element(element(extent, 'gmd:verticalElement'), 'gmd:EX_VerticalExtent')
+    element(element(vertical, 'gmd:minimumValue'), 'gco:Real', field('geospatial_vertical_min'))
+    element(element(vertical, 'gmd:maximumValue'), 'gco:Real', field('geospatial_vertical_max'))
+    element(vertical, 'gmd:verticalCRS', xlink_title=field('vertical_datum'))
+    if field('geospatial_vertical_resolution'):
+        resolution = element(element(element(dataID, 'gmd:spatialResolution'), 'gmd:MD_Resolution'), 'gmd:distance')
+        element(resolution, 'gco:Distance', field('geospatial_vertical_resolution'), uom=field('geospatial_vertical_units'))
+    if field('grid_resolution'):
+        resolution = element(element(element(dataID, 'gmd:spatialResolution'), 'gmd:MD_Resolution'), 'gmd:distance')
+        element(resolution, 'gco:Distance', field('grid_resolution'), uom=field('grid_resolution_units'))
+    
+    # Distribution
+    distribution = element(element(cdiRoot, 'gmd:distributionInfo'), 'gmd:MD_Distribution')
+    dataFormat = element(element(distribution, 'gmd:distributionFormat'), 'gmd:MD_Format')
+    codeListValue(element(dataFormat, 'gmd:name'), 'sdn:SDN_FormatNameCode', 'sdn', 'Climate and Forecast (CF) netCDF')
+    characterString(dataFormat, 'gmd:version', field('netcdf_version'))
+    characterString(dataFormat, 'gmd:specification', field('dataformat_version'))
+    responsibleParty(element(element(distribution, 'gmd:distributor'), 'gmd:MD_Distributor'), 'gmd:distributorContact', field('distributor_edmo_code'), 'distributor')
+    transfer = element(element(distribution, 'gmd:transferOptions'), 'gmd:MD_DigitalTransferOptions')
+    element(element(transfer, 'gmd:transferSize'), 'gco:Real', field('data_size'))
+    onlineResource = element(element(transfer, 'gmd:onLine'), 'gmd:CI_OnlineResource')
+    element(element(onlineResource, 'gmd:linkage'), 'gmd:URL', field('distribution_website'))
+    characterString(onlineResource, 'gmd:protocol', field('distribution_protocol'))
+    characterString(onlineResource, 'gmd:description', 'Operational since ' + (field('operational_from') or field('operational_from_network')))
+    
+    return ET.tostring(cdiRoot, encoding='unicode', xml_declaration=True)
+
+def SDCcdiBatch(cdiUnits):
+    # This function generates the CDIs of the input datasets: the CDI fields of each batch of datasets
+    # (up to cdiBatchSize datasets) are fetched with one query per CDI configuration table, according
+    # to the columns listed in the Mikado configuration files, and the cdi19139 xml files are rendered
+    # and written to the cdiFolder folder.
+    
+    # INPUTS:
+    #     cdiUnits: list of tuples (cdi_identifier, Mikado configuration file path).
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     cdiFiles: dictionary containing key-values pairs <cdi_identifier>:<path of the CDI xml file>.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcdiBatch started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Initialize outputs
+    cdiFiles = {}
+    
+    try:
+        # Group the datasets by CDI configuration table, collecting the columns of all configurations
+        tableUnits = {}
+        for cdiID, confFile in cdiUnits:
+            confFields = SDCcdiConfFields(confFile)
+            tableColumns, tableIDs = tableUnits.setdefault(confFields['table'], ([], []))
+            for var, col in confFields['single'] + confFields['multi']:
+                if col not in tableColumns:
+                    tableColumns.append(col)
+            tableIDs.append(cdiID)
+        
+        # Fetch and render the CDIs batch by batch
+        os.makedirs(cdiFolder, exist_ok=True)
+        for cdiTable, (tableColumns, tableIDs) in tableUnits.items():
+            for bIDX in range(0, len(tableIDs), cdiBatchSize):
+                with SDCspan('db', table=cdiTable, records=len(tableIDs[bIDX:bIDX + cdiBatchSize])):
+                    cdiRecords = SDCcdiFetchBatch(cdiTable, tableColumns, tableIDs[bIDX:bIDX + cdiBatchSize])
+                with SDCspan('cdi', records=len(cdiRecords)):
+                    for cdiID, cdiRows in cdiRecords.items():
+                        if not cdiRows:
+                            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: no CDI information found in ' + cdiTable + ' for ' + cdiID + '.')
+                            Rerr = True
+                            continue
+                        cdiFile = os.path.join(cdiFolder, cdiID + '.xml')
+                        with open(SDCstagePath(cdiFile), 'w', encoding='utf-8') as f:
+                            f.write(SDCcdiRender(cdiRows))
+                        os.replace(SDCstagePath(cdiFile), cdiFile)
+                        cdiFiles[cdiID] = cdiFile
+    except Exception as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+        Rerr = True
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcdiBatch successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcdiBatch exited with an error.')
+        
+    return Rerr, cdiFiles
+
+def SDCmikadoConf(confFile, cdiIDs):
+    # This function builds the Mikado configuration of a batch of datasets from the input Mikado 
+    # configuration file: the main query selects the datasets of the batch by cdi_identifier and the 
+    # platform conditions of the CDI field queries are dropped, as each CDI row is identified by its
+    # cdi_identifier. Configuration files of different platforms querying the same columns thus give 
+    # the same batch configuration.
+    
+    # INPUTS:
+    #     confFile: path of the Mikado xml configuration file.
+    #     cdiIDs: list of the cdi_identifier of the datasets of the batch.
+               
+    # OUTPUTS:
+    #     batchConf: root element of the Mikado configuration of the batch.
+    
+    
+    for cdiID in cdiIDs:
+        if "'" in cdiID:
+            raise ValueError('invalid cdi_identifier ' + cdiID)
+    
+    batchConf = ET.parse(confFile).getroot()
+    for where in batchConf.iter('where'):
+        if where.text:
+            where.text = re.sub(r"platform_code\s*=\s*'[^']*'(\s+AND\s+)?", '', where.text).strip()
+    batchConf.find('./queries/main/query/where').text = 'cdi_identifier IN (' + ', '.join("'" + cdiID + "'" for cdiID in cdiIDs) + ')'
+    
+    return batchConf
+
+def SDCmikadoRun(batchConf, cdiIDs):
+    # This function generates the CDIs of a batch of datasets with a single Mikado invocation. The batch
+    # configuration is written to a private staging folder within cdiFolder (readable by the owner only,
+    # as it holds the database credentials), Mikado is run according to mikadoCommand and the generated
+    # cdi19139 xml files are moved to cdiFolder. The staging folder is removed at the end.
+    
+    # INPUTS:
+    #     batchConf: root element of the Mikado configuration of the batch (see SDCmikadoConf).
+    #     cdiIDs: list of the cdi_identifier of the datasets of the batch.
+               
+    # OUTPUTS:
+    #     cdiFiles: dictionary containing key-values pairs <cdi_identifier>:<path of the CDI xml file>
+    #               for the generated CDIs.
+    #     spans: list of the timed spans of the invocation.
+    
+    
+    cdiFiles = {}
+    with SDCspanCollect('Mikado') as spans:
+        batchFolder = tempfile.mkdtemp(prefix='.mikado-', dir=cdiFolder)
+        try:
+            # Write the batch configuration
+            confFile = os.path.join(batchFolder, 'mikado.xml')
+            with os.fdopen(os.open(confFile, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'wb') as f:
+                ET.ElementTree(batchConf).write(f, encoding='UTF-8', xml_declaration=True)
+            outFolder = os.path.join(batchFolder, 'CDI')
+            os.mkdir(outFolder)
+            
+            # Run Mikado
+            with SDCspan('cdi', records=len(cdiIDs)):
+                mikadoRun = subprocess.run([arg.format(config=confFile, output=outFolder) for arg in mikadoCommand], 
+                                           capture_output=True, text=True, timeout=mikadoTimeout)
+            if mikadoRun.returncode != 0:
+                mikadoErr = (mikadoRun.stderr.strip().splitlines() or ['no error message'])[-1]
+                raise RuntimeError('Mikado exited with status ' + str(mikadoRun.returncode) + ' (' + mikadoErr + ')')
+            
+            # Move the generated CDIs to the CDI folder
+            for cdiID in cdiIDs:
+                outFile = os.path.join(outFolder, cdiID + '.xml')
+                if os.path.isfile(outFile):
+                    cdiFiles[cdiID] = os.path.join(cdiFolder, cdiID + '.xml')
+                    os.replace(outFile, cdiFiles[cdiID])
+        finally:
+            shutil.rmtree(batchFolder, ignore_errors=True)
+        
+    return cdiFiles, spans
+
+def SDCcdiMikado(cdiUnits):
+    # This function generates the CDIs of the input datasets with the Mikado application, in as few
+    # invocations as possible: the datasets are grouped by batch configuration (configuration files
+    # differing only by platform share the same one, see SDCmikadoConf) and each group is split into
+    # batches of up to cdiBatchSize datasets, each one generated by a single Mikado invocation. Up to 
+    # mikadoWorkers invocations run at the same time.
+    
+    # INPUTS:
+    #     cdiUnits: list of tuples (cdi_identifier, Mikado configuration file path).
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     cdiFiles: dictionary containing key-values pairs <cdi_identifier>:<path of the CDI xml file>.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcdiMikado started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Initialize outputs
+    cdiFiles = {}
+    
+    try:
+        # Group the datasets by batch configuration
+        confUnits = {}
+        for cdiID, confFile in cdiUnits:
+            confKey = ET.tostring(SDCmikadoConf(confFile, []))
+            confUnits.setdefault(confKey, (confFile, []))[1].append(cdiID)
+        
+        # Build the batches
+        batches = []
+        for confFile, confIDs in confUnits.values():
+            for bIDX in range(0, len(confIDs), cdiBatchSize):
+                batches.append((SDCmikadoConf(confFile, confIDs[bIDX:bIDX + cdiBatchSize]), confIDs[bIDX:bIDX + cdiBatchSize]))
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(len(cdiUnits)) + ' CDIs to be generated with ' + 
+              str(len(batches)) + ' Mikado invocations.')
+        
+        # Run the Mikado invocations
+        os.makedirs(cdiFolder, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=max(1, mikadoWorkers)) as executor:
+            futures = {executor.submit(SDCmikadoRun, batchConf, batchIDs): batchIDs for batchConf, batchIDs in batches}
+            for future, batchIDs in futures.items():
+                try:
+                    batchFiles, spans = future.result()
+                except Exception as err:
+                    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: Mikado invocation for ' + str(len(batchIDs)) + ' CDIs failed: ' + str(err) + '.')
+                    Rerr = True
+                    continue
+                SDCspanExtend(spans)
+                cdiFiles.update(batchFiles)
+                for cdiID in batchIDs:
+                    if cdiID not in batchFiles:
+                        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: no CDI generated by Mikado for ' + cdiID + '.')
+                        Rerr = True
+    except Exception as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+        Rerr = True
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcdiMikado successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCcdiMikado exited with an error.')
+        
+    return Rerr, cdiFiles
+
+
+#####################################
+# DATASET AGGREGATION
+#####################################   
+
+def SDCdataTransform(sdcDS, dataType, sensor, inPlace=False, verbose=True):
+    # This function remaps the QC variables and modifies the variable attributes of the input radial
+    # or total dataset according to the SDC schema of its data type. Only the transformations that do
+    # not depend on the aggregated product (i.e. on the dataset ID and on the time coverage) are applied,
+    # in order to allow the transformation of the dataset chunk by chunk.
+    
+    # INPUTS:
+    #     sdcDS: xarray Dataset containing the data read from the THREDDS catalog.
+    #     dataType: data type of the dataset ('radial' or 'total').
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     inPlace: flag for remapping the QC variables in place (to be set only for in-memory datasets).
+    #     verbose: flag for logging the remapping of the QC variables (unset for the chunks of a dataset).
+       
+    # OUTPUTS:
+    #     sdcDS: transformed xarray Dataset.
+    
+
+    # Remap the QC variables and modify the variables according to the SDC schema table
+    Rerr, sdcDS = SDCschemaTransform(sdcDS, SDCdataTypes[dataType]['schema'], sensor, inPlace, verbose)
+    
+    return sdcDS
+
+def SDCwriteChunks(srcDS, dataType, sensor, ncFile, productMeta, profileName, chunkSize, append=False):
+    # This function reads, transforms according to the SDC schema of its data type and writes the input
+    # dataset chunk by chunk (chunkSize TIME records at a time, or in one chunk if chunkSize is 0).
+    # The first chunk creates the netCDF file with unlimited TIME dimension (and with the final
+    # TIME units) and the following chunks are appended along the TIME dimension (all the chunks are
+    # appended to an existing file in append mode). The coverage statistics of the dataset are accumulated
+    # chunk by chunk (see SDCstatsChunk).
+    
+    # INPUTS:
+    #     srcDS: lazily loaded xarray Dataset containing the data to be written.
+    #     dataType: data type of the dataset ('radial' or 'total').
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     ncFile: path of the netCDF file to be written.
+    #     productMeta: dictionary containing the product metadata (see SDCproductTransform), None if the
+    #                  product metadata are not to be set.
+    #     profileName: name of the output profile (key of SDCoutputProfiles).
+    #     chunkSize: number of TIME records of each chunk (0 for a single chunk).
+    #     append: flag for appending all the chunks to the existing netCDF file (with its TIME units).
+       
+    # OUTPUTS:
+    #     stats: dictionary containing the coverage statistics of the dataset (see SDCstatsChunk).
+    
+
+    # Set the chunk size
+    chunkSize = chunkSize if chunkSize > 0 else max(srcDS.sizes['TIME'], 1)
+    
+    stats = None
+    timeUnits = SDCncLastRecord(ncFile, 'TIME')[1] if append else None
+    for tIDX in range(0, srcDS.sizes['TIME'], chunkSize):
+        with SDCspan('fetch') as span:
+            sdcDS = SDCsourceLoad(srcDS.isel(TIME=slice(tIDX, tIDX + chunkSize)))
+            span['bytes'] = sdcDS.nbytes
+        sdcDS = SDCdataTransform(sdcDS, dataType, sensor, inPlace=True, verbose=False)
+        with SDCspan('stats'):
+            stats = SDCstatsMerge(stats, SDCstatsChunk(sdcDS, SDCdataTypes[dataType]['statsVariable']))
+        if (tIDX == 0) and (not append):
+            # Create the netCDF file with unlimited TIME dimension
+            if productMeta is not None:
+                sdcDS = SDCproductTransform(sdcDS, SDCdataTypes[dataType]['productSchema'], productMeta)
+            with SDCspan('attrs'):
+                sdcDS = SDCencodeTime(sdcDS)
+                sdcDS = SDCapplyOutputProfile(sdcDS, profileName)
+            timeUnits = sdcDS.TIME.attrs['units']
+            with SDCspan('write', bytes=sdcDS.nbytes), SDCncLock:
+                sdcDS.to_netcdf(ncFile,format='NETCDF4_CLASSIC',unlimited_dims=['TIME'])
+        else:
+            # Append the chunk along the TIME dimension
+            sdcDS.TIME.encoding['units'] = timeUnits
+            with SDCspan('write', bytes=sdcDS.nbytes):
+                SDCncAppendRecords(ncFile, sdcDS, 'TIME')
+        del sdcDS
+    
+    return stats
+
+def SDCradialIncremental(srcDS, sensor, platformCode, tStart, tEnd, ncFile, productMeta, profileName):
+    # This function builds the aggregated radial dataset by concatenating the SDC-transformed
+    # monthly slices stored in the local cache. Only the missing or changed months are read from
+    # the THREDDS catalog, transformed and stored in the cache. The coverage statistics of the dataset
+    # are merged from the ones stored with the monthly slices.
+    
+    # INPUTS:
+    #     srcDS: lazily loaded xarray Dataset containing the radial data of the aggregation time interval.
+    #     sensor: manufacturer of the radar system (codar or wera).
+    #     platformCode: platform code (EDIOS_Series_ID-EDIOS_Platform_ID).
+    #     tStart: starting time of the dataset.
+    #     tEnd: ending time of the dataset.
+    #     ncFile: path of the netCDF file to be written.
+    #     productMeta: dictionary containing the product metadata (see SDCproductTransform).
+    #     profileName: name of the output profile (key of SDCoutputProfiles).
+       
+    # OUTPUTS:
+    #     numCached: number of monthly slices read from the cache.
+    #     stats: dictionary containing the coverage statistics of the dataset (see SDCstatsChunk).
+    
+
+    # Collect the cached slices, building the missing or changed ones
+    monthFiles = []
+    numCached = 0
+    stats = None
+    month = tStart.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    while month <= tEnd:
+        monthDS = srcDS.sel(TIME=slice(month, month + relativedelta(months=1) - datetime.timedelta(microseconds=1)))
+        numRecords = monthDS.sizes['TIME']
+        if numRecords > 0:
+            timeStart = str(monthDS.TIME.values[0])
+            timeEnd = str(monthDS.TIME.values[-1])
+            cacheFile, monthStats = SDCcacheLoad(platformCode, month, numRecords, timeStart, timeEnd, profileName)
+            if cacheFile is None:
+                cacheFile, monthStats = SDCcacheStore(platformCode, month, monthDS, sensor, numRecords, timeStart, timeEnd, profileName)
+            else:
+                numCached += 1
+            monthFiles.append(cacheFile)
+            stats = SDCstatsMerge(stats, monthStats)
+        month += relativedelta(months=1)
+    
+    # Write the first month with the product metadata (raw values are kept)
+    with SDCncLock:
+        sdcDS = xr.open_dataset(monthFiles[0], mask_and_scale=False, decode_times=False)
+    for var in sdcDS.variables.values():
+        if ('_FillValue' not in var.attrs) and ('_FillValue' not in var.encoding):
+            var.encoding['_FillValue'] = None
+    sdcDS.TIME.attrs['units'] = sdcDS.TIME.attrs['units'].replace('+00:00','Z')
+    sdcDS = SDCproductTransform(sdcDS, SDCradialProductSchema, productMeta)
+    sdcDS = SDCapplyOutputProfile(sdcDS, profileName)
+    with SDCspan('write', bytes=os.path.getsize(monthFiles[0])), SDCncLock:
+        sdcDS.to_netcdf(ncFile,format='NETCDF4_CLASSIC',unlimited_dims=['TIME'])
+        sdcDS.close()
+    
+    # Append the following months
+    for monthFile in monthFiles[1:]:
+        with SDCspan('write', bytes=os.path.getsize(monthFile)):
+            SDCncAppendFile(ncFile, monthFile, 'TIME')
+    
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(numCached) + ' of ' + str(len(monthFiles)) + ' monthly slices of ' + platformCode + ' read from cache.')
+    
+    return numCached, stats
+
+def SDCaggregationJob(dataType, curNetwork, curStation, tStart, tEnd, timeExtent, sourceIndex):
+    # This function builds the aggregation job of the input unit (radial station or totals of a network)
+    # for the input aggregation interval: it builds the dataset ID and the product metadata and selects the
+    # aggregation mode (incremental, append, streaming or in-memory). The aggregation is skipped if the
+    # fingerprint of the source data matches the one recorded at the last build of the dataset (unless
+    # forceRebuild is set). If appendCurrent is set, only the records newer than the last one of the existing
+    # dataset are appended to it (see SDCappendIndex). The incremental aggregation from the monthly cache
+    # is available for radials only. The source dataset of the job is to be opened by the caller.
+    
+    # INPUTS:
+    #     dataType: data type of the unit ('radial' or 'total').
+    #     curNetwork: SDCnetworkRecord of the network to be processed.
+    #     curStation: SDCstationRecord of the station to be processed (None for totals).
+    #     tStart: starting time of the dataset.
+    #     tEnd: ending time of the dataset.
+    #     timeExtent: time extent string for the dataset ID.
+    #     sourceIndex: dictionary containing the source index of the aggregation interval (see SDCsourceIndex).
+       
+    # OUTPUTS:
+    #     job: dictionary containing the aggregation job (see SDCaggregationTransform and SDCaggregationWrite).
+    
+
+    # Retrieve current network_id
+    networkID = curNetwork.network_id
+    
+    # Retrieve the output profile of the network
+    profileName = SDCoutputProfileName(curNetwork)
+    
+    # Retrieve the record holding the source url, the folder, the EDMO code and the temporal resolution of the unit
+    unitRecord = curStation if curStation is not None else curNetwork
+    
+    # Build site_code (EDIOS_Series_ID) and platform_code (EDIOS_Series_ID-EDIOS_Platform_ID, or EDIOS_Series_ID-Total for totals)
+    siteCode = networkID
+    platformCode = SDCunitName(curNetwork, curStation)
+    
+    # Build data ID for SDN_LOCAL_CDI_ID variable
+    dataID = SDCdataTypes[dataType]['dataPrefix'] + platformCode + '_' + timeExtent
+    
+    # Build SDN_XLINK string
+    xlinkString = '<sdn_reference xlink:href="http://seadatanet.maris2.nl/v_cdi_v3/print_xml.asp?edmo=134&identifier="' + dataID + '" xlink:role="isDescribedBy" xlink:type="SDN:L23::CDI"/>'
+    
+    # Retrieve manufacturer info
+    sensor = sourceIndex['sensor']
+    
+    # Retrieve time coverage start and time coverage end
+    dtStart = datetime.datetime.utcfromtimestamp(sourceIndex['timeFirst'].astype(int) * 1e-9) - relativedelta(minutes=unitRecord.temporal_resolution/2)
+    dtEnd = datetime.datetime.utcfromtimestamp(sourceIndex['timeLast'].astype(int) * 1e-9) + relativedelta(minutes=unitRecord.temporal_resolution/2)
+    timeCoverageStart = dtStart.isoformat('T','seconds') + 'Z'
+    timeCoverageEnd = dtEnd.isoformat('T','seconds') + 'Z'
+    
+    # Retrieve time coverage duration
+    pdDuration = pd.Timedelta(dtEnd.replace(microsecond=0) - dtStart.replace(microsecond=0))
+    timeCoverageDuration = pdDuration.isoformat()
+    
+    # Set creation date
+    creationDate= datetime.datetime.now().isoformat('T','seconds') + 'Z'
+    
+    # Set the path of the aggregated netCDF file
+    ncFileNoPath = dataID + '.nc'
+    ncFile = unitRecord.SDC_folder_path + os.path.sep + ncFileNoPath
+    
+    productMeta = {'siteCode': siteCode, 'platformCode': platformCode, 'dataID': dataID, 'EDMOcode': unitRecord.EDMO_code, 'xlinkString': xlinkString, 
+                   'timeCoverageStart': timeCoverageStart, 'timeCoverageEnd': timeCoverageEnd, 'timeCoverageDuration': timeCoverageDuration, 'creationDate': creationDate}
+    
+    # Build the fingerprint of the dataset
+    fingerprint = SDCfingerprint(sourceIndex, profileName, SDCdataTypes[dataType]['productSchema'])
+    
+    # Select the source records to be appended to the existing dataset of the current month
+    appendIndex, appendStats = SDCappendIndex(ncFile, sourceIndex, fingerprint) if appendCurrent and (not forceRebuild) else (None, None)
+    
+    # Select the chunk size of the TIME range (long TIME ranges and datasets too large for the memory budget are streamed)
+    chunkSize, peakBytes = SDCmemoryPlan(sourceIndex if appendIndex is None else appendIndex)
+    
+    # Select the aggregation mode
+    if (not forceRebuild) and SDCfingerprintMatch(ncFile, fingerprint):
+        # Source data unchanged since the last build
+        mode = 'skip'
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + dataID + ': source data unchanged since the last build, aggregation skipped.')
+    else:
+        if (dataType == 'radial') and (cacheFolder != '') and (timeSpan > 1) and (not appendCurrent):
+            # Incremental aggregation: concatenate the cached monthly slices
+            mode = 'incremental'
+        elif appendIndex is not None:
+            # Append aggregation: append the new records to the existing dataset
+            mode = 'append'
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + dataID + ': ' + str(appendIndex['numRecords']) + ' new records to be appended to the existing dataset.')
+        elif chunkSize > 0:
+            # Streaming aggregation: read, transform and append the TIME range chunk by chunk
+            mode = 'streaming'
+        else:
+            # In-memory aggregation
+            mode = 'memory'
+    
+    # Stage the file to a temporary path, renamed to the final path once completely written
+    job = {'dataType': dataType, 'mode': mode, 'unitIDs': SDCunitIDs(curNetwork, curStation), 'timeExtent': timeExtent, 
+           'srcDS': None, 'srcLoaded': False, 'sdcDS': None, 'sensor': sensor, 'platformCode': platformCode, 'tStart': tStart, 'tEnd': tEnd, 
+           'dataID': dataID, 'ncFileNoPath': ncFileNoPath, 'ncFile': ncFile, 'partFile': SDCstagePath(ncFile), 
+           'productMeta': productMeta, 'profileName': profileName, 'fingerprint': fingerprint, 
+           'fetchBytes': 0 if mode == 'skip' else (appendIndex if mode == 'append' else sourceIndex)['fetchBytes'], 'chunkSize': chunkSize, 
+           'ncFilesize': None, 'ncChecksum': None, 'appendIndex': appendIndex, 'stats': appendStats if mode == 'append' else None}
+    
+    return job
+
+def SDCaggregationPrepare(dataType, curNetwork, curStation=None):
+    # This function prepares the aggregation of the input unit (radial station or totals of a network):
+    # it sets the aggregation time interval, reads the source index, builds the aggregation job (see
+    # SDCaggregationJob) and lazily opens the source dataset from the THREDDS catalog via OpenDAP (unless
+    # the aggregation is skipped).
+    
+    # INPUTS:
+    #     dataType: data type of the unit ('radial' or 'total').
+    #     curNetwork: SDCnetworkRecord of the network to be processed.
+    #     curStation: SDCstationRecord of the station to be processed (None for totals).
+       
+    # OUTPUTS:
+    #     job: dictionary containing the aggregation job (see SDCaggregationTransform and SDCaggregationWrite).
+    
+
+    # Set the aggregation time interval according to the aggregation time span
+    Rerr, tStart, tEnd, timeExtent = SDCaggregationTimeInterval()
+    
+    # Retrieve the SDC_OpenDAP_data_url of the unit (held by the station record for radials and by the network record for totals)
+    OpenDAPdataUrl = (curStation if curStation is not None else curNetwork).SDC_OpenDAP_data_url
+    
+    # Read the structure and the TIME coordinate of the aggregated dataset from THREDDS catalog via OpenDAP
+    with SDCspan('index'):
+        sourceIndex = SDCsourceIndex(OpenDAPdataUrl, SDCdataTypes[dataType]['schema'], tStart, tEnd)
+    
+    # Build the aggregation job
+    job = SDCaggregationJob(dataType, curNetwork, curStation, tStart, tEnd, timeExtent, sourceIndex)
+    
+    # Open the aggregated dataset, requesting only the needed variables within the aggregation interval (data are lazily loaded)
+    if job['mode'] != 'skip':
+        with SDCspan('index'):
+            job['srcDS'] = SDCopenSource(OpenDAPdataUrl, sourceIndex)
+        # Read only the records to be appended to the existing dataset
+        if job['mode'] == 'append':
+            job['srcDS'] = job['srcDS'].isel(TIME=slice(job['appendIndex']['tIDX'] - sourceIndex['tIDX'], None))
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + job['platformCode'] + ': ' + '{:.1f}'.format(job['fetchBytes'] / 2**20) + ' MB of ' + '{:.1f}'.format(sourceIndex['sourceBytes'] / 2**20) + ' MB of source data requested.')
+    
+    return job
+
+def SDCncAggregation(dataType, curNetwork, curStation=None):
+    # This function accesses the THREDDS catalog of the HFR networks via OpenDAP and creates the
+    # HFR radial or total aggregated netCDF dataset of the input unit, compliant to the SDC CF extension
+    # of the European standard data model for distribution on the SeaDataNet infrastructure. Long time
+    # ranges are streamed to the output file in chunks of streamChunkSize TIME records.
+    
+    # INPUTS:
+    #     dataType: data type of the unit ('radial' or 'total').
+    #     curNetwork: SDCnetworkRecord of the network to be processed.
+    #     curStation: SDCstationRecord of the station to be processed (None for totals).
+       
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     ncFileNoPath: filename of the generated nc file, without the full path
+    #     ncFilesize: size of the generated nc file.
+    #     tStart: starting time of the dataset.
+    #     tEnd: ending time of the dataset.
+    #     dataID: SDN local CDI id.
+    #     ncChecksum: SHA-256 checksum of the generated nc file.
+    #     skipped: flag for datasets skipped as unchanged since the last build.
+    #     stats: coverage statistics of the dataset (see SDCstatsChunk).
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCncAggregation started for ' + SDCunitName(curNetwork, curStation) + '.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Initialize outputs
+    job = {'mode': None, 'ncFileNoPath': None, 'ncFilesize': None, 'tStart': None, 'tEnd': None, 'dataID': None, 'ncChecksum': None, 'partFile': None, 'stats': None}
+    
+    try:
+        # Prepare, transform and write the aggregated dataset
+        job = SDCaggregationPrepare(dataType, curNetwork, curStation)
+        job = SDCaggregationTransform(job)
+        job = SDCaggregationWrite(job)
+    except Exception as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+        Rerr = True
+    
+    # Remove the staged file of a failed aggregation
+    if Rerr and (job['partFile'] is not None) and os.path.isfile(job['partFile']):
+        os.remove(job['partFile'])
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCncAggregation successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCncAggregation exited with an error.')
+    
+    return Rerr, job['ncFileNoPath'], job['ncFilesize'], job['tStart'], job['tEnd'], job['dataID'], job['ncChecksum'], job['mode'] == 'skip', job['stats']
+
+def SDCradialNCaggregation_v22(curNetwork, curStation):
+    # This function creates the HFR radial aggregated netCDF dataset of the input station (see SDCncAggregation).
+    
+    # INPUTS:
+    #     curNetwork: SDCnetworkRecord of the network related to the station to be processed.
+    #     curStation: SDCstationRecord of the station to be processed.
+       
+    # OUTPUTS:
+    #     outputs of SDCncAggregation.
+    
+
+    return SDCncAggregation('radial', curNetwork, curStation)
+
+def SDCtotalNCaggregation(curNetwork):
+    # This function creates the HFR total aggregated netCDF dataset of the input network (see SDCncAggregation).
+    
+    # INPUTS:
+    #     curNetwork: SDCnetworkRecord of the network to be processed.
+       
+    # OUTPUTS:
+    #     outputs of SDCncAggregation.
+    
+
+    return SDCncAggregation('total', curNetwork)
+
+
+#####################################
+# DATASET PROCESSING
+#####################################   
+
+def SDCaggregationWorker(dataType, curNetwork, curStation=None):
+    # This function runs the aggregation of a single unit (radial station or totals of a network) and packs
+    # its outputs, in order to be executed by the worker pool. Errors are isolated within the unit.
+    
+    # INPUTS:
+    #     dataType: data type of the unit ('radial' or 'total').
+    #     curNetwork: SDCnetworkRecord of the network to be processed.
+    #     curStation: SDCstationRecord of the station to be processed (None for totals).
+       
+    # OUTPUTS:
+    #     result: dictionary containing the error flag, the identifiers of the unit, the outputs of
+    #             SDCncAggregation and the timed spans of the unit (spans).
+    
+
+    # Initialize result
+    result = dict(SDCunitIDs(curNetwork, curStation), Rerr=False, datasetName=None, datasetSize=None, startDate=None, endDate=None, 
+                  SDNlocalCDIid=None, datasetChecksum=None, skipped=False, stats=None)
+    
+    # Create the aggregated dataset, collecting the timed spans of the unit
+    with SDCspanCollect(SDCunitName(curNetwork, curStation), '') as result['spans']:
+        try:
+            result['Rerr'], result['datasetName'], result['datasetSize'], result['startDate'], result['endDate'], result['SDNlocalCDIid'], result['datasetChecksum'], result['skipped'], result['stats'] = SDCncAggregation(dataType, curNetwork, curStation)
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+            result['Rerr'] = True
+    
+    return result
+
+def SDCdatasets(dataType, workUnits, unitHosts):
+    # This function builds the historical datasets of the input data type for the input work units
+    # (radial stations or totals of networks): the units are processed at the same time according to
+    # the selected execution mode (in backfill mode the datasets of all the aggregation intervals of the
+    # backfill range are built for each unit, reading its source data once), the CDI entry of each
+    # dataset is built and the information about the aggregated datasets are written to the database
+    # after all the workers are completed.
+    
+    # INPUTS:
+    #     dataType: data type of the work units ('radial' or 'total').
+    #     workUnits: list of tuples containing the records of each unit (network and station records for 
+    #                radials, network record for totals).
+    #     unitHosts: list containing the name of the THREDDS host accessed by each unit.
+       
+    # OUTPUTS:
+    #     Rerr: error flag.
+    
+
+    # Initialize error flag
+    Rerr = False
+    
+    # Record the work units in the run journal, with a unit for each aggregation interval (leaving out the completed ones when resuming a run)
+    timeExtents = [interval[2] for interval in SDCbackfillIntervals()] if backfillRange is not None else [SDCaggregationTimeInterval()[3]]
+    unitKeys = [[(unitIDs['network_id'], unitIDs.get('station_id', 'Total'), timeExtent) for timeExtent in timeExtents] 
+                for unitIDs in (SDCunitIDs(*unitArgs) for unitArgs in workUnits)]
+    workUnits, unitHosts, unitKeys = SDCjournalStart(workUnits, unitHosts, unitKeys)
+    
+    # Estimate the bytes to be transferred and the peak memory of the work units running at the same time in this process,
+    # for running them within the memory budget
+    unitCosts = None
+    if (memoryBudget > 0) and ((backfillRange is not None) or (executionMode in ['thread', 'process', 'pipeline'])):
+        with SDCspan('plan'):
+            unitCosts = SDCplanUnits(dataType, workUnits)
+    
+    # Order the work units longest first, according to the runtimes of their previous runs (recorded only if the dataset table
+    # has the history columns)
+    historyColumns = scheduleHistory and bool(workUnits) and SDChistoryColumns(dataType)
+    workUnits, unitHosts, unitKeys, unitCosts, unitPredictions = SDCscheduleUnits(dataType, workUnits, unitHosts, unitKeys, unitCosts, historyColumns)
+    
+    # Run the workers (or the fetch / transform / write pipeline, or the backfill of all the aggregation intervals, 
+    # or the distributed workers)
+    execStart = time.time()
+    if backfillRange is not None:
+        Rerr, results = SDCbackfillExec(functools.partial(SDCbackfillPrepare, dataType), workUnits, unitHosts, unitCosts)
+    elif executionMode == 'distributed':
+        Rerr, results = SDCqueueExec(dataType, workUnits, unitHosts)
+    elif executionMode == 'pipeline':
+        Rerr, results = SDCpipelineExec(functools.partial(SDCaggregationPrepare, dataType), workUnits, unitHosts, unitCosts)
+    else:
+        Rerr, results = SDCparallelExec(functools.partial(SDCaggregationWorker, dataType), workUnits, unitHosts, unitCosts)
+    execDuration = time.time() - execStart
+    
+    # Pair each result with its work unit (in backfill mode a unit builds a dataset for each aggregation interval)
+    if backfillRange is None:
+        results = [[result] for result in results]
+    unitResults = [(unitArgs, result) for unitArgs, unitResultList in zip(workUnits, results) for result in unitResultList]
+    
+    # Add the timed spans returned by the workers to the spans of the run, measuring the runtime and the bytes of source data
+    # of each dataset (not measured in backfill mode, whose datasets share the reads of their unit)
+    for unitArgs, result in unitResults:
+        if result is not None:
+            result['buildTime'], result['sourceBytes'] = SDCunitRuntime(result.get('spans', [])) if backfillRange is None else (None, None)
+            SDCspanExtend(result.pop('spans', []))
+    
+    # Report the predicted and the actual runtime of the work units
+    SDCscheduleReport(dataType, workUnits, unitPredictions, results, execDuration)
+    
+    # Initialize the lists of the dataset records for the database (paired with their SDN_LOCAL_CDI_ID and with their runtime
+    # and bytes of source data), of the CDI metadata records, of the datasets for the CDI generation and of the built files
+    unitColumns = SDCdataTypes[dataType]['unitColumns']
+    datasetRecords = []
+    cdiRecords = []
+    cdiUnits = []
+    builtFiles = []
+    creationDate = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Scan results (datasets skipped as unchanged keep their database records and CDIs)
+    for unitArgs, result in unitResults:
+        # Initialize error flag (the station record holds the folder and the temporal resolution of radials, the network record the ones of totals)
+        DnAerr = (result is None) or result['Rerr']
+        unitRecord = unitArgs[-1]
+    
+        if(not DnAerr) and (not result['skipped']):
+            datasetName = result['datasetName']
+            platformCode = SDCunitName(*unitArgs)
+            builtFiles.append(unitRecord.SDC_folder_path + os.path.sep + datasetName)
+    
+            # COLLECT INFORMATION ABOUT THE AGGREGATED DATASET FOR THE DATABASE
+            datasetRecords.append(((datasetName,) + tuple(result[column] for column in unitColumns) + (result['startDate'], result['endDate'], 
+                                    creationDate, result['datasetSize'], 0), result['SDNlocalCDIid'], (result['buildTime'], result['sourceBytes'])))
+    
+            # COLLECT DATASET METADATA FOR CDI GENERATION (from the coverage statistics accumulated while writing)
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + datasetName + ': ' + SDCstatsSummary(result['stats']) + '.')
+    
+            # CREATE THE CDI ENTRY
+            # Collect the dataset for the batched CDI generation
+            cdiConfFile = os.path.join(cdiConfFolder, platformCode + '.xml')
+            if os.path.isfile(cdiConfFile):
+                cdiRecords.append((SDCcdiMetadataRecord(result['SDNlocalCDIid'], platformCode, datasetName, 
+                                                        result['datasetSize'], result['stats'], unitRecord.temporal_resolution), cdiConfFile))
+                cdiUnits.append((result['SDNlocalCDIid'], cdiConfFile))
+            else:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: missing CDI configuration file ' + cdiConfFile + '.')
+    
+        # Update error flag
+        if(not Rerr):
+            Rerr = DnAerr
+    
+    # INSERT DATASET METADATA FOR CDI GENERATION INTO DATABASE (single transaction; no CDI is generated if the insertion fails)
+    CDIerr = False
+    cdiFiles = {}
+    if cdiRecords:
+        try:
+            SDCcdiMetadata2db(SDCdataTypes[dataType]['cdiTable'], cdiRecords)
+        except Exception as err:
+            CDIerr = True
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql insert query for the CDI metadata of ' + str(len(cdiRecords)) + ' datasets: ' + str(err) + '.')
+    
+    # GENERATE THE CDI ENTRIES OF THE AGGREGATED DATASETS (in batches, rendered directly or generated by Mikado according to cdiEngine)
+    if cdiUnits and (not CDIerr):
+        CDIerr, cdiFiles = (SDCcdiMikado if cdiEngine == 'mikado' else SDCcdiBatch)(cdiUnits)
+    
+    # INSERT INFORMATION ABOUT THE AGGREGATED DATASETS AND THEIR SDN_LOCAL_CDI_ID INTO DATABASE (single transaction, 
+    # replacing existing entries with the same filename; the SDN_LOCAL_CDI_ID is NULL for datasets without CDI)
+    DBerr = False
+    if datasetRecords:
+        datasetRecords = [record + (cdiID if cdiID in cdiFiles else None,) + (buildStats if historyColumns else ()) for record, cdiID, buildStats in datasetRecords]
+        try:
+            SDCdbUpsert(SDCdataTypes[dataType]['datasetTable'], ['filename'] + unitColumns + ['start_date', 'end_date', 'creation_date', 'filesize', 'sent_flag', 'SDN_local_CDI_id'] + 
+                        (['build_time', 'source_bytes'] if historyColumns else []), datasetRecords, 'filename')
+        except sql.Error as err:
+            DBerr = True
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql insert query for ' + str(len(datasetRecords)) + ' datasets: ' + str(err) + '.')
+    
+    # Discard the fingerprints of the built datasets if their database records or CDIs were not written, 
+    # so that they are rebuilt at the next run
+    if DBerr or CDIerr:
+        SDCfingerprintDiscard(builtFiles)
+        Rerr = True
+    
+    # Record the state of the work units in the run journal (units whose database records or CDIs were not written are failed)
+    for keys, unitResultList in zip(unitKeys, results):
+        unitErr = DBerr or CDIerr or any((result is None) or result['Rerr'] for result in unitResultList)
+        SDCjournalUpdate(keys, 'failed' if unitErr else 'done')
+    
+    return Rerr
+
+def SDCradials(networks, stations):
+    # This function builds the historical radial datasets to be distributed via the SeaDataNet 
+    # infrastructure by reading hourly data from the EU HFR NODE THREDDS catalog via OpenDAP and 
+    # aggregating them according to the European standard data model.
+    # Stations (belonging to one or more networks) are processed at the same time according to the
+    # selected execution mode and the information about the aggregated datasets are written to the
+    # database after all the workers are completed (see SDCdatasets).
+    # This function also builds the CDI entry for each historical dataset. The information for 
+    # assembling metadata are read from the EU HFR NODE database.
+    
+    # INPUTS:
+    #     networks: dictionary containing the SDCnetworkRecord of the networks to be processed, keyed by network_id.
+    #     stations: list of the SDCstationRecord of the stations to be processed.
+       
+    # OUTPUTS:
+    #     Rerr: error flag.    
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradials started.')
+    
+    # GENERATE AGGREGATED RADIAL DATASETS FOR EACH STATION
+    
+    # Build the work units and the related THREDDS hosts
+    workUnits = []
+    unitHosts = []
+    for curStation in stations:
+        workUnits.append((networks[curStation.network_id], curStation))
+        unitHosts.append(urlparse(curStation.SDC_OpenDAP_data_url).hostname)
+    
+    # Build the datasets, their CDIs and their database records
+    Rerr = SDCdatasets('radial', workUnits, unitHosts)
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradials successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradials exited with an error.')
+    
+    return Rerr
+
+def SDCtotals(networks):
+    # This function builds the historical total datasets to be distributed via the SeaDataNet 
+    # infrastructure by reading hourly data from the EU HFR NODE THREDDS catalog via OpenDAP and 
+    # aggregating them according to the European standard data model.
+    # Networks are processed at the same time according to the selected execution mode and the 
+    # information about the aggregated datasets are written to the database after all the workers
+    # are completed (see SDCdatasets). 
+    # This function also builds the CDI entry for each historical dataset.
+    
+    # INPUTS:
+    #     networks: dictionary containing the SDCnetworkRecord of the networks to be processed, keyed by network_id.
+       
+    # OUTPUTS:
+    #     Rerr: error flag.    
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCtotals started.')
+    
+    # GENERATE AGGREGATED TOTAL DATASETS FOR EACH NETWORK
+    
+    # Build the work units and the related THREDDS hosts (networks distributing totals only)
+    workUnits = []
+    unitHosts = []
+    for curNetwork in networks.values():
+        if curNetwork.SDC_OpenDAP_data_url != '':
+            workUnits.append((curNetwork,))
+            unitHosts.append(urlparse(curNetwork.SDC_OpenDAP_data_url).hostname)
+    
+    # Build the datasets, their CDIs and their database records
+    Rerr = SDCdatasets('total', workUnits, unitHosts)
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCtotals successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCtotals exited with an error.')
+    
+    return Rerr
+
+
+#####################################
+# MEMORY PLANNING
+#####################################   
+
+def SDCmemoryPlan(sourceIndex):
+    # This function estimates the peak memory of the aggregation of the input source index and selects
+    # the number of TIME records to be read, transformed and written at a time. The peak memory of an 
+    # in-memory aggregation is estimated as memoryOverhead times the size of the requested data once 
+    # decoded (memoryBytes), and in streaming mode it scales with the chunk size. TIME ranges longer than
+    # streamChunkSize records are streamed in chunks of streamChunkSize records, and datasets whose peak
+    # memory exceeds the whole memory budget (memoryBudget) are streamed in the largest chunks fitting the
+    # share of the budget of a worker (memoryBudget / maxWorkers).
+    
+    # INPUTS:
+    #     sourceIndex: dictionary containing the source index built by SDCsourceIndex.
+       
+    # OUTPUTS:
+    #     chunkSize: number of TIME records of each chunk (0 for in-memory aggregation).
+    #     peakBytes: estimated peak memory of the aggregation (bytes).
+    
+    
+    # Estimated peak memory per TIME record
+    recordPeak = sourceIndex['memoryBytes'] * memoryOverhead / sourceIndex['numRecords']
+    
+    # Stream the long TIME ranges
+    chunkSize = streamChunkSize if (streamChunkSize > 0) and (sourceIndex['numRecords'] > streamChunkSize) else 0
+    
+    # Stream the datasets exceeding the memory budget
+    if (memoryBudget > 0) and (recordPeak * (chunkSize or sourceIndex['numRecords']) > memoryBudget):
+        chunkSize = max(int(memoryBudget / maxWorkers // recordPeak), 1)
+    
+    peakBytes = int(recordPeak * (chunkSize or sourceIndex['numRecords']))
+    
+    return chunkSize, peakBytes
+
+def SDCplanUnits(dataType, workUnits):
+    # This function runs the planning stage of the aggregation of the input work units: the structure 
+    # (DDS and DAS) and the TIME coordinate of the source dataset of each unit are read, without reading
+    # data, and the bytes to be transferred and the peak memory of the unit are estimated for the 
+    # aggregation interval (or for each interval of the backfill range, keeping the largest peak) according
+    # to SDCmemoryPlan. The estimates are used by the executors for admitting the units within the memory
+    # budget (see SDCmemoryAdmit). The sources are read by maxPerHost threads at the same time, and the 
+    # units whose source cannot be read are left without estimate.
+    
+    # INPUTS:
+    #     dataType: data type of the work units ('radial' or 'total').
+    #     workUnits: list of tuples containing the records of each unit (network and station records for 
+    #                radials, network record for totals).
+               
+    # OUTPUTS:
+    #     unitCosts: list containing, for each unit in the same order as workUnits, a dictionary with the 
+    #                bytes to be transferred (fetchBytes), the size of the decoded data (memoryBytes), the
+    #                estimated peak memory (peakBytes) and the chunk size of the aggregation (chunkSize), or
+    #                None for the units without estimate.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCplanUnits started.')
+    
+    # Set the aggregation intervals of the units
+    intervals = SDCbackfillIntervals() if backfillRange is not None else [SDCaggregationTimeInterval()[1:]]
+    schema = SDCdataTypes[dataType]['schema']
+    
+    def planUnit(unitArgs):
+        # Read the source index of the unit (the source url is held by the station record for radials and 
+        # by the network record for totals) and estimate the cost of each aggregation interval
+        try:
+            sourceIndex = SDCsourceIndex(unitArgs[-1].SDC_OpenDAP_data_url, schema, intervals[0][0], intervals[-1][1])
+            intervalIndexes = [intervalIndex for intervalIndex in SDCsourceSplit(sourceIndex, intervals) if intervalIndex is not None]
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: cost of ' + SDCunitName(*unitArgs) + ' not estimated: ' + str(err) + '.')
+            return None
+        chunkSize, peakBytes = max((SDCmemoryPlan(intervalIndex) for intervalIndex in intervalIndexes), key=lambda plan: plan[1])
+        return {'fetchBytes': sum(intervalIndex['fetchBytes'] for intervalIndex in intervalIndexes), 'memoryBytes': sum(intervalIndex['memoryBytes'] for intervalIndex in intervalIndexes), 
+                'peakBytes': peakBytes, 'chunkSize': chunkSize}
+    
+    with ThreadPoolExecutor(max_workers=maxPerHost) as executor:
+        unitCosts = list(executor.map(planUnit, workUnits))
+    
+    plannedCosts = [unitCost for unitCost in unitCosts if unitCost is not None]
+    if plannedCosts:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(len(plannedCosts)) + ' of ' + str(len(workUnits)) + ' ' + dataType + ' work units planned: ' 
+              + '{:.1f}'.format(sum(unitCost['fetchBytes'] for unitCost in plannedCosts) / 2**20) + ' MB of source data to be transferred, ' 
+              + '{:.1f}'.format(max(unitCost['peakBytes'] for unitCost in plannedCosts) / 2**20) + ' MB of estimated peak memory of the largest unit, ' 
+              + str(sum(unitCost['chunkSize'] > 0 for unitCost in plannedCosts)) + ' units streamed within the memory budget of ' + '{:.1f}'.format(memoryBudget / 2**20) + ' MB.')
+    
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCplanUnits successfully executed.')
+    
+    return unitCosts
+
+def SDCmemoryAdmit(unitCost, memoryLoad, numRunning):
+    # This function is the admission control of the executors: a unit is admitted if its estimated peak
+    # memory fits in the memory budget (memoryBudget) together with the estimated peak memory of the units 
+    # already running. A unit is always admitted when no other unit is running, as well as the units 
+    # without estimate.
+    
+    # INPUTS:
+    #     unitCost: dictionary containing the estimated cost of the unit (see SDCplanUnits), or None.
+    #     memoryLoad: estimated peak memory of the running units (bytes).
+    #     numRunning: number of running units.
+               
+    # OUTPUTS:
+    #     admitted: flag for admitting the unit.
+    
+    
+    if (memoryBudget <= 0) or (unitCost is None) or (numRunning == 0):
+        return True
+    
+    return memoryLoad + unitCost['peakBytes'] <= memoryBudget
+
+
+#####################################
+# SCHEDULING
+#####################################   
+
+def SDCunitRuntime(spans):
+    # This function measures the runtime of a processing unit from its timed spans, as the wall time 
+    # from the start of its first span to the end of its last span, and the bytes of source data loaded
+    # by the unit (fetch spans).
+    
+    # INPUTS:
+    #     spans: list of the span dictionaries of the unit.
+               
+    # OUTPUTS:
+    #     runtime: runtime of the unit in seconds (None for units without spans).
+    #     sourceBytes: bytes of source data loaded by the unit (None for units without spans).
+    
+    
+    if not spans:
+        return None, None
+    
+    runtime = max(span['start'] + span['duration'] for span in spans) - min(span['start'] for span in spans)
+    sourceBytes = sum(span.get('bytes', 0) for span in spans if span['stage'] == 'fetch')
+    
+    return runtime, sourceBytes
+
+def SDChistoryLoad(dataType):
+    # This function loads the runtime history of the units of the input data type from the records of
+    # the datasets in the database: for each station (or network, for totals) the mean runtime and bytes
+    # of source data (build_time and source_bytes columns) of the datasets built by its last run are read.
+    
+    # INPUTS:
+    #     dataType: data type of the units ('radial' or 'total').
+               
+    # OUTPUTS:
+    #     history: dictionary containing key-values pairs <(network_id, station_id)>:<(runtime, sourceBytes)>,
+    #              station_id being 'Total' for totals.
+    
+    
+    table = SDCdataTypes[dataType]['datasetTable']
+    keyColumns = SDCdataTypes[dataType]['unitColumns']
+    
+    # Select the datasets of the last run of each unit recording its runtime
+    lastRuns = ('SELECT ' + ', '.join(keyColumns) + ', MAX(creation_date) AS creation_date FROM ' + table + 
+                ' WHERE build_time IS NOT NULL GROUP BY ' + ', '.join(keyColumns))
+    historyQuery = ('SELECT ' + ', '.join('h.' + c for c in keyColumns) + ', AVG(h.build_time) AS build_time, AVG(h.source_bytes) AS source_bytes FROM ' + table + 
+                    ' h JOIN (' + lastRuns + ') l ON ' + ' AND '.join('h.' + c + ' = l.' + c for c in keyColumns + ['creation_date']) + 
+                    ' WHERE h.build_time IS NOT NULL GROUP BY ' + ', '.join('h.' + c for c in keyColumns))
+    
+    history = {}
+    for row in SDCdbQuery(historyQuery):
+        history[(row['network_id'], row.get('station_id', 'Total'))] = (float(row['build_time']), float(row['source_bytes'] or 0))
+        
+    return history
+
+def SDChistoryColumns(dataType):
+    # This function checks whether the dataset table of the input data type has the build_time and
+    # source_bytes columns recording the runtime history, by selecting them: tables without the columns
+    # make the query fail. A warning is printed if the query fails, with the statement adding the columns
+    # if they are missing.
+    
+    # INPUTS:
+    #     dataType: data type of the datasets ('radial' or 'total').
+               
+    # OUTPUTS:
+    #     hasColumns: flag set if the table has the history columns.
+    
+    
+    table = SDCdataTypes[dataType]['datasetTable']
+    try:
+        SDCdbQuery('SELECT build_time, source_bytes FROM ' + table + ' LIMIT 1')
+    except Exception as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: runtime history of the ' + dataType + ' datasets not recorded: ' + str(err) + '.')
+        if getattr(err, 'errno', None) == errorcode.ER_BAD_FIELD_ERROR:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Add the history columns with: ALTER TABLE ' + table + 
+                  ' ADD COLUMN build_time DOUBLE NULL, ADD COLUMN source_bytes BIGINT NULL;')
+        return False
+        
+    return True
+
+def SDCscheduleMakespan(runtimes, numSlots):
+    # This function evaluates the makespan of the input runtimes, run longest first by the input number
+    # of workers, each unit being started by the first free worker (LPT list scheduling).
+    
+    # INPUTS:
+    #     runtimes: list of the runtimes of the units in seconds.
+    #     numSlots: number of workers.
+               
+    # OUTPUTS:
+    #     makespan: wall time of the run in seconds.
+    
+    
+    slotEnds = [0.0] * max(min(numSlots, len(runtimes)), 1)
+    for runtime in sorted(runtimes, reverse=True):
+        heapq.heappush(slotEnds, heapq.heappop(slotEnds) + runtime)
+    
+    return max(slotEnds)
+
+def SDCscheduleUnits(dataType, workUnits, unitHosts, unitKeys, unitCosts, historyColumns):
+    # This function orders the input work units longest first, according to the runtimes predicted from 
+    # the runtime history of the previous runs (see SDChistoryLoad), so that the executors, starting the
+    # units in order as soon as a worker is free, run them as an LPT schedule minimizing the makespan. 
+    # The runtime of a unit is predicted as the runtime of its last run scaled by the ratio between the
+    # sizes of its current and past source data (estimated by SDCplanUnits) or, without estimate, by the
+    # number of aggregation intervals. The runtime of the units without history is predicted from the
+    # throughput of the other units, or as their mean runtime. The units keep their order if scheduleHistory
+    # is not set, if the dataset table has no history columns or if the history cannot be read.
+    
+    # INPUTS:
+    #     dataType: data type of the work units ('radial' or 'total').
+    #     workUnits: list of the argument tuples of the work units.
+    #     unitHosts: list of the THREDDS hosts of the work units.
+    #     unitKeys: list of the lists of the journal keys of the work units.
+    #     unitCosts: list containing the estimated cost of each unit (see SDCplanUnits), or None.
+    #     historyColumns: flag set if the dataset table has the history columns (see SDChistoryColumns).
+               
+    # OUTPUTS:
+    #     workUnits: list of the argument tuples of the ordered work units.
+    #     unitHosts: list of the THREDDS hosts of the ordered work units.
+    #     unitKeys: list of the lists of the journal keys of the ordered work units.
+    #     unitCosts: list containing the estimated cost of each ordered unit, or None.
+    #     unitPredictions: list containing the predicted runtime of each ordered unit in seconds (None
+    #                      for all units if the history is not used).
+    
+    
+    if (not historyColumns) or (not workUnits):
+        return workUnits, unitHosts, unitKeys, unitCosts, [None] * len(workUnits)
+    
+    # Load the runtime history of the units
+    try:
+        history = SDChistoryLoad(dataType)
+    except sql.Error as err:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: runtime history of the ' + dataType + ' units not loaded: ' + str(err) + '.')
+        return workUnits, unitHosts, unitKeys, unitCosts, [None] * len(workUnits)
+    
+    # Predict the runtime of the units with history and, from the throughput of the history, of the units with estimated cost
+    numIntervals = len(SDCbackfillIntervals()) if backfillRange is not None else 1
+    historyTime = sum(runtime for runtime, sourceBytes in history.values() if sourceBytes > 0)
+    historyBytes = sum(sourceBytes for runtime, sourceBytes in history.values())
+    unitPredictions = []
+    numHistory = 0
+    for unitArgs, unitCost in zip(workUnits, unitCosts or [None] * len(workUnits)):
+        runtime, sourceBytes = history.get((unitArgs[0].network_id, unitArgs[1].station_id if len(unitArgs) > 1 else 'Total'), (None, None))
+        numHistory += runtime is not None
+        if (runtime is not None) and (unitCost is not None) and (sourceBytes > 0):
+            unitPredictions.append(runtime * unitCost['memoryBytes'] / sourceBytes)
+        elif runtime is not None:
+            unitPredictions.append(runtime * numIntervals)
+        elif (unitCost is not None) and (historyBytes > 0):
+            unitPredictions.append(historyTime * unitCost['memoryBytes'] / historyBytes)
+        else:
+            unitPredictions.append(None)
+    
+    # Predict the mean runtime for the other units (the units keep their order without history)
+    knownPredictions = [prediction for prediction in unitPredictions if prediction is not None]
+    if not knownPredictions:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - No ' + dataType + ' work units with runtime history.')
+        return workUnits, unitHosts, unitKeys, unitCosts, unitPredictions
+    meanPrediction = sum(knownPredictions) / len(knownPredictions)
+    unitPredictions = [meanPrediction if prediction is None else prediction for prediction in unitPredictions]
+    
+    # Order the units longest first (units with the same predicted runtime keep their order)
+    unitOrder = sorted(range(len(workUnits)), key=lambda uIDX: unitPredictions[uIDX], reverse=True)
+    workUnits = [workUnits[uIDX] for uIDX in unitOrder]
+    unitHosts = [unitHosts[uIDX] for uIDX in unitOrder]
+    unitKeys = [unitKeys[uIDX] for uIDX in unitOrder]
+    unitCosts = [unitCosts[uIDX] for uIDX in unitOrder] if unitCosts is not None else None
+    unitPredictions = [unitPredictions[uIDX] for uIDX in unitOrder]
+    
+    numSlots = 1 if (executionMode == 'serial') and (backfillRange is None) else maxWorkers
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(numHistory) + ' of ' + str(len(workUnits)) + ' ' + dataType + 
+          ' work units with runtime history, scheduled longest first: predicted makespan of ' + '{:.1f}'.format(SDCscheduleMakespan(unitPredictions, numSlots)) + ' s on ' + str(numSlots) + ' workers.')
+    
+    return workUnits, unitHosts, unitKeys, unitCosts, unitPredictions
+
+def SDCscheduleReport(dataType, workUnits, unitPredictions, results, runDuration):
+    # This function reports the predicted and the actual runtime of each of the input work units whose
+    # datasets were all built in the run (the runtime of a unit being the sum of the runtimes of its 
+    # datasets), as well as the mean absolute error of the predictions and the predicted and actual 
+    # makespan, for tuning the scheduling.
+    
+    # INPUTS:
+    #     dataType: data type of the work units ('radial' or 'total').
+    #     workUnits: list of the argument tuples of the work units.
+    #     unitPredictions: list containing the predicted runtime of each unit in seconds.
+    #     results: list containing, for each unit, the list of the results of its datasets with their runtime (buildTime).
+    #     runDuration: wall time of the run of the units in seconds.
+               
+    # OUTPUTS:
+    
+    
+    reportUnits = []
+    for unitArgs, prediction, unitResultList in zip(workUnits, unitPredictions, results):
+        if (prediction is not None) and unitResultList and all((result is not None) and (not result['Rerr']) and (not result['skipped']) and 
+                                                               (result['buildTime'] is not None) for result in unitResultList):
+            reportUnits.append((SDCunitName(*unitArgs), prediction, sum(result['buildTime'] for result in unitResultList)))
+    if not reportUnits:
+        return
+    
+    for unitName, prediction, runtime in reportUnits:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + unitName + ': predicted runtime ' + '{:.1f}'.format(prediction) + 
+              ' s, actual runtime ' + '{:.1f}'.format(runtime) + ' s.')
+    
+    numSlots = 1 if (executionMode == 'serial') and (backfillRange is None) else maxWorkers
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Runtime predictions of ' + str(len(reportUnits)) + ' ' + dataType + ' work units: mean absolute error of ' 
+          + '{:.1f}'.format(sum(abs(prediction - runtime) for unitName, prediction, runtime in reportUnits) / len(reportUnits)) + ' s, predicted makespan of ' 
+          + '{:.1f}'.format(SDCscheduleMakespan([prediction for prediction in unitPredictions if prediction is not None], numSlots)) + ' s, actual makespan of ' 
+          + '{:.1f}'.format(runDuration) + ' s.')
+    
+    return
+
+
+#####################################
+# AGGREGATION PIPELINE
+#####################################   
+
+def SDCaggregationFetch(job):
+    # This function downloads the source data of the input aggregation job in memory mode (only once)
+    # and closes the source files. Jobs in streaming, incremental or append mode are downloaded chunk by
+    # chunk while writing, and are returned unchanged.
+    
+    # INPUTS:
+    #     job: dictionary containing the aggregation job built by SDCaggregationPrepare.
+       
+    # OUTPUTS:
+    #     job: aggregation job containing the loaded source dataset (srcDS).
+    
+    
+    if (job['mode'] == 'memory') and (not job['srcLoaded']):
+        with SDCspan('fetch') as span:
+            job['srcDS'] = SDCsourceLoad(job['srcDS'])
+            span['bytes'] = job['srcDS'].nbytes
+        SDCsourceClose(job['srcDS'])
+        job['srcLoaded'] = True
+    
+    return job
+
+def SDCaggregationTransform(job):
+    # This function transforms the in-memory source dataset of the input aggregation job according to
+    # the SDC schema of its data type, evaluates its coverage statistics, sets the product metadata and
+    # encodes TIME and the storage settings of the output profile. Jobs in streaming, incremental or append
+    # mode are transformed chunk by chunk while writing, and are returned unchanged.
+    
+    # INPUTS:
+    #     job: dictionary containing the aggregation job built by SDCaggregationPrepare.
+       
+    # OUTPUTS:
+    #     job: aggregation job containing the transformed dataset (sdcDS) and its coverage statistics (stats).
+    
+    
+    if job['mode'] != 'memory':
+        return job
+    
+    job = SDCaggregationFetch(job)
+    sdcDS = SDCdataTransform(job['srcDS'], job['dataType'], job['sensor'])
+    sdcDS = SDCproductTransform(sdcDS, SDCdataTypes[job['dataType']]['productSchema'], job['productMeta'])
+    with SDCspan('stats'):
+        job['stats'] = SDCstatsChunk(sdcDS, SDCdataTypes[job['dataType']]['statsVariable'])
+    
+    # TIME units including timezone digit
+    with SDCspan('attrs'):
+        sdcDS = SDCencodeTime(sdcDS)
+        job['sdcDS'] = SDCapplyOutputProfile(sdcDS, job['profileName'])
+    job['srcDS'] = None
+    
+    return job
+
+def SDCaggregationWrite(job):
+    # This function writes the aggregated netCDF file of the input job to its staged path, according
+    # to the aggregation mode, moves it to its final path and records its fingerprint. In append mode the
+    # existing file is copied to the staged path, the new records are appended to it and its time coverage
+    # and history are updated, so that the file is replaced only once completely written. The job is 
+    # recorded as running in the run journal, together with the path and the checksum of its file.
+    # Skipped jobs are returned unchanged.
+    
+    # INPUTS:
+    #     job: dictionary containing the aggregation job transformed by SDCaggregationTransform.
+       
+    # OUTPUTS:
+    #     job: aggregation job containing the size (kB, ncFilesize) and the checksum (ncChecksum) of the file and
+    #          the coverage statistics of the dataset (stats) in streaming, incremental or append mode.
+    
+    
+    # Record the job as running in the run journal
+    SDCjournalUpdate([SDCjournalKey(job)], 'running', job['ncFile'])
+    
+    if job['mode'] == 'skip':
+        return job
+    elif job['mode'] == 'incremental':
+        numCached, job['stats'] = SDCradialIncremental(job['srcDS'], job['sensor'], job['platformCode'], job['tStart'], job['tEnd'], job['partFile'], job['productMeta'], job['profileName'])
+    elif job['mode'] == 'streaming':
+        job['stats'] = SDCwriteChunks(job['srcDS'], job['dataType'], job['sensor'], job['partFile'], job['productMeta'], job['profileName'], job['chunkSize'])
+    elif job['mode'] == 'append':
+        with SDCspan('write', bytes=os.path.getsize(job['ncFile'])):
+            shutil.copyfile(job['ncFile'], job['partFile'])
+        appendStats = SDCwriteChunks(job['srcDS'], job['dataType'], job['sensor'], job['partFile'], None, job['profileName'], job['chunkSize'], append=True)
+        with SDCspan('attrs'):
+            SDCappendMetadata(job['partFile'], SDCdataTypes[job['dataType']]['productSchema'], job['productMeta'])
+        job['stats'] = SDCstatsMerge(job['stats'], appendStats)
+    else:
+        # The datasets of the current month are written with unlimited TIME dimension, for appending the new records at the next update
+        with SDCspan('write', bytes=job['sdcDS'].nbytes), SDCncLock:
+            job['sdcDS'].to_netcdf(job['partFile'],format='NETCDF4_CLASSIC',unlimited_dims=['TIME'] if appendCurrent else None)
+        job['sdcDS'] = None
+    
+    # Close the source dataset read chunk by chunk
+    SDCsourceClose(job['srcDS'])
+    job['srcDS'] = None
+    
+    # Move the staged file to its final path and get info on the saved netCDF file
+    with SDCspan('commit'):
+        ncFilesize, job['ncChecksum'] = SDCcommitFile(job['partFile'], job['ncFile'])
+    job['ncFilesize'] = ncFilesize / 1024
+    
+    # Record the fingerprint of the source data next to the file and the checksum of the file in the run journal
+    SDCfingerprintStore(job['ncFile'], job['fingerprint'], job['stats'])
+    SDCjournalUpdate([SDCjournalKey(job)], 'running', job['ncFile'], job['ncChecksum'])
+    
+    return job
+
+def SDCpipelineFetch(prepareFunc, unitArgs):
+    # This function runs the fetch stage of the pipeline for the input work unit: the aggregation job
+    # is prepared and the source data of in-memory jobs are downloaded.
+    
+    # INPUTS:
+    #     prepareFunc: function preparing the aggregation job (SDCaggregationPrepare bound to the data type of the units).
+    #     unitArgs: tuple containing the input arguments of prepareFunc.
+       
+    # OUTPUTS:
+    #     job: aggregation job, with the error flag (Rerr) and the timed spans of the stage (spans).
+    
+    
+    with SDCspanCollect(SDCunitName(*unitArgs), '-fetch') as spans:
+        try:
+            job = SDCaggregationFetch(prepareFunc(*unitArgs))
+            job['Rerr'] = False
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+            job = {'Rerr': True}
+    job['spans'] = spans
+        
+    return job
+
+def SDCpipelineStage(stageFunc, job):
+    # This function runs a stage of the pipeline on the input aggregation job, isolating its errors.
+    # The staged file of a failed job is removed.
+    
+    # INPUTS:
+    #     stageFunc: function of the stage (SDCaggregationTransform or SDCaggregationWrite).
+    #     job: aggregation job.
+       
+    # OUTPUTS:
+    #     job: processed aggregation job, with the error flag (Rerr) and the timed spans of the stage
+    #          added to its spans.
+    
+    
+    if job['Rerr']:
+        return job
+    
+    unitIDs = job['unitIDs']
+    unitName = unitIDs['network_id'] + '-' + unitIDs.get('station_id', 'Total')
+    with SDCspanCollect(unitName, '-' + stageFunc.__name__.replace('SDCaggregation', '').lower()) as spans:
+        try:
+            job = stageFunc(job)
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+            job['Rerr'] = True
+            if os.path.isfile(job['partFile']):
+                os.remove(job['partFile'])
+    job['spans'] = job.get('spans', []) + spans
+        
+    return job
+
+def SDCpipelineResult(job):
+    # This function packs the outputs of the input aggregation job as the results of SDCaggregationWorker.
+    
+    # INPUTS:
+    #     job: completed aggregation job.
+       
+    # OUTPUTS:
+    #     result: dictionary containing the error flag, the outputs of the aggregation and the timed spans
+    #             of the job (None for failed jobs, whose spans are added to the spans of the current thread).
+    
+    
+    if job['Rerr']:
+        SDCspanExtend(job.get('spans', []))
+        return None
+    
+    result = dict(job['unitIDs'], Rerr=False, datasetName=job['ncFileNoPath'], datasetSize=job['ncFilesize'], startDate=job['tStart'], 
+                  endDate=job['tEnd'], SDNlocalCDIid=job['dataID'], datasetChecksum=job['ncChecksum'], skipped=(job['mode'] == 'skip'), 
+                  stats=job['stats'], spans=job.get('spans', []))
+    
+    return result
+
+def SDCpipelineExec(prepareFunc, workUnits, unitHosts, unitCosts=None):
+    # This function runs the aggregation of the input work units as a pipeline of three stages, so that
+    # downloads, transformations and writes of different units overlap:
+    #     - fetch: a pool of maxWorkers threads prepares the jobs and downloads the source data, with
+    #       no more than maxPerHost units at the same time against the same host;
+    #     - transform: a pool of maxWorkers processes transforms and encodes the in-memory datasets;
+    #     - write: a single writer process writes the netCDF files (in a separate process, in order
+    #       not to share the HDF5 library lock with the downloads).
+    # No more than pipelineDepth units are in the pipeline at the same time (backpressure), so that
+    # the number of datasets held in memory is bounded, and if the costs of the units are estimated
+    # the units enter the pipeline within the memory budget (see SDCmemoryAdmit). Jobs in streaming or
+    # incremental mode (too large to be held in memory) are written chunk by chunk by the fetch threads.
+    
+    # INPUTS:
+    #     prepareFunc: function preparing the aggregation job of a unit (SDCaggregationPrepare bound to the data type of the units).
+    #     workUnits: list of tuples containing the input arguments of prepareFunc for each unit.
+    #     unitHosts: list containing the name of the host accessed by each unit.
+    #     unitCosts: list containing the estimated cost of each unit (see SDCplanUnits), or None.
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    #     results: list containing the results of each unit (as SDCaggregationWorker),
+    #              in the same order as workUnits (None for failed units).
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCpipelineExec started.')
+    
+    # Initialize error flag
+    Rerr = False
+    
+    # Initialize results
+    results = [None] * len(workUnits)
+    
+    fetchExecutor = ThreadPoolExecutor(max_workers=maxWorkers)
+    # Worker processes are spawned, as forking while the fetch threads hold the netCDF/HDF5 locks would deadlock them
+    spawnContext = multiprocessing.get_context('spawn')
+    transformExecutor = ProcessPoolExecutor(max_workers=maxWorkers, mp_context=spawnContext, initializer=SDCworkerInit, initargs=(SDCworkerSettings(),))
+    writeExecutor = ProcessPoolExecutor(max_workers=1, mp_context=spawnContext, initializer=SDCworkerInit, initargs=(SDCworkerSettings(),))
+    
+    unitCosts = unitCosts or [None] * len(workUnits)
+    pendingUnits = list(range(len(workUnits)))
+    runningStages = {}
+    fetchingHosts = {}
+    memoryLoad = 0
+    with fetchExecutor, transformExecutor, writeExecutor:
+        while pendingUnits or runningStages:
+            # Start fetching the pending units, within the pipeline depth, the host concurrency cap and the memory budget
+            for uIDX in list(pendingUnits):
+                if len(runningStages) >= pipelineDepth:
+                    break
+                if (fetchingHosts.get(unitHosts[uIDX], 0) < maxPerHost) and SDCmemoryAdmit(unitCosts[uIDX], memoryLoad, len(runningStages)):
+                    runningStages[fetchExecutor.submit(SDCpipelineFetch, prepareFunc, workUnits[uIDX])] = (uIDX, 'fetch')
+                    fetchingHosts[unitHosts[uIDX]] = fetchingHosts.get(unitHosts[uIDX], 0) + 1
+                    memoryLoad += unitCosts[uIDX]['peakBytes'] if unitCosts[uIDX] is not None else 0
+                    pendingUnits.remove(uIDX)
+            
+            # Wait for at least one stage to be completed and move the jobs to the next stage
+            doneStages, _ = wait(runningStages, return_when=FIRST_COMPLETED)
+            for fut in doneStages:
+                uIDX, stage = runningStages.pop(fut)
+                try:
+                    job = fut.result()
+                except Exception as err:
+                    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                    job = {'Rerr': True}
+                
+                # Release the host once the unit leaves the fetch threads
+                if (stage == 'fetch') and (job['Rerr'] or (job['mode'] == 'memory')) or (stage == 'fetchWrite'):
+                    fetchingHosts[unitHosts[uIDX]] -= 1
+                
+                if job['Rerr'] or (stage in ('write', 'fetchWrite')):
+                    results[uIDX] = SDCpipelineResult(job)
+                    Rerr = Rerr or job['Rerr']
+                    memoryLoad -= unitCosts[uIDX]['peakBytes'] if unitCosts[uIDX] is not None else 0
+                elif job['mode'] != 'memory':
+                    runningStages[fetchExecutor.submit(SDCpipelineStage, SDCaggregationWrite, job)] = (uIDX, 'fetchWrite')
+                elif stage == 'fetch':
+                    runningStages[transformExecutor.submit(SDCpipelineStage, SDCaggregationTransform, job)] = (uIDX, 'transform')
+                else:
+                    runningStages[writeExecutor.submit(SDCpipelineStage, SDCaggregationWrite, job)] = (uIDX, 'write')
+    
+    if(not Rerr):
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCpipelineExec successfully executed.')
+    else:
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCpipelineExec exited with an error.')
+        
+    return Rerr, results
+
+
 #####################################
-# GENERAL FUNCTIONS (to be moved in a separate file)
+# BACKFILL
 #####################################   
 
-def SDCremapvar(remappedVar,remapDict):
-    # This function remaps values in the input variable according to the input remap dictionary.
-    # The remapped variable is returned.
+def SDCbackfillPrepare(dataType, curNetwork, curStation=None):
+    # This function prepares the aggregation jobs of the input unit (station or totals of a network) for
+    # all the aggregation intervals of the backfill range: the source index is read once for the whole
+    # range and split into the intervals, and the source dataset is opened once for the whole range, each
+    # job reading its TIME range from the same lazily loaded dataset. Intervals without TIME records are
+    # not aggregated.
     
     # INPUTS:
-    #     remappedVar: data array variable to be remapped.
-    #     remapDict: dictionary for remapping, containing key-values pairs <valueToBeReplaced>:<valueToReplace>
-               
+    #     dataType: data type of the unit ('radial' or 'total').
+    #     curNetwork: SDCnetworkRecord of the network to be processed.
+    #     curStation: SDCstationRecord of the station to be processed (None for totals).
+       
     # OUTPUTS:
-    #     Rerr: error flag.
-    #     remappedVar: remapped data array variable.
+    #     jobs: list containing the aggregation jobs, in TIME order.
+    
+    
+    # Split the backfill range into the aggregation intervals
+    intervals = SDCbackfillIntervals()
+    if not intervals:
+        raise ValueError('no complete aggregation intervals within the backfill range')
+    
+    # Read the structure and the TIME coordinate of the source dataset for the whole range (the source url is held by
+    # the station record for radials and by the network record for totals)
+    dataUrl = (curStation if curStation is not None else curNetwork).SDC_OpenDAP_data_url
+    with SDCspan('index'):
+        sourceIndex = SDCsourceIndex(dataUrl, SDCdataTypes[dataType]['schema'], intervals[0][0], intervals[-1][1])
+    
+    # Build the aggregation job of each interval
+    jobs = []
+    intervalIndexes = []
+    for (tStart, tEnd, timeExtent), intervalIndex in zip(intervals, SDCsourceSplit(sourceIndex, intervals)):
+        if intervalIndex is not None:
+            jobs.append(SDCaggregationJob(dataType, curNetwork, curStation, tStart, tEnd, timeExtent, intervalIndex))
+            intervalIndexes.append(intervalIndex)
+    
+    # Open the source dataset once, requesting the needed variables within the whole range (data are lazily loaded)
+    buildIndexes = [intervalIndex for job, intervalIndex in zip(jobs, intervalIndexes) if job['mode'] != 'skip']
+    if buildIndexes:
+        with SDCspan('index'):
+            srcDS = SDCopenSource(dataUrl, sourceIndex)
+        for job, intervalIndex in zip(jobs, intervalIndexes):
+            if job['mode'] != 'skip':
+                job['srcDS'] = srcDS.isel(TIME=slice(intervalIndex['tIDX'] - sourceIndex['tIDX'], intervalIndex['tEndIDX'] - sourceIndex['tIDX']))
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + jobs[0]['platformCode'] + ': ' + str(len(buildIndexes)) + ' of ' + str(len(intervals)) + ' datasets to be built, ' 
+              + '{:.1f}'.format(sum(intervalIndex['fetchBytes'] for intervalIndex in buildIndexes) / 2**20) + ' MB of ' + '{:.1f}'.format(sourceIndex['sourceBytes'] / 2**20) + ' MB of source data requested.')
     
+    return jobs
 
-    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCremapvar started.')
+def SDCbackfillFetch(prepareFunc, unitArgs, writeExecutor, writeSlots):
+    # This function reads the source data of the input work unit for the backfill: the aggregation jobs
+    # of all the intervals are prepared (opening the source once) and read in TIME order. In-memory jobs
+    # are handed to the writer processes once read (waiting for a free slot, in order to bound the number
+    # of datasets held in memory), while jobs in streaming or incremental mode are written by the reader.
+    # The reads and the writes of the reader threads hold the same netCDF lock (SDCncLock), and the source
+    # dataset shared by the jobs of the unit is closed under the lock once all the jobs are read.
     
-    # Initialize error flag
-    Rerr = False
+    # INPUTS:
+    #     prepareFunc: function preparing the aggregation jobs of a unit (SDCbackfillPrepare bound to the data type of the units).
+    #     unitArgs: tuple containing the input arguments of prepareFunc.
+    #     writeExecutor: pool of the writer processes.
+    #     writeSlots: semaphore bounding the number of jobs handed to the writer processes and not yet written.
+       
+    # OUTPUTS:
+    #     unitJobs: list containing the completed aggregation jobs of the unit, or the futures of the jobs
+    #               handed to the writer processes.
+    #     spans: list containing the timed spans of the reader.
     
-    # Store the encoding dictionary
-    encDict = remappedVar.encoding
     
-    # Remap
-    for k,v in remapDict.items():
-        remappedVar = remappedVar.where(remappedVar!=k, v)
-        
-    # Assign the encoding dictionary to the remapped variable
-    remappedVar.encoding = encDict
+    unitJobs = []
+    with SDCspanCollect(SDCunitName(*unitArgs), '-backfill') as spans:
+        try:
+            jobs = prepareFunc(*unitArgs)
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+            jobs = []
+            unitJobs.append({'Rerr': True})
         
-    if(not Rerr):
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCremapvar successfully executed for variable ' + remappedVar.name + '.')
-    else:
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCremapvar exited with an error for variable ' + remappedVar.name + '.')
+        # Source dataset shared by the jobs of the unit (each job reading its TIME range from it)
+        srcDS = next((job['srcDS'] for job in jobs if job['srcDS'] is not None), None)
+            
+        for job in jobs:
+            job['Rerr'] = False
+            try:
+                if job['mode'] == 'memory':
+                    job = SDCaggregationFetch(job)
+                    writeSlots.acquire()
+                    unitJobs.append(writeExecutor.submit(SDCbackfillWrite, job))
+                    unitJobs[-1].add_done_callback(lambda fut: writeSlots.release())
+                    continue
+                elif job['mode'] != 'skip':
+                    job = SDCaggregationWrite(job)
+            except Exception as err:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                job['Rerr'] = True
+                if os.path.isfile(job['partFile']):
+                    os.remove(job['partFile'])
+            unitJobs.append(job)
         
-    return Rerr, remappedVar
+        SDCsourceClose(srcDS)
+            
+    return unitJobs, spans
 
-def SDCaggregationTimeInterval():
-    # This function evaluates the start and end datetimes for aggregation based on the selected time span.
-    # In particular, this function selects the last n months before the current one, where n is the selected
-    # time span. The function also returns the aggregation time extent string for the dataset ID.
+def SDCbackfillWrite(job):
+    # This function transforms and writes the in-memory aggregation job handed to a writer process.
+    
+    # INPUTS:
+    #     job: aggregation job, with the loaded source dataset.
+       
+    # OUTPUTS:
+    #     job: completed aggregation job, with the error flag (Rerr) and the timed spans of the writer (spans).
+    
+    
+    job = SDCpipelineStage(SDCaggregationTransform, job)
+    job = SDCpipelineStage(SDCaggregationWrite, job)
+    
+    return job
+
+def SDCbackfillExec(prepareFunc, workUnits, unitHosts, unitCosts=None):
+    # This function builds the datasets of all the aggregation intervals of the backfill range for the
+    # input work units in a single pass on their source data:
+    #     - a pool of maxWorkers reader threads reads the source data of each unit once, interval by
+    #       interval (see SDCbackfillFetch), with no more than maxPerHost units at the same time against
+    #       the same host;
+    #     - a pool of maxWorkers writer processes transforms and writes the in-memory datasets, so that
+    #       writes overlap with the reads. No more than pipelineDepth datasets are waiting for or being
+    #       processed by the writers at the same time (backpressure).
+    # If the costs of the units are estimated, the units are read within the memory budget (see SDCmemoryAdmit).
     
     # INPUTS:
+    #     prepareFunc: function preparing the aggregation jobs of a unit (SDCbackfillPrepare bound to the data type of the units).
+    #     workUnits: list of tuples containing the input arguments of prepareFunc for each unit.
+    #     unitHosts: list containing the name of the host accessed by each unit.
+    #     unitCosts: list containing the estimated cost of each unit (see SDCplanUnits), or None.
                
     # OUTPUTS:
     #     Rerr: error flag.
-    #     tStart: starting time of the dataset.
-    #     tEnd: ending time of the dataset.
-    #     timeExtent: time extent string for the dataset ID.
+    #     results: list containing, for each unit in the same order as workUnits, the list of the results of
+    #              its datasets (as SDCaggregationWorker, None for failed datasets).
     
 
-    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCaggregationTimeInterval started.')
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCbackfillExec started.')
     
     # Initialize error flag
     Rerr = False
     
-    # Evaluate the start and end datetimes for aggregation based on the selectedtime span
-    tEnd = datetime.datetime.today().replace(day=1, hour=23, minute=59, second =59, microsecond=999999) - datetime.timedelta(hours=24)
-    tStart = (tEnd - relativedelta(months=timeSpan-1)).replace(day=1, hour=0, minute=0, second =0, microsecond=0)
+    # Initialize results
+    results = [[] for uIDX in range(len(workUnits))]
+    unitJobs = [[] for uIDX in range(len(workUnits))]
     
-    # Build the aggregation time extent string
-    if timeSpan == 1:               # 1-month time extent
-        timeExtent = str(tStart.year) + str(tStart.month).zfill(2)    
-    elif timeSpan == 12:            # 1-year time extent
-        timeExtent = str(tStart.year)
-    elif ((timeSpan % 12) == 0):    # multi-years time extent
-        timeExtent = str(tStart.year) + '-' + str(tEnd.year)
-    else:                           # general time extent
-        timeExtent = str(tStart.year) + str(tStart.month).zfill(2) + '-' + str(tEnd.year) + str(tEnd.month).zfill(2)
+    readExecutor = ThreadPoolExecutor(max_workers=maxWorkers)
+    # Writer processes are spawned, as forking while the reader threads hold the netCDF/HDF5 locks would deadlock them
+    spawnContext = multiprocessing.get_context('spawn')
+    writeExecutor = ProcessPoolExecutor(max_workers=maxWorkers, mp_context=spawnContext, initializer=SDCworkerInit, initargs=(SDCworkerSettings(),))
+    writeSlots = threading.BoundedSemaphore(pipelineDepth)
+    
+    unitCosts = unitCosts or [None] * len(workUnits)
+    pendingUnits = list(range(len(workUnits)))
+    runningUnits = {}
+    hostLoad = {}
+    memoryLoad = 0
+    with readExecutor, writeExecutor:
+        while pendingUnits or runningUnits:
+            # Start reading the pending units whose host is below the concurrency cap and which fit in the memory budget
+            for uIDX in list(pendingUnits):
+                if len(runningUnits) >= maxWorkers:
+                    break
+                if (hostLoad.get(unitHosts[uIDX], 0) < maxPerHost) and SDCmemoryAdmit(unitCosts[uIDX], memoryLoad, len(runningUnits)):
+                    runningUnits[readExecutor.submit(SDCbackfillFetch, prepareFunc, workUnits[uIDX], writeExecutor, writeSlots)] = uIDX
+                    hostLoad[unitHosts[uIDX]] = hostLoad.get(unitHosts[uIDX], 0) + 1
+                    memoryLoad += unitCosts[uIDX]['peakBytes'] if unitCosts[uIDX] is not None else 0
+                    pendingUnits.remove(uIDX)
+            
+            # Wait for at least one unit to be read
+            doneUnits, _ = wait(runningUnits, return_when=FIRST_COMPLETED)
+            for fut in doneUnits:
+                uIDX = runningUnits.pop(fut)
+                hostLoad[unitHosts[uIDX]] -= 1
+                memoryLoad -= unitCosts[uIDX]['peakBytes'] if unitCosts[uIDX] is not None else 0
+                try:
+                    unitJobs[uIDX], spans = fut.result()
+                    SDCspanExtend(spans)
+                except Exception as err:
+                    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                    unitJobs[uIDX] = [{'Rerr': True}]
+        
+        # Collect the jobs completed by the writers
+        for uIDX in range(len(workUnits)):
+            for job in unitJobs[uIDX]:
+                if not isinstance(job, dict):
+                    try:
+                        job = job.result()
+                    except Exception as err:
+                        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                        job = {'Rerr': True}
+                results[uIDX].append(SDCpipelineResult(job))
+                Rerr = Rerr or job['Rerr']
     
     if(not Rerr):
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCaggregationTimeInterval successfully executed.')
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCbackfillExec successfully executed.')
     else:
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCaggregationTimeInterval exited with an error.')
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCbackfillExec exited with an error.')
         
-    return Rerr, tStart, tEnd, timeExtent
+    return Rerr, results
 
 
 #####################################
-# METADATA MANAGEMENT
-#####################################
-
-# def SDCcdiRadialsMetadata2db
-
-# def SDCcdiTotalsMetadata2db
+# DISTRIBUTED EXECUTION
+#####################################   
 
+def SDCqueueExecute(query, params=(), many=False):
+    # This function executes the input parameterized statement on the work queue of the distributed
+    # execution mode, stored in the SDCqueue_tb table of the database (queueBackend 'mysql') or of the 
+    # SQLite database file queueFile (queueBackend 'sqlite'), in a single transaction.
+    
+    # INPUTS:
+    #     query: statement, with ? placeholders for the parameters (converted for MySQL).
+    #     params: tuple of the statement parameters (list of tuples if many is set).
+    #     many: flag for executing the statement for each tuple of parameters.
+               
+    # OUTPUTS:
+    #     rows: list of the fetched rows (tuples).
+    #     rowCount: number of rows affected by the statement.
+    
+    
+    if queueBackend == 'mysql':
+        query = query.replace('?', '%s')
+        cnx = SDCdbConnect()
+    else:
+        cnx = sqlite3.connect(queueFile, timeout=60)
+    try:
+        cursor = cnx.cursor()
+        if many:
+            cursor.executemany(query, params)
+        else:
+            cursor.execute(query, params)
+        rows = cursor.fetchall() if cursor.description else []
+        rowCount = cursor.rowcount
+        cnx.commit()
+        cursor.close()
+    except:
+        cnx.rollback()
+        raise
+    finally:
+        cnx.close()
+        
+    return rows, rowCount
 
-#####################################
-# RADIAL DATASET AGGREGATION
-#####################################   
+def SDCqueueSetup():
+    # This function creates the SDCqueue_tb table of the work queue, if missing. Each row is a work unit
+    # of a coordinator run, with its data type ('radial' or 'total'), its arguments (network and station
+    # records, as JSON), its THREDDS host, its status ('pending', 'running', 'done' or 'failed'), the 
+    # worker holding its lease and the lease expiry time (epoch seconds), the number of claims and the 
+    # result reported by the worker (as JSON).
+    
+    # INPUTS:
+               
+    # OUTPUTS:
+    
+    
+    if queueBackend != 'mysql':
+        SDCqueueExecute('PRAGMA journal_mode=WAL')
+    SDCqueueExecute('CREATE TABLE IF NOT EXISTS SDCqueue_tb (run_id VARCHAR(128) NOT NULL, unit_idx INTEGER NOT NULL, data_type VARCHAR(16) NOT NULL, '
+                    'unit_args TEXT NOT NULL, host VARCHAR(255), status VARCHAR(16) NOT NULL, worker VARCHAR(255), lease_expires DOUBLE, '
+                    'attempts INTEGER NOT NULL, result LONGTEXT, updated DOUBLE, PRIMARY KEY (run_id, unit_idx))')
+    
+    return
 
-def SDCradialNCaggregation_v22(curNetwork, curStation):
-    # This function accesses the THREDDS catalog of the HFR networks via OpenDAP and creates
-    # HFR radial aggregated netCDF datasets compliant to the SDC CF extension of the European standard
-    # data model for distribution on the SeaDataNet infrastructure.
+def SDCqueueExec(dataType, workUnits, unitHosts):
+    # This function runs the input work units in distributed mode, as coordinator: the units are put on
+    # the work queue, to be claimed and processed by the workers running on one or more nodes (see
+    # SDCqueueWorker), and their results are collected once all the units are completed. Units whose
+    # lease expired queueMaxAttempts times (e.g. because their workers died) are failed, as well as the
+    # units not completed within queueTimeout seconds (e.g. because no worker is running), whose late
+    # results are discarded.
     
     # INPUTS:
-    #     curNetwork: DataFrame containing information about the network related to the station to be processed.
-    #     curStation: DataFrame containing information about the station to be processed.
-       
+    #     dataType: type of the work units ('radial' or 'total', see SDCaggregationWorker).
+    #     workUnits: list of tuples containing the input arguments of the worker function for each unit.
+    #     unitHosts: list containing the name of the host accessed by each unit.
+               
     # OUTPUTS:
     #     Rerr: error flag.
-    #     ncFileNoPath: filename of the generated nc file, without the full path
-    #     ncFilesize: size of the generated nc file.
-    #     tStart: starting time of the dataset.
-    #     tEnd: ending time of the dataset.
-    #     dataID: SDN local CDI id.
+    #     results: list containing the outputs of the worker function for each unit, in the same order as 
+    #              workUnits (None for failed units).
     
 
-    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradialNCaggregation_v22 started.')
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCqueueExec started.')
     
     # Initialize error flag
     Rerr = False
     
-    try:
-        # Set the aggregation time interval according to the aggregation time span
-        Rerr, tStart, tEnd, timeExtent = SDCaggregationTimeInterval()
-        
-        # Retrieve current station_id
-        stationID = curStation['station_id'].to_list()[0]    
-        
-        # Retrieve EDMO code
-        EDMOcode = curStation['EDMO_code'].to_list()[0]
-        
-        # Build site_code (EDIOS_Series_ID) and platform_code (EDIOS_Series_ID-EDIOS_Platform_ID)
-        siteCode = networkID
-        platformCode = networkID + '-' + stationID
-        
-        # Build data ID for SDN_LOCAL_CDI_ID variable
-        dataID = 'RV_HF_' + platformCode + '_' + timeExtent
-        
-        # Build SDN_XLINK string
-        xlinkString = '<sdn_reference xlink:href="http://seadatanet.maris2.nl/v_cdi_v3/print_xml.asp?edmo=134&identifier="' + dataID + '" xlink:role="isDescribedBy" xlink:type="SDN:L23::CDI"/>'
-        
-        # Retrieve the SDC_OpenDAP_data_url for current station data
-        OpenDAPdataUrl = curStation['SDC_OpenDAP_data_url'].to_list()[0]
-        
-        # Read aggregated radial dataset from THREDDS catalog via OpenDAP
-        sdcDS = xr.open_dataset(OpenDAPdataUrl, decode_times=True).sel(TIME=slice(tStart,tEnd))
-        
-        # Retrieve manufacturer info
-        sensor = sdcDS.attrs['sensor']   
-        
-        # Retrieve time coverage start and time coverage end
-        dtStart = datetime.datetime.utcfromtimestamp(sdcDS.TIME.values[0].astype(int) * 1e-9) - relativedelta(minutes=curStation['temporal_resolution'][0]/2)
-        dtEnd = datetime.datetime.utcfromtimestamp(sdcDS.TIME.values[-1].astype(int) * 1e-9) + relativedelta(minutes=curStation['temporal_resolution'][0]/2)
-        timeCoverageStart = dtStart.isoformat('T','seconds') + 'Z'
-        timeCoverageEnd = dtEnd.isoformat('T','seconds') + 'Z'
-        
-        # Retrieve time coverage duration
-        pdDuration = pd.Timedelta(dtEnd.replace(microsecond=0) - dtStart.replace(microsecond=0))
-        timeCoverageDuration = pdDuration.isoformat()
-            
-        # Set creation date
-        creationDate= datetime.datetime.now().isoformat('T','seconds') + 'Z'
-       
-        # Remap and rename QC variables to the SDC schema
-        # TIME_SEADATANET_QC
-        Rerr, sdcDS['TIME_SEADATANET_QC'] = SDCremapvar(sdcDS.TIME_QC, QCremapDict)
-        sdcDS = sdcDS.drop(['TIME_QC'])    
-        # POSITION_SEADATANET_QC
-        Rerr, sdcDS['POSITION_SEADATANET_QC'] = SDCremapvar(sdcDS.POSITION_QC, QCremapDict)
-        sdcDS = sdcDS.drop(['POSITION_QC'])
-        # DEPTH_SEADATANET_QC
-        Rerr, sdcDS['DEPTH_SEADATANET_QC'] = SDCremapvar(sdcDS.DEPH_QC, QCremapDict)
-        sdcDS = sdcDS.drop(['DEPH_QC'])    
-        # QCflag
-        Rerr, sdcDS['QCflag'] = SDCremapvar(sdcDS.QCflag, QCremapDict)    
-        # OWTR_QC
-        Rerr, sdcDS['OWTR_QC'] = SDCremapvar(sdcDS.OWTR_QC, QCremapDict)    
-        # MDFL_QC
-        Rerr, sdcDS['MDFL_QC'] = SDCremapvar(sdcDS.MDFL_QC, QCremapDict)    
-        # VART_QC
-        Rerr, sdcDS['VART_QC'] = SDCremapvar(sdcDS.VART_QC, QCremapDict)
-        # CSPD_QC
-        Rerr, sdcDS['CSPD_QC'] = SDCremapvar(sdcDS.CSPD_QC, QCremapDict)
-        # AVRB_QC
-        Rerr, sdcDS['AVRB_QC'] = SDCremapvar(sdcDS.AVRB_QC, QCremapDict)
-        # RDCT_QC
-        Rerr, sdcDS['RDCT_QC'] = SDCremapvar(sdcDS.RDCT_QC, QCremapDict)
-        
-        # Modify variable attributes according to the SDC schema
-        # TIME
-        sdcDS.TIME.attrs['long_name'] = 'Chronological Julian Date'
-        sdcDS.TIME.encoding['calendar'] = 'julian'
-        sdcDS.TIME.attrs['ancillary_variables'] = 'TIME_SEADATANET_QC'
-        sdcDS.TIME.attrs.pop('valid_min')
-        sdcDS.TIME.attrs.pop('valid_max')
-        sdcDS.TIME.attrs.pop('uncertainty')
-        sdcDS.TIME.encoding['_FillValue'] = None
-        
-        if 'codar'.casefold() in sensor.casefold():
-            # BEAR
-            sdcDS.BEAR.attrs['units'] = 'degrees_true'
-            sdcDS.BEAR.attrs['ancillary_variables'] = 'POSITION_SEADATANET_QC'
-            sdcDS.BEAR.attrs.pop('standard_name')
-            sdcDS.BEAR.attrs.pop('valid_min')
-            sdcDS.BEAR.attrs.pop('valid_max')
-            sdcDS.BEAR.attrs.pop('uncertainty')
-            sdcDS.BEAR.encoding['_FillValue'] = None
-            
-            # RNGE
-            sdcDS.RNGE.attrs['units'] = 'km'
-            sdcDS.RNGE.attrs['ancillary_variables'] = 'POSITION_SEADATANET_QC'
-            sdcDS.RNGE.attrs.pop('standard_name')
-            sdcDS.RNGE.attrs.pop('valid_min')
-            sdcDS.RNGE.attrs.pop('valid_max')
-            sdcDS.RNGE.attrs.pop('uncertainty')
-            sdcDS.RNGE.encoding['_FillValue'] = None
-        
-        # DEPTH
-        sdcDS = sdcDS.rename({'DEPH': 'DEPTH'})
-        sdcDS.DEPTH.attrs['ancillary_variables'] = 'DEPTH_SEADATANET_QC'
-        sdcDS.DEPTH.attrs.pop('valid_min')
-        sdcDS.DEPTH.attrs.pop('valid_max')
-        sdcDS.DEPTH.attrs.pop('uncertainty')
-        sdcDS.DEPTH.attrs.pop('data_mode')
-        sdcDS.DEPTH.encoding['_FillValue'] = None
-        
-        # LATITUDE
-        sdcDS.LATITUDE.attrs['long_name'] = 'Latitude'
-        sdcDS.LATITUDE.attrs['units'] = 'degrees_north'
-        sdcDS.LATITUDE.attrs['ancillary_variables'] = 'POSITION_SEADATANET_QC'
-        sdcDS.LATITUDE.attrs['valid_range'] = np.array([-90, 90])
-        sdcDS.LATITUDE.attrs.pop('valid_min')
-        sdcDS.LATITUDE.attrs.pop('valid_max')
-        sdcDS.LATITUDE.attrs.pop('uncertainty')
-        if 'wera'.casefold() in sensor.casefold():
-            sdcDS.LATITUDE.encoding['_FillValue'] = None
-        
-        # LONGITUDE
-        sdcDS.LONGITUDE.attrs['long_name'] = 'Longitude'
-        sdcDS.LONGITUDE.attrs['units'] = 'degrees_east'
-        sdcDS.LONGITUDE.attrs['ancillary_variables'] = 'POSITION_SEADATANET_QC'
-        sdcDS.LONGITUDE.attrs['valid_range'] = np.array([-180, 180])
-        sdcDS.LONGITUDE.attrs.pop('valid_min')
-        sdcDS.LONGITUDE.attrs.pop('valid_max')
-        sdcDS.LONGITUDE.attrs.pop('uncertainty')
-        if 'wera'.casefold() in sensor.casefold():
-            sdcDS.LONGITUDE.encoding['_FillValue'] = None
-        
-        # SDN_CRUISE
-        sdcDS = sdcDS.drop(['SDN_CRUISE'])
-        sdcDS = sdcDS.assign(SDN_CRUISE=siteCode)
-        sdcDS.SDN_CRUISE.attrs['long_name'] = 'Grid grouping label'
-        sdcDS.SDN_CRUISE.encoding['char_dim_name'] = 'STRING' + str(len(siteCode))
-        
-        # SDN_STATION
-        sdcDS = sdcDS.drop(['SDN_STATION'])
-        sdcDS = sdcDS.assign(SDN_STATION=platformCode)
-        sdcDS.SDN_STATION.attrs['long_name'] = 'Grid label'
-        sdcDS.SDN_STATION.encoding['char_dim_name'] = 'STRING' + str(len(platformCode))
-        
-        # SDN_LOCAL_CDI_ID
-        sdcDS = sdcDS.drop(['SDN_LOCAL_CDI_ID'])
-        sdcDS = sdcDS.assign(SDN_LOCAL_CDI_ID=dataID)
-        sdcDS.SDN_LOCAL_CDI_ID.attrs['long_name'] = 'SeaDataNet CDI identifier'
-        sdcDS.SDN_LOCAL_CDI_ID.encoding['char_dim_name'] = 'STRING' + str(len(dataID))
-        
-        # SDN_EDMO_CODE
-        sdcDS = sdcDS.drop(['SDN_EDMO_CODE'])
-        sdcDS = sdcDS.assign(SDN_EDMO_CODE=np.int16(EDMOcode))
-        sdcDS['SDN_EDMO_CODE'] = sdcDS.SDN_EDMO_CODE.expand_dims('MAXINST')
-        sdcDS.SDN_EDMO_CODE.attrs['long_name'] = 'European Directory of Marine Organisations code for the CDI partner'
-        sdcDS.SDN_EDMO_CODE.attrs['units'] = 1
-        
-        # SDN_XLINK
-        sdcDS = sdcDS.drop(['SDN_XLINK'])
-        sdcDS = sdcDS.assign(SDN_XLINK=xlinkString)
-        sdcDS['SDN_XLINK'] = sdcDS.SDN_XLINK.expand_dims('REFMAX')
-        sdcDS.SDN_XLINK.attrs['long_name'] = 'External resource linkages'
-        sdcDS.SDN_XLINK.encoding['char_dim_name'] = 'STRING' + str(len(xlinkString))
-        
-        # SDN_REFERENCES
-        sdcDS = sdcDS.drop(['SDN_REFERENCES'])
-        
-        # RDVA
-        sdcDS.RDVA.attrs['long_name'] = 'Radial Sea Water Velocity Away From Instrument'    
-        sdcDS.RDVA.attrs['valid_range'] = np.array([-10000, 10000])
-        sdcDS.RDVA.attrs.pop('valid_min')
-        sdcDS.RDVA.attrs.pop('valid_max')  
-        sdcDS.RDVA.attrs.pop('data_mode') 
-        sdcDS.RDVA.encoding['coordinates'] = sdcDS.RDVA.encoding['coordinates'].replace('DEPH','DEPTH')
-        sdcDS.RDVA.attrs['ancillary_variables'] = sdcDS.RDVA.attrs['ancillary_variables'].replace(',','')
-        
-        # DRVA
-        sdcDS.DRVA.attrs['long_name'] = 'Direction of Radial Vector Away From Instrument'    
-        sdcDS.DRVA.attrs['valid_range'] = np.array([0, 360000])
-        sdcDS.DRVA.attrs['units'] = 'degrees_true'
-        sdcDS.DRVA.encoding['coordinates'] = sdcDS.DRVA.encoding['coordinates'].replace('DEPH','DEPTH')
-        sdcDS.DRVA.attrs.pop('valid_min')
-        sdcDS.DRVA.attrs.pop('valid_max')  
-        sdcDS.DRVA.attrs.pop('data_mode')
-        sdcDS.DRVA.attrs['ancillary_variables'] = sdcDS.DRVA.attrs['ancillary_variables'].replace(',','')
-        
-        # EWCT
-        sdcDS.EWCT.attrs['valid_range'] = np.array([-10000, 10000])
-        sdcDS.EWCT.attrs.pop('ioos_category')
-        sdcDS.EWCT.attrs.pop('coordsys')
-        sdcDS.EWCT.attrs.pop('valid_min')
-        sdcDS.EWCT.attrs.pop('valid_max')
-        sdcDS.EWCT.attrs.pop('data_mode')
-        sdcDS.EWCT.encoding['coordinates'] = sdcDS.EWCT.encoding['coordinates'].replace('DEPH','DEPTH')
-        sdcDS.EWCT.attrs['ancillary_variables'] = sdcDS.EWCT.attrs['ancillary_variables'].replace(',','')
-        
-        # NSCT
-        sdcDS.NSCT.attrs['valid_range'] = np.array([-10000, 10000])
-        sdcDS.NSCT.attrs.pop('ioos_category')
-        sdcDS.NSCT.attrs.pop('coordsys')
-        sdcDS.NSCT.attrs.pop('valid_min')
-        sdcDS.NSCT.attrs.pop('valid_max')
-        sdcDS.NSCT.attrs.pop('data_mode')
-        sdcDS.NSCT.encoding['coordinates'] = sdcDS.NSCT.encoding['coordinates'].replace('DEPH','DEPTH')
-        sdcDS.NSCT.attrs['ancillary_variables'] = sdcDS.NSCT.attrs['ancillary_variables'].replace(',','')
-        
-        if 'wera'.casefold() in sensor.casefold():
-            # HCSS
-            sdcDS.HCSS.attrs['long_name'] = 'Radial Variance of Current Velocity Over Coverage Period' 
-            sdcDS.HCSS.attrs.pop('standard_name')
-            sdcDS.HCSS.attrs['valid_range'] = np.array([-10000000, 10000000])        
-            sdcDS.HCSS.attrs.pop('valid_min')
-            sdcDS.HCSS.attrs.pop('valid_max')
-            sdcDS.HCSS.attrs.pop('data_mode')
-            sdcDS.HCSS.attrs['sdn_parameter_name'] = ''
-            sdcDS.HCSS.attrs['sdn_parameter_urn'] = ''
-            sdcDS.HCSS.encoding['coordinates'] = sdcDS.HCSS.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.HCSS.attrs['ancillary_variables'] = sdcDS.HCSS.attrs['ancillary_variables'].replace(',','')
-            
-            # EACC
-            sdcDS.EACC.attrs['long_name'] = 'Radial Accuracy of Current Velocity Over Coverage Period' 
-            sdcDS.EACC.attrs.pop('standard_name')
-            sdcDS.EACC.attrs['valid_range'] = np.array([-10000, 10000])        
-            sdcDS.EACC.attrs.pop('valid_min')
-            sdcDS.EACC.attrs.pop('valid_max')
-            sdcDS.EACC.attrs.pop('data_mode')
-            sdcDS.EACC.attrs['sdn_parameter_name'] = ''
-            sdcDS.EACC.attrs['sdn_parameter_urn'] = ''
-            sdcDS.EACC.encoding['coordinates'] = sdcDS.EACC.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.EACC.attrs['ancillary_variables'] = sdcDS.EACC.attrs['ancillary_variables'].replace(',','')
-            
-        if 'codar'.casefold() in sensor.casefold():
-            # ESPC
-            sdcDS.ESPC.attrs['long_name'] = 'Radial Standard Deviation of Current Velocity over the Scatter Patch' 
-            sdcDS.ESPC.attrs.pop('standard_name')
-            sdcDS.ESPC.attrs['valid_range'] = np.array([-32000, 32000])        
-            sdcDS.ESPC.attrs.pop('valid_min')
-            sdcDS.ESPC.attrs.pop('valid_max')
-            sdcDS.ESPC.attrs.pop('data_mode')
-            sdcDS.ESPC.attrs['sdn_parameter_name'] = ''
-            sdcDS.ESPC.attrs['sdn_parameter_urn'] = ''
-            sdcDS.ESPC.encoding['coordinates'] = sdcDS.ESPC.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.ESPC.attrs['ancillary_variables'] = sdcDS.ESPC.attrs['ancillary_variables'].replace(',','')
-            
-            # ETMP
-            sdcDS.ETMP.attrs['long_name'] = 'Radial Standard Deviation of Current Velocity over Coverage Period' 
-            sdcDS.ETMP.attrs.pop('standard_name')
-            sdcDS.ETMP.attrs['valid_range'] = np.array([-32000, 32000])        
-            sdcDS.ETMP.attrs.pop('valid_min')
-            sdcDS.ETMP.attrs.pop('valid_max')
-            sdcDS.ETMP.attrs.pop('data_mode')
-            sdcDS.ETMP.attrs['sdn_parameter_name'] = ''
-            sdcDS.ETMP.attrs['sdn_parameter_urn'] = ''
-            sdcDS.ETMP.encoding['coordinates'] = sdcDS.ETMP.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.ETMP.attrs['ancillary_variables'] = sdcDS.ETMP.attrs['ancillary_variables'].replace(',','')
-            
-            # MAXV
-            sdcDS.MAXV.attrs['long_name'] = 'Radial Sea Water Velocity Away From Instrument Maximum' 
-            sdcDS.MAXV.attrs.pop('standard_name')
-            sdcDS.MAXV.attrs['valid_range'] = np.array([-10000, 10000])        
-            sdcDS.MAXV.attrs.pop('valid_min')
-            sdcDS.MAXV.attrs.pop('valid_max')
-            sdcDS.MAXV.attrs.pop('data_mode')
-            sdcDS.MAXV.encoding['coordinates'] = sdcDS.MAXV.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.MAXV.attrs['ancillary_variables'] = sdcDS.MAXV.attrs['ancillary_variables'].replace(',','')
-            
-            # MINV
-            sdcDS.MINV.attrs['long_name'] = 'Radial Sea Water Velocity Away From Instrument Minimum' 
-            sdcDS.MINV.attrs.pop('standard_name')
-            sdcDS.MINV.attrs['valid_range'] = np.array([-10000, 10000])        
-            sdcDS.MINV.attrs.pop('valid_min')
-            sdcDS.MINV.attrs.pop('valid_max')
-            sdcDS.MINV.attrs.pop('data_mode')
-            sdcDS.MINV.encoding['coordinates'] = sdcDS.MINV.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.MINV.attrs['ancillary_variables'] = sdcDS.MINV.attrs['ancillary_variables'].replace(',','')
-            
-            # ERSC
-            sdcDS.ERSC.attrs['long_name'] = 'Radial Sea Water Velocity Spatial Quality Count' 
-            sdcDS.ERSC.attrs.pop('standard_name')
-            sdcDS.ERSC.attrs['valid_range'] = np.array([0, 127])        
-            sdcDS.ERSC.attrs.pop('valid_min')
-            sdcDS.ERSC.attrs.pop('valid_max')
-            sdcDS.ERSC.attrs.pop('data_mode')
-            sdcDS.ERSC.attrs['sdn_parameter_name'] = ''
-            sdcDS.ERSC.attrs['sdn_parameter_urn'] = ''
-            sdcDS.ERSC.encoding['coordinates'] = sdcDS.ERSC.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.ERSC.attrs['ancillary_variables'] = sdcDS.ERSC.attrs['ancillary_variables'].replace(',','')
-            
-            # ERTC
-            sdcDS.ERTC.attrs['long_name'] = 'Radial Sea Water Velocity Temporal Quality Count' 
-            sdcDS.ERTC.attrs.pop('standard_name')
-            sdcDS.ERTC.attrs['valid_range'] = np.array([0, 127])        
-            sdcDS.ERTC.attrs.pop('valid_min')
-            sdcDS.ERTC.attrs.pop('valid_max')
-            sdcDS.ERTC.attrs.pop('data_mode')
-            sdcDS.ERTC.attrs['sdn_parameter_name'] = ''
-            sdcDS.ERTC.attrs['sdn_parameter_urn'] = ''
-            sdcDS.ERTC.encoding['coordinates'] = sdcDS.ERTC.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.ERTC.attrs['ancillary_variables'] = sdcDS.ERTC.attrs['ancillary_variables'].replace(',','')
-            
-            # XDST
-            sdcDS.XDST.attrs['long_name'] = 'Eastward Distance From Instrument' 
-            sdcDS.XDST.attrs.pop('standard_name')
-            sdcDS.XDST.attrs['valid_range'] = np.array([0, 1000000])        
-            sdcDS.XDST.attrs.pop('valid_min')
-            sdcDS.XDST.attrs.pop('valid_max')
-            sdcDS.XDST.attrs.pop('data_mode')
-            sdcDS.XDST.attrs['sdn_parameter_name'] = ''
-            sdcDS.XDST.attrs['sdn_parameter_urn'] = ''
-            sdcDS.XDST.encoding['coordinates'] = sdcDS.XDST.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.XDST.attrs['ancillary_variables'] = sdcDS.XDST.attrs['ancillary_variables'].replace(',','')
-            
-            # YDST
-            sdcDS.YDST.attrs['long_name'] = 'Northward Distance From Instrument' 
-            sdcDS.YDST.attrs.pop('standard_name')
-            sdcDS.YDST.attrs['valid_range'] = np.array([0, 1000000])        
-            sdcDS.YDST.attrs.pop('valid_min')
-            sdcDS.YDST.attrs.pop('valid_max')
-            sdcDS.YDST.attrs.pop('data_mode')
-            sdcDS.YDST.attrs['sdn_parameter_name'] = ''
-            sdcDS.YDST.attrs['sdn_parameter_urn'] = ''
-            sdcDS.YDST.encoding['coordinates'] = sdcDS.YDST.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.YDST.attrs['ancillary_variables'] = sdcDS.YDST.attrs['ancillary_variables'].replace(',','')
-            
-            # SPRC
-            sdcDS.SPRC.attrs['long_name'] = 'Radial Sea Water Velocity Cross Spectra Range Cell' 
-            sdcDS.SPRC.attrs.pop('standard_name')
-            sdcDS.SPRC.attrs['valid_range'] = np.array([0, 127])        
-            sdcDS.SPRC.attrs.pop('valid_min')
-            sdcDS.SPRC.attrs.pop('valid_max')
-            sdcDS.SPRC.attrs.pop('data_mode')
-            sdcDS.SPRC.attrs['sdn_parameter_name'] = ''
-            sdcDS.SPRC.attrs['sdn_parameter_urn'] = ''
-            sdcDS.SPRC.encoding['coordinates'] = sdcDS.SPRC.encoding['coordinates'].replace('DEPH','DEPTH')
-            sdcDS.SPRC.attrs['ancillary_variables'] = sdcDS.SPRC.attrs['ancillary_variables'].replace(',','')
-            
-        # NARX
-        sdcDS.NARX.attrs['long_name'] = 'Number of Receive Antennas'
-        sdcDS.NARX.attrs.pop('standard_name')
-        sdcDS.NARX.attrs['valid_range'] = np.array([0, 127])        
-        sdcDS.NARX.attrs.pop('valid_min')
-        sdcDS.NARX.attrs.pop('valid_max')
-        sdcDS.NARX.attrs.pop('data_mode')
-        sdcDS.NARX.attrs['sdn_parameter_name'] = ''
-        sdcDS.NARX.attrs['sdn_parameter_urn'] = ''
-        
-        # NATX
-        sdcDS.NATX.attrs['long_name'] = 'Number of Transmit Antennas'
-        sdcDS.NATX.attrs.pop('standard_name')
-        sdcDS.NATX.attrs['valid_range'] = np.array([0, 127])        
-        sdcDS.NATX.attrs.pop('valid_min')
-        sdcDS.NATX.attrs.pop('valid_max')
-        sdcDS.NATX.attrs.pop('data_mode')
-        sdcDS.NATX.attrs['sdn_parameter_name'] = ''
-        sdcDS.NATX.attrs['sdn_parameter_urn'] = ''
-        
-        # SLTR
-        sdcDS.SLTR.attrs['long_name'] = 'Receive Antenna Latitudes'
-        sdcDS.SLTR.attrs['units'] = 'degrees_north'
-        sdcDS.SLTR.attrs['valid_range'] = np.array([-90000, 90000])        
-        sdcDS.SLTR.attrs.pop('valid_min')
-        sdcDS.SLTR.attrs.pop('valid_max')
-        sdcDS.SLTR.attrs.pop('data_mode')
-        
-        # SLNR
-        sdcDS.SLNR.attrs['long_name'] = 'Receive Antenna Longitudes'
-        sdcDS.SLNR.attrs['units'] = 'degrees_east'
-        sdcDS.SLNR.attrs['valid_range'] = np.array([-180000, 180000])        
-        sdcDS.SLNR.attrs.pop('valid_min')
-        sdcDS.SLNR.attrs.pop('valid_max')
-        sdcDS.SLNR.attrs.pop('data_mode')
-        
-        # SLTT
-        sdcDS.SLTT.attrs['long_name'] = 'Transmit Antenna Latitudes'
-        sdcDS.SLTT.attrs['units'] = 'degrees_north'
-        sdcDS.SLTT.attrs['valid_range'] = np.array([-90000, 90000])        
-        sdcDS.SLTT.attrs.pop('valid_min')
-        sdcDS.SLTT.attrs.pop('valid_max')
-        sdcDS.SLTT.attrs.pop('data_mode')
-        
-        # SLNT
-        sdcDS.SLNT.attrs['long_name'] = 'Transmit Antenna Longitudes'
-        sdcDS.SLNT.attrs['units'] = 'degrees_east'
-        sdcDS.SLNT.attrs['valid_range'] = np.array([-180000, 180000])        
-        sdcDS.SLNT.attrs.pop('valid_min')
-        sdcDS.SLNT.attrs.pop('valid_max')
-        sdcDS.SLNT.attrs.pop('data_mode')
-        
-        # SCDR
-        sdcDS.SCDR.attrs['long_name'] = 'Receive Antenna Codes'
-        sdcDS.SCDR.attrs.pop('standard_name')
-        sdcDS.SCDR.attrs.pop('data_mode')
-        sdcDS.SCDR.attrs['sdn_parameter_name'] = ''
-        sdcDS.SCDR.attrs['sdn_parameter_urn'] = ''
-        sdcDS.SCDR.encoding['_FillValue'] = b''
-        sdcDS.SCDR.encoding['char_dim_name'] = 'STRING' + str(len(sdcDS.SCDR.values[0][0]))
-        
-        # SCDT
-        sdcDS.SCDT.attrs['long_name'] = 'Transmit Antenna Codes'
-        sdcDS.SCDT.attrs.pop('standard_name')
-        sdcDS.SCDT.attrs.pop('data_mode')
-        sdcDS.SCDT.attrs['sdn_parameter_name'] = ''
-        sdcDS.SCDT.attrs['sdn_parameter_urn'] = ''
-        sdcDS.SCDT.encoding['_FillValue'] = b''
-        sdcDS.SCDT.encoding['char_dim_name'] = 'STRING' + str(len(sdcDS.SCDT.values[0][0]))
-        
-        # TIME_SEADATANET_QC
-        sdcDS.TIME_SEADATANET_QC.attrs['long_name'] = 'Time SeaDataNet Quality Flag'
-        sdcDS.TIME_SEADATANET_QC.attrs.pop('conventions')
-        sdcDS.TIME_SEADATANET_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.TIME_SEADATANET_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)      
-        sdcDS.TIME_SEADATANET_QC.attrs.pop('valid_min')
-        sdcDS.TIME_SEADATANET_QC.attrs.pop('valid_max')
-        sdcDS.TIME_SEADATANET_QC.attrs.pop('comment')
-        sdcDS.TIME_SEADATANET_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.TIME_SEADATANET_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.TIME_SEADATANET_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.TIME_SEADATANET_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # POSITION_SEADATANET_QC
-        sdcDS.POSITION_SEADATANET_QC.attrs['long_name'] = 'Position SeaDataNet Quality Flags'
-        sdcDS.POSITION_SEADATANET_QC.attrs.pop('conventions')
-        sdcDS.POSITION_SEADATANET_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.POSITION_SEADATANET_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)       
-        sdcDS.POSITION_SEADATANET_QC.attrs.pop('valid_min')
-        sdcDS.POSITION_SEADATANET_QC.attrs.pop('valid_max')
-        sdcDS.POSITION_SEADATANET_QC.attrs.pop('comment')
-        sdcDS.POSITION_SEADATANET_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.POSITION_SEADATANET_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.POSITION_SEADATANET_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.POSITION_SEADATANET_QC.encoding['coordinates'] = 'TIME DEPTH LATITUDE LONGITUDE'
-        sdcDS.POSITION_SEADATANET_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # DEPTH_SEADATANET_QC
-        sdcDS.DEPTH_SEADATANET_QC.attrs['long_name'] = 'Depth SeaDataNet Quality Flag'
-        sdcDS.DEPTH_SEADATANET_QC.attrs.pop('conventions')
-        sdcDS.DEPTH_SEADATANET_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.DEPTH_SEADATANET_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)       
-        sdcDS.DEPTH_SEADATANET_QC.attrs.pop('valid_min')
-        sdcDS.DEPTH_SEADATANET_QC.attrs.pop('valid_max')
-        sdcDS.DEPTH_SEADATANET_QC.attrs.pop('comment')
-        sdcDS.DEPTH_SEADATANET_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.DEPTH_SEADATANET_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.DEPTH_SEADATANET_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.DEPTH_SEADATANET_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # QCflag
-        sdcDS.QCflag.attrs['long_name'] = 'Overall Quality Flags'
-        sdcDS.QCflag.attrs.pop('conventions')
-        sdcDS.QCflag.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.QCflag.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)      
-        sdcDS.QCflag.attrs.pop('valid_min')
-        sdcDS.QCflag.attrs.pop('valid_max')
-        sdcDS.QCflag.attrs.pop('comment')
-        sdcDS.QCflag.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.QCflag.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.QCflag.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.QCflag.encoding['coordinates'] = 'TIME DEPTH LATITUDE LONGITUDE'
-        sdcDS.QCflag.encoding['_FillValue'] = np.int8(57)
-        
-        # OWTR_QC
-        sdcDS.OWTR_QC.attrs['long_name'] = 'Over-water Quality Flags'
-        sdcDS.OWTR_QC.attrs.pop('conventions')
-        sdcDS.OWTR_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.OWTR_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)       
-        sdcDS.OWTR_QC.attrs.pop('valid_min')
-        sdcDS.OWTR_QC.attrs.pop('valid_max')
-        sdcDS.OWTR_QC.attrs.pop('comment')
-        sdcDS.OWTR_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.OWTR_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.OWTR_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.OWTR_QC.encoding['coordinates'] = 'TIME DEPTH LATITUDE LONGITUDE'
-        sdcDS.OWTR_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # MDFL_QC
-        sdcDS.MDFL_QC.attrs['long_name'] = 'Median Filter Quality Flags'
-        sdcDS.MDFL_QC.attrs.pop('conventions')
-        sdcDS.MDFL_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.MDFL_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)       
-        sdcDS.MDFL_QC.attrs.pop('valid_min')
-        sdcDS.MDFL_QC.attrs.pop('valid_max')
-        sdcDS.MDFL_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.MDFL_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.MDFL_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.MDFL_QC.encoding['coordinates'] = 'TIME DEPTH LATITUDE LONGITUDE'
-        sdcDS.MDFL_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # VART_QC
-        sdcDS.VART_QC.attrs['long_name'] = 'Variance Threshold Quality Flags'
-        sdcDS.VART_QC.attrs.pop('conventions')
-        sdcDS.VART_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.VART_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)     
-        sdcDS.VART_QC.attrs.pop('valid_min')
-        sdcDS.VART_QC.attrs.pop('valid_max')
-        sdcDS.VART_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.VART_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.VART_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.VART_QC.encoding['coordinates'] = 'TIME DEPTH LATITUDE LONGITUDE'
-        sdcDS.VART_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # CSPD_QC
-        sdcDS.CSPD_QC.attrs['long_name'] = 'Velocity Threshold Quality Flags'
-        sdcDS.CSPD_QC.attrs.pop('conventions')
-        sdcDS.CSPD_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.CSPD_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)     
-        sdcDS.CSPD_QC.attrs.pop('valid_min')
-        sdcDS.CSPD_QC.attrs.pop('valid_max')
-        sdcDS.CSPD_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.CSPD_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.CSPD_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.CSPD_QC.encoding['coordinates'] = 'TIME DEPTH LATITUDE LONGITUDE'
-        sdcDS.CSPD_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # AVRB_QC
-        sdcDS.AVRB_QC.attrs['long_name'] = 'Average Radial Bearing Quality Flags'
-        sdcDS.AVRB_QC.attrs.pop('conventions')
-        sdcDS.AVRB_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.AVRB_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)  
-        sdcDS.AVRB_QC.attrs.pop('valid_min')
-        sdcDS.AVRB_QC.attrs.pop('valid_max')
-        sdcDS.AVRB_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.AVRB_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.AVRB_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.AVRB_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # RDCT_QC
-        sdcDS.RDCT_QC.attrs['long_name'] = 'Radial Count Quality Flags'
-        sdcDS.RDCT_QC.attrs.pop('conventions')
-        sdcDS.RDCT_QC.attrs['Conventions'] = 'SeaDataNet measurand qualifier flags'
-        sdcDS.RDCT_QC.attrs['valid_range'] = np.array([48, 65]).astype(np.int8)     
-        sdcDS.RDCT_QC.attrs.pop('valid_min')
-        sdcDS.RDCT_QC.attrs.pop('valid_max')
-        sdcDS.RDCT_QC.attrs['flag_values'] = np.array([48, 49, 50, 51, 52, 53, 54, 55, 56, 57, 65]).astype(np.int8) 
-        sdcDS.RDCT_QC.attrs['flag_meanings'] = 'no_quality_control good_value probably_good_value probably_bad_value bad_value changed_value value_below_detection value_in_excess interpolated_value missing_value value_phenomenon_uncertain'
-        sdcDS.RDCT_QC.attrs['sdn_conventions_urn'] = 'SDN:L20::'
-        sdcDS.RDCT_QC.encoding['_FillValue'] = np.int8(57)
-        
-        # Modify global attributes according to the SDC schema
-        sdcDS.attrs.pop('platform_name')
-        sdcDS.attrs.pop('wmo_platform_code')
-        sdcDS.attrs.pop('ices_platform_code')
-        sdcDS.attrs.pop('feature_type')
-        sdcDS.attrs.pop('bottom_depth')
-        sdcDS.attrs.pop('contact')
-        sdcDS.attrs.pop('grid_resolution')
-        sdcDS.attrs.pop('doi')
-        sdcDS.attrs.pop('pi_name')
-        sdcDS.attrs.pop('qc_manual')
-        sdcDS.attrs.pop('wmo_inst_type')
-        sdcDS.attrs['id'] = dataID
-        sdcDS.attrs['time_coverage_start'] = timeCoverageStart
-        sdcDS.attrs['time_coverage_end'] = timeCoverageEnd
-        sdcDS.attrs['time_coverage_duration'] = timeCoverageDuration
-        sdcDS.attrs['format_version'] = 'v2.2'
-        sdcDS.attrs['Conventions'] = 'CF-1.6, OceanSITES Manual 1.2, SeaDataNet_1.0, INSPIRE'
-        sdcDS.attrs['citation'] = sdcDS.attrs['citation'].replace('Copernicus','SeaDataNet')
-        sdcDS.attrs['distribution_statement'] = sdcDS.attrs['distribution_statement'].replace('Copernicus','SeaDataNet')
-        sdcDS.attrs['naming_authority'] = 'eu.eurogoos'
-        sdcDS.attrs['cdm_data_type'] = 'Grid'
-        sdcDS.attrs['netcdf_version'] = '4.3.3.1'
-        sdcDS.attrs['software_name'] = 'EU_HFR_NODE_pySDC'        
-        sdcDS.attrs['software_version'] = 'v2.2'
-        sdcDS.attrs['references'] = 'Corgnati, L. et al (2019) SeaDataNet data management protocols for HF Radar data, WP9 - Deliverable D9.12. Version 1.6. SeaDataNet, 83pp. DOI: http://dx.doi.org/10.25607/OBP-1011'
-        sdcDS.attrs['date_created'] = creationDate
-        sdcDS.attrs['date_modified'] = creationDate
-        sdcDS.attrs['date_update'] = creationDate
-        sdcDS.attrs['date_issued'] = creationDate
-        sdcDS.attrs['metadata_date_stamp'] = creationDate
-        sdcDS.attrs['history'] = 'Data collected from ' + timeCoverageStart + ' to ' + timeCoverageEnd + '.NetCDF file created by the European HFR Node on ' + creationDate + '.'
-        
-        # Build aggregated netCDF file name
-        ncFilePath = curStation['SDC_folder_path'][0]
-        ncFileNoPath = dataID + '.nc'
-        ncFile = ncFilePath + os.path.sep + ncFileNoPath
-        
-        # Save the aggregated netDFC file
-        sdcDS.to_netcdf(ncFile,format='NETCDF4_CLASSIC')
-        
-        # Modify the units attribute of TIME variable for including timezone digit
-        f = nc4.Dataset(ncFile,'r+',format='NETCDF4')
-        f.variables['TIME'].units = f.variables['TIME'].units.replace('+00:00','Z')
-        f.close()
-        
-        # Get info on the saved netCDF file
-        ncFilesize = os.path.getsize(ncFile) / 1024
-    except BaseException as err:
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + 
-                err.args[0] + '.')
-        Rerr = True
-    except OSError:
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR processing ' + 
-                OSError.filename + ' -> ' + OSError.strerror + '.')
-        Rerr = True
+    # Initialize results
+    results = [None] * len(workUnits)
+    
+    # Queue the work units
+    SDCqueueSetup()
+    runID = datetime.datetime.now().strftime('%Y%m%d%H%M%S') + '-' + socket.gethostname() + '-' + str(os.getpid()) + '-' + dataType
+    SDCqueueExecute('INSERT INTO SDCqueue_tb VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', 
+                    [(runID, uIDX, dataType, json.dumps([asdict(record) for record in workUnits[uIDX]]), unitHosts[uIDX], 'pending', None, None, 0, None, time.time()) 
+                     for uIDX in range(len(workUnits))], many=True)
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(len(workUnits)) + ' ' + dataType + ' units queued as run ' + runID + '.')
+    
+    # Wait for the units to be completed by the workers (failing the units not completed within queueTimeout seconds)
+    numCompleted = 0
+    queueStart = time.time()
+    while True:
+        if (queueTimeout > 0) and (time.time() - queueStart > queueTimeout):
+            _, numTimedOut = SDCqueueExecute("UPDATE SDCqueue_tb SET status = 'failed', worker = NULL, lease_expires = NULL, updated = ? WHERE run_id = ? AND status IN ('pending', 'running')", 
+                                             (time.time(), runID))
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: ' + str(numTimedOut) + ' ' + dataType + ' units of run ' + runID + 
+                  ' not completed within ' + str(queueTimeout) + ' seconds.')
+        SDCqueueExecute("UPDATE SDCqueue_tb SET status = 'failed', updated = ? WHERE run_id = ? AND status = 'running' AND lease_expires < ? AND attempts >= ?", 
+                        (time.time(), runID, time.time(), queueMaxAttempts))
+        unitStates, _ = SDCqueueExecute('SELECT unit_idx, status, result FROM SDCqueue_tb WHERE run_id = ?', (runID,))
+        completedStates = [state for state in unitStates if state[1] in ('done', 'failed')]
+        if len(completedStates) != numCompleted:
+            numCompleted = len(completedStates)
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ' + str(numCompleted) + ' of ' + str(len(workUnits)) + ' ' + dataType + ' units completed.')
+        if numCompleted == len(workUnits):
+            break
+        time.sleep(queuePoll)
+    
+    # Collect the results and remove the units from the queue
+    for uIDX, status, result in unitStates:
+        if (status == 'done') and (result is not None):
+            results[uIDX] = json.loads(result)
+            for dateKey in ('startDate', 'endDate'):
+                if results[uIDX].get(dateKey) is not None:
+                    results[uIDX][dateKey] = datetime.datetime.fromisoformat(results[uIDX][dateKey])
+        else:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + dataType + ' unit ' + str(uIDX) + ' of run ' + runID + ' failed.')
+            Rerr = True
+    SDCqueueExecute('DELETE FROM SDCqueue_tb WHERE run_id = ?', (runID,))
     
     if(not Rerr):
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradialNCaggregation_v22 successfully executed.')
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCqueueExec successfully executed.')
     else:
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradialNCaggregation_v22 exited with an error.')
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCqueueExec exited with an error.')
         
-    return Rerr, ncFileNoPath, ncFilesize, tStart, tEnd, dataID
-    
-
-#####################################
-# RADIAL PROCESSING
-#####################################   
+    return Rerr, results
 
-def SDCradials(curNetwork):
-    # This function builds the historical radial datasets to be distributed via the SeaDataNet 
-    # infrastructure by reading hourly data from the EU HFR NODE THREDDS catalog via OpenDAP and 
-    # aggregating them according to the European standard data model.
-    # This function also builds the CDI entry for each historical dataset. The information for 
-    # assembling metadata are read from the EU HFR NODE database.
+def SDCqueueClaim(workerName, heldUnits):
+    # This function claims a work unit from the work queue for the input worker, taking a lease of 
+    # queueLease seconds on it. Pending units and units whose lease expired (claimed less than
+    # queueMaxAttempts times) can be claimed, skipping the ones whose host is accessed by maxPerHost
+    # units held by the worker. The claim is an atomic conditional update, so that a unit is held by
+    # one worker at a time.
     
     # INPUTS:
-    #     curNetwork: DataFrame containing information about the network to be processed.
+    #     workerName: name of the worker.
+    #     heldUnits: dictionary containing the units held by the worker, as key-values pairs <(run_id, unit_idx)>:<host>.
+               
+    # OUTPUTS:
+    #     unit: tuple (run_id, unit_idx, data_type, unit_args, host) of the claimed unit (None if no unit can be claimed).
+    
+    
+    claimCondition = "(status = 'pending' OR (status = 'running' AND lease_expires < ?)) AND attempts < ?"
+    candidates, _ = SDCqueueExecute('SELECT run_id, unit_idx, data_type, unit_args, host FROM SDCqueue_tb WHERE ' + claimCondition + 
+                                    ' ORDER BY run_id, unit_idx', (time.time(), queueMaxAttempts))
+    hostLoad = {}
+    for host in heldUnits.values():
+        hostLoad[host] = hostLoad.get(host, 0) + 1
+    for unit in candidates:
+        if hostLoad.get(unit[4], 0) >= maxPerHost:
+            continue
+        _, claimed = SDCqueueExecute("UPDATE SDCqueue_tb SET status = 'running', worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ? " + 
+                                     'WHERE run_id = ? AND unit_idx = ? AND ' + claimCondition, 
+                                     (workerName, time.time() + queueLease, time.time(), unit[0], unit[1], time.time(), queueMaxAttempts))
+        if claimed == 1:
+            return unit
+    
+    return None
 
+def SDCqueueRun(unit):
+    # This function runs the worker function of the input work unit (SDCaggregationWorker for its data
+    # type), rebuilding its network and station records.
+    
+    # INPUTS:
+    #     unit: tuple (run_id, unit_idx, data_type, unit_args, host) of the unit.
+               
     # OUTPUTS:
-    #     Rerr: error flag.    
+    #     result: output of the worker function.
+    
+    
+    unitArgs = json.loads(unit[3])
+    
+    return SDCaggregationWorker(unit[2], SDCnetworkRecord(**unitArgs[0]), *[SDCstationRecord(**stationArgs) for stationArgs in unitArgs[1:]])
 
+def SDCqueueWorker():
+    # This function runs a worker of the distributed execution mode: maxWorkers threads claim the units
+    # of the work queue (see SDCqueueClaim), run them and report their results, until no unit can be
+    # claimed for queueIdle seconds. The leases of the units held by the worker are renewed every
+    # queueLease/3 seconds while they run. Results are reported only for the units still held by the
+    # worker (the lease of a unit may have expired and the unit may have been claimed by another worker).
     
-    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradials started.')
+    # INPUTS:
+               
+    # OUTPUTS:
+    #     Rerr: error flag.
+    
+
+    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCqueueWorker started.')
     
     # Initialize error flag
-    Rerr = False 
-            
-    # GENERATE AGGREGATED RADIAL DATASETS FOR EACH STATION
-           
-    # Scan stations
-    for staIDX in range(numStations):
-        # Initialize error flag
-        RnAerr = False   
-        
-        # Create the aggregated radial dataset
-        try:
-            RnAerr, datasetName, datasetSize, startDate, endDate, SDNlocalCDIid = SDCradialNCaggregation_v22(curNetwork, stationData.iloc[[staIDX]])
-        except BaseException as err:
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + 
-                        err.args[0] + '.')
-                RnAerr = True
-        except OSError:
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR processing ' + 
-                        OSError.filename + ' -> ' + OSError.strerror + '.')
-                RnAerr = True
-            
-        if(not RnAerr):
-            # INSERT INFORMATION ABOUT THE AGGREGATED DATASET INTO DATABASE
-            # Delete from database the entry with the same name, if existing
-            try:
-                radialDeleteQuery = 'DELETE FROM radial_SDCnetCDF_tb WHERE filename=\'' + datasetName + '\''
-                cursor = cnx.cursor()
-                cursor.execute(radialDeleteQuery)
-                cnx.commit()
-                cursor.close()
-            except sql.Error as err:
-                RnAerr = True
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql delete query for dataset ' + datasetName + '.')
-                
-            # Insert dataset information
+    Rerr = False
+    
+    SDCqueueSetup()
+    workerName = socket.gethostname() + '-' + str(os.getpid())
+    heldUnits = {}
+    heldLock = threading.Lock()
+    stopEvent = threading.Event()
+    
+    def renewLeases():
+        # Renew the leases of the held units
+        while not stopEvent.wait(queueLease / 3):
+            with heldLock:
+                unitKeys = list(heldUnits)
+            for runID, uIDX in unitKeys:
+                try:
+                    SDCqueueExecute('UPDATE SDCqueue_tb SET lease_expires = ? WHERE run_id = ? AND unit_idx = ? AND worker = ?', 
+                                    (time.time() + queueLease, runID, uIDX, workerName))
+                except Exception as err:
+                    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: lease of unit ' + str(uIDX) + ' of run ' + runID + ' not renewed: ' + str(err) + '.')
+    
+    def claimLoop():
+        # Claim, run and report units until the worker is idle for queueIdle seconds
+        loopErr = False
+        idleStart = time.time()
+        while time.time() - idleStart < queueIdle:
+            with heldLock:
+                unit = SDCqueueClaim(workerName, heldUnits)
+                if unit is not None:
+                    heldUnits[unit[:2]] = unit[4]
+            if unit is None:
+                time.sleep(queuePoll)
+                continue
             try:
-                addDatasetQuery = ('INSERT INTO radial_SDCnetCDF_tb '
-                                   '(filename, network_id, station_id, start_date, end_date, creation_date, filesize, sent_flag) '
-                                   'VALUES (%s, %s, %s, %s, %s, %s, %s, %d)')
-                addData = (datasetName,networkID,stationID,startDate,endDate,datetime.datetime.now().strftime('yyyy-mm-dd HH:MM:SS'),datasetSize,0)
-                cursor = cnx.cursor()
-                cursor.execute(addDatasetQuery, addData)
-                cnx.commit()
-                cursor.close()
-            except sql.Error as err:
-                RnAerr = True
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql insert query for dataset ' + datasetName + '.')
-            
-            # INSERT DATASET METADATA FOR CDI GENERATION INTO DATABASE
-                
-            # CREATE THE CDI ENTRY
-                
-            # UPDATE THE DATABASE WITH THE SDN_LOCAL_CDI_ID
-            
+                result = SDCqueueRun(unit)
+                status = 'done'
+                loopErr = loopErr or result['Rerr']
+            except Exception as err:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                result = None
+                status = 'failed'
+                loopErr = True
+            with heldLock:
+                del heldUnits[unit[:2]]
+            _, reported = SDCqueueExecute('UPDATE SDCqueue_tb SET status = ?, result = ?, lease_expires = NULL, updated = ? WHERE run_id = ? AND unit_idx = ? AND worker = ?', 
+                                          (status, json.dumps(result, default=str) if result is not None else None, time.time(), unit[0], unit[1], workerName))
+            if reported != 1:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: lease of unit ' + str(unit[1]) + ' of run ' + unit[0] + ' lost, result discarded.')
+            idleStart = time.time()
             
-        # Update error flag
-        if(not Rerr):
-            Rerr = RnAerr
-   
-        
+        return loopErr
+    
+    heartbeat = threading.Thread(target=renewLeases, daemon=True)
+    heartbeat.start()
+    try:
+        with ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            loops = [executor.submit(claimLoop) for lIDX in range(maxWorkers)]
+            for loop in loops:
+                try:
+                    Rerr = loop.result() or Rerr
+                except Exception as err:
+                    print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+                    Rerr = True
+    finally:
+        stopEvent.set()
+    
     if(not Rerr):
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradials successfully executed.')
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCqueueWorker successfully executed.')
     else:
-        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCradials exited with an error.')
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - SDCqueueWorker exited with an error.')
         
     return Rerr
 
@@ -834,6 +4732,17 @@ def SDCradials(curNetwork):
     
 if __name__ == '__main__':
     
+    # Parse the command line arguments
+    parser = argparse.ArgumentParser(description='Build the aggregated radial and total datasets and the related CDIs for distribution on the SeaDataNet infrastructure.')
+    parser.add_argument('--force', action='store_true', help='rebuild the datasets even if their source data did not change since the last build')
+    parser.add_argument('--profile', choices=['cprofile', 'tracemalloc'], help='profile each station and network (CPU time with cProfile or memory allocations with tracemalloc)')
+    parser.add_argument('--coordinator', action='store_true', help='queue the stations and networks to be processed by the workers of the distributed mode and store their results')
+    parser.add_argument('--worker', action='store_true', help='process the stations and networks queued by the coordinators of the distributed mode')
+    parser.add_argument('--resume', action='store_true', help='process only the units not completed by the previous runs, according to the run journal')
+    parser.add_argument('--backfill', nargs=2, metavar=('START', 'END'), help='build the datasets of all the aggregation intervals between the START and END months (YYYY-MM)')
+    parser.add_argument('--current', action='store_true', help='update the datasets of the current month, appending the records newer than the last ones of the existing files')
+    args = parser.parse_args()
+    
     print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder started.')
     
 ####################
@@ -850,6 +4759,9 @@ if __name__ == '__main__':
       'host': '150.145.136.8',
       'database': 'HFR_node_db',
     }
+    
+    # Set the number of pooled connections to the database of each process
+    dbPoolSize = 4
 
     
     # Set the temporal aggregation interval for the dataset to be built
@@ -858,100 +4770,230 @@ if __name__ == '__main__':
     # Set the dictionaty for mapping QC variables towards SDC schema
     QCremapDict = {0: 48, 1: 49, 2: 50, 3: 51, 4: 52, 8: 56}
     
-####################    
-# NETWORK DATA COLLECTION
-####################
+    # Build the lookup table for remapping QC variables towards SDC schema
+    QCremapLUT = SDCremapLUT(QCremapDict)
     
-    # Connect to database
-    try:
-        cnx = sql.connect(**sqlConfig)
-    except sql.Error as err:
-        if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Access denied to database.')
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
-            sys.exit()
-        elif err.errno == errorcode.ER_BAD_DB_ERROR:
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Access denied to database.')
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
-            sys.exit()
-        else:
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Access denied to database.')
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
-            sys.exit()
-    else:
-        # Set and execute the query
-        networkSelectQuery = 'SELECT * FROM network_tb WHERE SDC_distribution_flag=1'
+    # Set the number of TIME records read, transformed and appended at a time (0 for in-memory aggregation)
+    streamChunkSize = 720
+    
+    # Set the folder of the local cache of the SDC-transformed monthly slices for multi-month datasets ('' for disabling the cache)
+    cacheFolder = '/mnt/data/CNR/RADAR/SDC/cache'
+    
+    # Set the flag for verifying the checksum of the cached monthly slices before using them
+    cacheVerify = True
+    
+    # Set the maximum size of the cache (bytes) and the maximum age of unused cached slices (days)
+    cacheMaxSize = 200 * 1024**3
+    cacheMaxAge = 1100
+    
+    # Set the folder of the local HTTP cache of the OpenDAP responses ('' for disabling the cache), its maximum size (bytes)
+    # and the time to live of the cached metadata responses (DDS, DAS), served without revalidation (seconds)
+    httpCacheFolder = '/mnt/data/CNR/RADAR/SDC/httpCache'
+    httpCacheMaxSize = 20 * 1024**3
+    httpCacheTTL = 3600
+    if (httpCacheFolder != '') and ((requests is None) or (importlib.util.find_spec('pydap') is None)):
+        parser.error('the HTTP cache of the OpenDAP responses requires the requests and pydap packages')
+    
+    # Set the default output profile (compression and chunking) of the netCDF files (key of SDCoutputProfiles)
+    outputProfile = 'sdc'
+    
+    # Set the output profiles of specific networks, overriding the ones set in the database (<network_id>:<profileName>)
+    networkOutputProfiles = {}
+    
+    # Set the flag for rebuilding the datasets whose source data did not change since the last build
+    forceRebuild = args.force
+    
+    # Set the backfill range (first and last months), for building the datasets of all its aggregation intervals
+    # instead of the last one (None for no backfill)
+    backfillRange = None
+    if args.backfill:
         try:
-            networkData = pd.read_sql(networkSelectQuery, con=cnx)
-        except pd.io.sql.DatabaseError as err:
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql network selection query.')
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
+            backfillRange = tuple(datetime.datetime.strptime(month, '%Y-%m') for month in args.backfill)
+        except ValueError:
+            parser.error('the backfill months must be formatted as YYYY-MM')
+        if backfillRange[1] < backfillRange[0]:
+            parser.error('the END month of the backfill range precedes the START month')
+    
+    # Set the flag for updating the datasets of the current month instead of the last complete aggregation interval,
+    # appending to the existing files only the records newer than their last ones
+    appendCurrent = args.current
+    if appendCurrent and (backfillRange is not None):
+        parser.error('the datasets of the current month cannot be updated during a backfill')
+    
+    # Set the run journal, the SQLite database file recording the state of each processing unit ('' for no journal), 
+    # and the flag for resuming the previous runs, processing only the units not completed yet
+    journalFile = '/mnt/data/CNR/RADAR/SDC/SDCjournal.sqlite'
+    resumeRun = args.resume
+    if resumeRun and (journalFile == ''):
+        parser.error('resuming a run requires the run journal')
+    
+    # Set the folder of the Mikado configuration files, listing the CDI fields of each station
+    cdiConfFolder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Mikado_conf_files')
+    
+    # Set the folder of the generated CDI xml files
+    cdiFolder = '/mnt/data/CNR/RADAR/SDC/CDI'
+    
+    # Set the maximum number of datasets whose CDI fields are fetched with a single query (or whose CDIs are generated
+    # with a single Mikado invocation)
+    cdiBatchSize = 200
+    
+    # Set the CDI generation engine ('native' for rendering the CDIs directly or 'mikado' for generating them with Mikado)
+    cdiEngine = 'native'
+    
+    # Set the Mikado command line for the automatic generation of the CDIs listed in a configuration file ({config}) 
+    # into an output folder ({output}), the maximum number of Mikado invocations running at the same time and their
+    # timeout (seconds)
+    mikadoCommand = ['java', '-jar', os.path.join(mikadoHome, 'mikado.jar'), 'automatic', '{config}', '{output}']
+    mikadoWorkers = 2
+    mikadoTimeout = 3600
+    
+    # Set the execution mode for the aggregation of stations and networks ('serial', 'thread', 'process', 'pipeline' or
+    # 'distributed', i.e. processed by the workers of one or more nodes via the work queue)
+    executionMode = 'distributed' if args.coordinator else 'process'
+    if args.coordinator and args.worker:
+        parser.error('a run is either a coordinator or a worker of the distributed mode')
+    
+    # Set the backend of the work queue of the distributed mode ('mysql' for the database or 'sqlite' for the SQLite database
+    # file queueFile, e.g. on a shared folder), the lease of the claimed units (seconds), the maximum number of claims of each
+    # unit, the polling interval of coordinators and workers (seconds), the idle time after which the workers exit (seconds)
+    # and the time after which the coordinator fails the units not completed yet (seconds, 0 for waiting without limit)
+    queueBackend = 'mysql'
+    queueFile = '/mnt/data/CNR/RADAR/SDC/SDCqueue.sqlite'
+    queueLease = 900
+    queueMaxAttempts = 3
+    queuePoll = 10
+    queueIdle = 600
+    queueTimeout = 12 * 3600
+    
+    # Set the snapshot file of the network and station records, saved at each load from the database ('' for no snapshot)
+    metadataSnapshot = '/mnt/data/CNR/RADAR/SDC/SDCmetadataSnapshot.json'
+    
+    # Set the flag for loading the network and station records from the snapshot instead of the database (dry runs)
+    metadataFromSnapshot = False
+    
+    # Set the maximum number of stations to be processed at the same time
+    maxWorkers = 4
+    
+    # Set the maximum number of stations to be processed at the same time against the same THREDDS host
+    maxPerHost = 2
+    
+    # Set the maximum number of stations in the fetch / transform / write pipeline at the same time (pipeline mode)
+    pipelineDepth = 6
+    
+    # Set the memory budget of the stations processed at the same time (bytes, 0 for no admission control), here three 
+    # quarters of the physical memory, and the ratio between the estimated peak memory of an in-memory aggregation and the
+    # size of its data once decoded. Stations exceeding the budget are streamed in chunks fitting the share of a worker 
+    # (memoryBudget / maxWorkers).
+    memoryBudget = int(0.75 * os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES'))
+    memoryOverhead = 2.0
+    
+    # Set the flag for running the stations with the longest runtime of the previous runs first, recording the runtime
+    # and the bytes of each dataset in the build_time and source_bytes columns of radial_SDCnetCDF_tb and total_SDCnetCDF_tb
+    # (when the tables have them, see SDChistoryColumns)
+    scheduleHistory = True
+    
+    # Set the metrics file of the timed spans of the processing stages ('' for no metrics) and its format ('jsonl' or 'prometheus')
+    metricsFile = '/mnt/data/CNR/RADAR/SDC/SDCmetrics.jsonl'
+    metricsFormat = 'jsonl'
+    
+    # Set the profiling mode of stations and networks ('' for no profiling, 'cprofile' or 'tracemalloc') and the folder of the profiles
+    profileMode = args.profile or ''
+    profileFolder = '/mnt/data/CNR/RADAR/SDC/profiles'
+    if profileMode != '':
+        os.makedirs(profileFolder, exist_ok=True)
+    
+    # Start collecting the timed spans of the run (the collection is closed on every exit path)
+    runStart = time.time()
+    with SDCspanCollect('EHN_SDCdatasetBuilder') as runSpans:
+        
+####################    
+# DISTRIBUTED WORKER
+####################
+
+        # Process the units queued by the coordinators of the distributed mode, instead of the networks and stations of the database
+        if args.worker:
+            SDCerr = SDCqueueWorker()
+            if(not SDCerr):
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder successfully executed.')
+            else:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
             sys.exit()
-        else:
-            numNetworks = networkData.shape[0]
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Network data successfully fetched from database.')
         
 ####################    
-# STATION DATA COLLECTION
-####################                
+# NETWORK AND STATION DATA COLLECTION
+####################
         
-    # Scan networks 
-    for netIDX in range(numNetworks):
         # Initialize error flag
-        Nerr = False
+        SDCerr = False
         
-        # Retrieve current network_id
-        networkID = networkData.loc[netIDX, 'network_id']
-        
-        # Set and execute the query for getting station data
-        stationSelectQuery = 'SELECT * FROM station_tb WHERE network_id=\'' + networkID + '\' AND SDC_distribution_flag=1'
+        # Load the records of networks and stations (single query on the database or snapshot of a previous run)
         try:
-            stationData = pd.read_sql(stationSelectQuery, con=cnx)
-        except pd.io.sql.DatabaseError as err:
-            Nerr = True
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql station selection query for network ' + networkID + '.')
+            networks, stations = SDCmetadataLoad(metadataSnapshot, metadataFromSnapshot)
+        except sql.Error as err:
+            if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Access denied to database.')
+            elif err.errno == errorcode.ER_BAD_DB_ERROR:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Access denied to database.')
+            else:
+                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Execution failed on sql network and station selection query.')
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
+            sys.exit()
+        except (OSError, ValueError, TypeError, KeyError) as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR loading the network and station snapshot: ' + str(err) + '.')
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - EHN_SDCdatasetBuilder exited with an error.')
+            sys.exit()
         else:
-            numStations = stationData.shape[0]
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Station data for ' + networkID + ' network successfully fetched from database.')
-    
+            numNetworks = len(networks)
+            numStations = len(stations)
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Network and station data successfully ' + ('loaded from snapshot.' if metadataFromSnapshot else 'fetched from database.'))
+        
 ####################    
 # PROCESSING
 ####################
 
-        if(not Nerr):
-            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Processing ' + networkID + ' ...')
-    
-            # Radial file processing
-            try:
-                Nerr = SDCradials(networkData.iloc[[netIDX]])
-            except BaseException as err:
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + 
-                        err.args[0] + '.')
-                Nerr = True
-            except OSError:
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR processing ' + 
-                        OSError.filename + ' -> ' + OSError.strerror + '.')
-                Nerr = True
-            
-            # Total file processing
-            try:
-                Nerr = SDCtotals(mikadoHome, sqlConfig, timeSpan)
-            except BaseException as err:
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + 
-                        err.args[0] + '.')
-                Nerr = True
-            except OSError:
-                print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR processing ' + 
-                        OSError.filename + ' -> ' + OSError.strerror + '.')
-                Nerr = True
+        # Radial file processing (stations of all networks are processed at the same time)
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Processing radials of ' + str(numNetworks) + ' networks ...')
+        try:
+            Rerr = SDCradials(networks, stations)
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+            Rerr = True
+        
+        # Update error flag
+        if(not SDCerr):
+            SDCerr = Rerr
+        
+        # Evict outdated slices from the local cache
+        if cacheFolder != '':
+            SDCcacheEvict()
+        
+        # Evict the least recently used responses from the HTTP cache
+        if httpCacheFolder != '':
+            SDChttpCacheEvict()
             
+        # Total file processing (networks are processed at the same time)
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - Processing totals of ' + str(numNetworks) + ' networks ...')
+        try:
+            Nerr = SDCtotals(networks)
+        except Exception as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - ERROR: ' + str(err) + '.')
+            Nerr = True
+                
         # Update error flag
         if(not SDCerr):
             SDCerr = Nerr
-            
-    # Close connection to database
-    cnx.close()
-            
+                
+    # Export the timed spans of the run
+    if httpCacheFolder != '':
+        httpStages = [span['stage'] for span in runSpans]
+        print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - HTTP cache of the OpenDAP responses: ' + str(httpStages.count('http-hit')) + ' hits, ' + 
+              str(httpStages.count('http-revalidated')) + ' revalidated hits, ' + str(httpStages.count('http-miss')) + ' misses.')
+    if metricsFile != '':
+        try:
+            SDCmetricsExport(runSpans, metricsFile, metricsFormat, runStart, time.time() - runStart)
+        except OSError as err:
+            print('[' + datetime.datetime.now().strftime("%d-%b-%Y %H:%M:%S") + '] - - WARNING: metrics not exported: ' + str(err) + '.')
+    
 ####################
     
     if(not SDCerr):
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+
+
+# This script is a stand-in for the Mikado application, for testing the batched CDI generation of
+# EHN_SDCdatasetBuilder (cdiEngine = 'mikado') without Mikado and without database access. It reads
+# the cdi_identifier list of the main query of the input Mikado configuration file and writes a
+# minimal cdi19139 xml file for each dataset into the output folder, as <cdi_identifier>.xml.
+# It is used by setting in EHN_SDCdatasetBuilder:
+#     mikadoCommand = [sys.executable, '<path of this script>', '{config}', '{output}']
+
+# Usage: EHN_SDCmikadoStub.py <configuration file> <output folder>
+
+
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+
+#####################################
+# MIKADO STUB
+#####################################
+
+def SDCstubCDI(cdiID):
+    # This function builds a minimal cdi19139 xml document of the input dataset, containing only its
+    # file identifier.
+
+    # INPUTS:
+    #     cdiID: cdi_identifier of the dataset.
+
+    # OUTPUTS:
+    #     cdiXML: string containing the xml document.
+
+
+    gmd = 'http://www.isotc211.org/2005/gmd'
+    gco = 'http://www.isotc211.org/2005/gco'
+    ET.register_namespace('gmd', gmd)
+    ET.register_namespace('gco', gco)
+
+    mdMetadata = ET.Element('{' + gmd + '}MD_Metadata')
+    fileIdentifier = ET.SubElement(mdMetadata, '{' + gmd + '}fileIdentifier')
+    ET.SubElement(fileIdentifier, '{' + gco + '}CharacterString').text = cdiID
+
+    return ET.tostring(mdMetadata, encoding='unicode', xml_declaration=True)
+
+
+#####################################
+# SCRIPT LAUNCHER
+#####################################
+
+if __name__ == '__main__':
+
+    if len(sys.argv) != 3:
+        sys.exit('Usage: EHN_SDCmikadoStub.py <configuration file> <output folder>')
+    confFile, outFolder = sys.argv[1:]
+
+    # Read the identifiers of the datasets selected by the main query
+    try:
+        mainWhere = ET.parse(confFile).getroot().findtext('./queries/main/query/where') or ''
+    except (OSError, ET.ParseError) as err:
+        sys.exit('Unable to read the configuration file ' + confFile + ': ' + str(err))
+    cdiIDs = re.findall(r"'([^']*)'", mainWhere)
+
+    # Write the CDIs
+    os.makedirs(outFolder, exist_ok=True)
+    for cdiID in cdiIDs:
+        with open(os.path.join(outFolder, cdiID + '.xml'), 'w', encoding='utf-8') as f:
+            f.write(SDCstubCDI(cdiID))
+
+    print('Generated ' + str(len(cdiIDs)) + ' CDIs.')